@@ -1,6 +1,8 @@
 """Web application to play rikiki over the web."""
+import atexit
 import datetime
 import os
+import threading
 from typing import List, Optional
 
 
@@ -9,43 +11,116 @@ from flask_babel import Babel  # type: ignore
 
 from instance.config import app_config
 
+from . import handoff
+from .advisor import BidAdvisor
+from .bots import BotDriver, BotPlayer
+from .cache import SnapshotHistory, VersionCache
+from .journal import Journal, replay
 from .models import Game, Player
+from .registry import GameRegistry, RegisteredGame
+from .storage import Storage, open_storage
+
+
+class RikikiApp(flask.Flask):
+    """Flask application holding the Games and their helpers."""
+
+    def __init__(self, *args, **kwarg) -> None:
+        """Create the application, with no Game yet."""
+        super().__init__(*args, **kwarg)
+        self.games = GameRegistry()
+        self.status_cache = VersionCache()
+        self.status_history = SnapshotHistory()
+        self.bots: BotDriver
+        self.bid_advisor: BidAdvisor
+        self.long_polls: threading.BoundedSemaphore
+        """Free slots for player.api_status long polls."""
+        self.journal: Optional[Journal] = None
+        self.storage: Storage
+        self.config['ORGANIZER_SECRET'] = "".join(
+            f"{x:02X}" for x in os.urandom(16))
+
+    @property
+    def organizer_secret(self) -> str:
+        """Return secret allowing to set up new Games."""
+        return self.config['ORGANIZER_SECRET']
+
+    def create_game(
+            self,
+            players: List[Player],
+            organizer_secret: Optional[str] = None
+    ) -> Game:
+        """Create and register a new Game, watching it."""
+        game = self.games.create_game(players, organizer_secret)
+        self.storage.watch(game)
+        if self.journal is not None:
+            self.journal.record_game(
+                game, self.games.organizer_secret(game.id))
+        if any(isinstance(p, BotPlayer) for p in players):
+            self.bots.watch(game)
+        return game
+
+    def restore_games(
+            self,
+            path: str,
+            games: Optional[List[RegisteredGame]] = None
+    ) -> None:
+        """Replay the journal at path, then keep appending to it.
+
+        Games (e.g. handed over by the previous process) replace
+        the replay if given: they must be those of the journal.
+        """
+        if games is None:
+            games = replay(path)
+        self.journal = Journal(
+            path, snapshot_every=self.config['JOURNAL_SNAPSHOT_EVERY'])
+        for (game, organizer_secret) in games:
+            self.register_game(game, organizer_secret)
+
+    def register_game(self, game: Game, organizer_secret: str) -> None:
+        """Register a restored Game, watching it like new Games."""
+        self.games.register(game, organizer_secret)
+        self.storage.watch(game)
+        if self.journal is not None:
+            self.journal.watch(game)
+        if any(isinstance(p, BotPlayer) for p in game.players):
+            self.bots.watch(game)
 
 
 def create_app(config_name):
     """Create new application instance."""
-    class RikikiApp(flask.Flask):
-        def __init__(self, *args, **kwarg):
-            super().__init__(*args, **kwarg)
-            self._game: Optional[Game] = None
-            self.config['ORGANIZER_SECRET'] = "".join(
-                f"{x:02X}" for x in os.urandom(16))
-
-        @property
-        def organizer_secret(self) -> str:
-            return self.config['ORGANIZER_SECRET']
-
-        @property
-        def game(self) -> Game:
-            if self._game is None:
-                raise RuntimeError("Game not initialized.")
-            return self._game
-
-        def create_game(self, players: List[Player]) -> Game:
-            self._game = Game(players)
-            return self.game
-
     app = RikikiApp(__name__, instance_relative_config=True)
     app.config.from_object(
         app_config[config_name
                    if isinstance(config_name, str)
                    else os.environ.get("FLASK_ENV", "development")])
+    app.bots = BotDriver(app.config['BOT_WORKERS'],
+                         app.config['BOT_TIME_BUDGET'])
+    # only bid hints use the advisor: start no processes without them
+    app.bid_advisor = BidAdvisor(
+        app.config['BID_ADVISOR_WORKERS'] if app.config['BID_HINTS'] else 0,
+        app.config['BID_ADVISOR_BUDGET'])
+    atexit.register(app.bid_advisor.shutdown)
+    app.long_polls = threading.BoundedSemaphore(
+        app.config['LONG_POLL_WAITERS'])
+    app.storage = open_storage(app.config['DATABASE'])
+    handed_over = None
+    if app.config['HANDOFF']:
+        handed_over = handoff.take_over(
+            app, app.config['HANDOFF'], app.config['HANDOFF_WAIT'])
+        handoff.hand_over_on_sigterm(app, app.config['HANDOFF'])
+    if app.config['JOURNAL']:
+        app.restore_games(app.config['JOURNAL'], handed_over)
+    else:
+        for (game, organizer_secret) in handed_over or []:
+            app.register_game(game, organizer_secret)
     app.register_error_handler(404, page_not_found)
     app.register_error_handler(403, access_denied)
     from . import organizer
     from . import player
     app.register_blueprint(organizer.bp)
     app.register_blueprint(player.bp)
+    from . import cli
+    app.cli.add_command(cli.rikiki)
     log_organizer_secret_to_console(app)
 
     @app.before_request
@@ -0,0 +1,228 @@
+"""Estimate how many tricks a hand makes, to help Players bid.
+
+The estimate is a Monte Carlo average: the cards the Player cannot
+see are dealt at random to the other Players and the Round is played
+out with every Player trying to win each trick.
+"""
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .models import (CARDS_PER_SUIT, MAX_CARDS, Card, card_bit, card_count,
+                     card_mask, mask_cards, playable_mask, trick_keys,
+                     trick_winner)
+
+
+def _choose_card(legal: int, table: List[Card], trump: Optional[Card]):
+    # Lead the highest card, otherwise win as cheaply as possible or
+    # throw away the cheapest card.
+    cards = mask_cards(legal)
+    if table == []:
+        return max(cards, key=lambda c: c % CARDS_PER_SUIT)
+    keys = trick_keys(table[0], trump)
+    best = max(keys[c] for c in table)
+    winners = [c for c in cards if keys[c] > best]
+    return min(winners or cards, key=lambda c: keys[c])
+
+
+def play_out(hands: List[int], trump: Optional[Card], position: int) -> int:
+    """Play a whole Round and return tricks won by the Player at position.
+
+    hands are the sets of cards (see card_mask) of the Players in the
+    Round's order: hands[0] leads the first trick.
+    """
+    hands = list(hands)
+    players = len(hands)
+    leader = 0
+    won = 0
+    for _ in range(card_count(hands[0])):
+        table: List[Card] = []
+        for turn in range(players):
+            seat = (leader + turn) % players
+            card = _choose_card(
+                playable_mask(hands[seat], table[0] if table else None),
+                table, trump)
+            hands[seat] &= ~card_bit(card)
+            table.append(card)
+        leader = (leader + trick_winner(table, trump)) % players
+        if leader == position:
+            won += 1
+    return won
+
+
+def sample_tricks(
+        hand: int,
+        trump: Optional[Card],
+        position: int,
+        players: int,
+        samples: int,
+        seed: Optional[int] = None
+) -> int:
+    """Return total tricks won by hand over `samples' random deals."""
+    rng = random.Random(seed)
+    unseen = [Card(c) for c in range(MAX_CARDS)
+              if not hand & card_bit(c) and c != trump]
+    how_many_cards = card_count(hand)
+    total = 0
+    for _ in range(samples):
+        rng.shuffle(unseen)
+        hands = []
+        dealt = 0
+        for seat in range(players):
+            if seat == position:
+                hands.append(hand)
+            else:
+                hands.append(card_mask(
+                    unseen[dealt:(dealt + how_many_cards)]))
+                dealt += how_many_cards
+        total += play_out(hands, trump, position)
+    return total
+
+
+_Query = Tuple[int, Optional[Card], int, int]
+"""hand, trump, position and players, see BidAdvisor.expected_tricks."""
+
+
+class _Estimate:
+    """Running total of the sampled tricks for one query."""
+
+    def __init__(self):
+        self.tricks = 0
+        self.samples = 0
+        self.submitted = False
+        """True once batches have been handed to the worker pool."""
+        self.batches = 0
+        """Batches handed to the worker pool and not done yet."""
+
+    def add(self, tricks: int, samples: int) -> None:
+        self.tricks += tricks
+        self.samples += samples
+
+    def mean(self) -> Optional[float]:
+        return self.tricks / self.samples if self.samples > 0 else None
+
+
+class BidAdvisor:
+    """Estimate expected tricks within a time budget, memoizing results.
+
+    Estimates are keyed by (hand, trump, position, players): the same
+    query repeats each time the Player's status is refreshed.  The
+    first query hands batches of samples to a process pool and samples
+    on the calling thread until the time budget is spent.  Batches
+    finishing later refine the estimate of the next queries, see
+    is_refining.
+
+    The worker processes are started with the 'spawn' method: forking
+    the multithreaded server would copy locks held by other threads.
+    """
+
+    BATCH = 50
+    """Samples per batch handed to the pool."""
+
+    def __init__(
+            self,
+            max_workers: int = 2,
+            time_budget: float = 0.05,
+            samples: int = 400,
+            max_entries: int = 1024
+    ):
+        """Create new BidAdvisor (without pool if max_workers == 0)."""
+        self.time_budget = time_budget
+        self.samples = samples
+        self._pool: Optional[concurrent.futures.Executor] = None
+        if max_workers > 0:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context('spawn'))
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._estimates: 'collections.OrderedDict[_Query, _Estimate]' = \
+            collections.OrderedDict()
+        """Least recently used estimates first."""
+
+    def _estimate(self, key: _Query) -> Tuple[_Estimate, bool]:
+        # Return estimate for key and whether it should go to the pool
+        with self._lock:
+            try:
+                estimate = self._estimates[key]
+                self._estimates.move_to_end(key)
+            except KeyError:
+                estimate = self._estimates[key] = _Estimate()
+                while len(self._estimates) > self._max_entries:
+                    self._estimates.popitem(last=False)
+            submit = not estimate.submitted and self._pool is not None
+            estimate.submitted = True
+            return (estimate, submit)
+
+    def _add(self, estimate: _Estimate, tricks: int, samples: int) -> None:
+        with self._lock:
+            estimate.add(tricks, samples)
+
+    def _submit(
+            self,
+            pool: concurrent.futures.Executor,
+            estimate: _Estimate,
+            query: _Query
+    ) -> None:
+        def batch_done(future):
+            with self._lock:
+                if future.exception() is None:
+                    estimate.add(future.result(), self.BATCH)
+                estimate.batches -= 1
+
+        (hand, trump, position, players) = query
+        batches = self.samples // self.BATCH
+        with self._lock:
+            estimate.batches = batches
+        for _ in range(batches):
+            pool.submit(
+                sample_tricks, hand, trump, position, players, self.BATCH,
+                int.from_bytes(os.urandom(8), 'little')
+            ).add_done_callback(batch_done)
+
+    def expected_tricks(
+            self,
+            hand: int,
+            trump: Optional[Card],
+            position: int,
+            players: int
+    ) -> Optional[float]:
+        """Return expected tricks of hand, None if no sample was ready.
+
+        position is the Player's index in the Round (0 bids first
+        and leads the first trick).
+        """
+        deadline = time.monotonic() + self.time_budget
+        query: _Query = (hand, trump, position, players)
+        (estimate, submit) = self._estimate(query)
+        if submit and self._pool is not None:
+            self._submit(self._pool, estimate, query)
+        while estimate.samples < self.samples \
+                and time.monotonic() < deadline:
+            self._add(estimate, sample_tricks(*query, 1), 1)
+        return estimate.mean()
+
+    def is_refining(
+            self,
+            hand: int,
+            trump: Optional[Card],
+            position: int,
+            players: int
+    ) -> bool:
+        """Tell if the pool still works on the estimate of a query.
+
+        Querying expected_tricks again later then gives a better
+        estimate.
+        """
+        with self._lock:
+            estimate = self._estimates.get((hand, trump, position, players))
+            return estimate is not None and estimate.batches > 0
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,231 @@
+"""Serve the application through ASGI, with a WebSocket per Player.
+
+HTTP requests are handed over to the Flask application (through
+asgiref's WSGI adapter, an optional dependency).  The WebSocket at
+/player/<game_id>/<secret_id>/ws/ carries both the Player's actions
+and the status updates pushed to her on a single connection:
+
+  client -> server: {"id": 1, "action": "bid", "bid": 2}
+                    {"id": 2, "action": "play", "card": 12}
+                    {"id": 3, "action": "finish"}
+  server -> client: {"type": "result", "id": 1, "ok": true}
+                    {"type": "status", "version": 42, "turn": 7, ...}
+
+Status messages carry the same data as player.api_status: the first
+one is a full status, the next ones only describe what changed.
+Actions may carry the turn of the last status the Player saw
+("turn": 7, see Game.turn): if a move was made since, the action is
+rejected with {"ok": false, "stale": true, "turn": 8}.
+
+Run for example with `uvicorn --factory app.asgi:create_asgi_app'.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+from typing import Any, Dict, Optional, Tuple
+
+import flask
+from werkzeug.exceptions import HTTPException
+
+from . import create_app, models, player as player_controllers
+
+try:
+    from asgiref.wsgi import WsgiToAsgi  # type: ignore
+except ImportError:
+    WsgiToAsgi = None
+
+
+CLOSE_FORBIDDEN = 4403
+"""WebSocket close code for unknown Games or Players."""
+
+
+def create_asgi_app(flask_app: Optional[flask.Flask] = None):
+    """Wrap the Flask application (created if not given) for ASGI."""
+    if flask_app is None:
+        flask_app = create_app(None)
+    return RikikiAsgi(flask_app)
+
+
+class RikikiAsgi:
+    """ASGI application serving Player WebSockets next to Flask."""
+
+    def __init__(self, flask_app: flask.Flask):
+        """Wrap flask_app, telling its templates to offer WebSockets."""
+        self.flask_app = flask_app
+        flask_app.config['WEBSOCKETS'] = True
+        self._http = None if WsgiToAsgi is None else WsgiToAsgi(flask_app)
+        self._actions = ThreadPoolExecutor(
+            max_workers=flask_app.config['WEBSOCKET_ACTION_WORKERS'],
+            thread_name_prefix='rikiki-ws-action')
+        """Run actions, which take the Game's lock, off the event loop."""
+
+    async def __call__(self, scope, receive, send):
+        """Dispatch according to the ASGI connection type."""
+        if scope['type'] == 'websocket':
+            await self.websocket(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await lifespan(receive, send)
+        elif self._http is None:
+            await send({'type': 'http.response.start',
+                        'status': 501,
+                        'headers': [(b'content-type', b'text/plain')]})
+            await send({'type': 'http.response.body',
+                        'body': b'Install asgiref to serve HTTP via ASGI'})
+        else:
+            await self._http(scope, receive, send)
+
+    def connected_player(
+            self,
+            path: str
+    ) -> Optional[Tuple[models.Game, models.Player]]:
+        """Return Game and confirmed Player of a WebSocket URL."""
+        try:
+            (endpoint, values) = self.flask_app.url_map.bind('').match(
+                path, method='GET')
+        except HTTPException:
+            return None
+        if endpoint != 'player.websocket':
+            return None
+        try:
+            game = self.flask_app.games.game(values['game_id'])
+            player = game.player_by_secret_id(values['secret_id'])
+        except (KeyError, StopIteration):
+            return None
+        return (game, player) if player.is_confirmed else None
+
+    async def websocket(self, scope, receive, send):
+        """Handle a Player's actions and push her status updates."""
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        game_and_player = self.connected_player(scope['path'])
+        if game_and_player is None:
+            await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+            return
+        (game, player) = game_and_player
+        await send({'type': 'websocket.accept'})
+        send_lock = asyncio.Lock()
+
+        async def send_json(data: Dict[str, Any]) -> None:
+            async with send_lock:
+                await send({'type': 'websocket.send',
+                            'text': json.dumps(data)})
+
+        loop = asyncio.get_running_loop()
+        pusher = asyncio.ensure_future(
+            self.push_status(scope, game, player, send_json))
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                if message['type'] == 'websocket.receive':
+                    # actions take the Game's lock and wait for the
+                    # journal: keep them off the event loop
+                    result = await loop.run_in_executor(
+                        self._actions, perform_action, game, player,
+                        message.get('text') or '')
+                    await send_json(result)
+        finally:
+            pusher.cancel()
+
+    async def push_status(self, scope, game, player, send_json) -> None:
+        """Send the Player's status each time the Game changes.
+
+        A done listener of the Game wakes this coroutine up through the
+        event loop, so that waiting sockets hold no thread.
+        """
+        loop = asyncio.get_running_loop()
+        timeout = self.flask_app.config['LONG_POLL_TIMEOUT']
+        changed = asyncio.Event()
+
+        def wake_up(_game: models.Game) -> None:
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                pass  # event loop closed while the Game changed
+
+        game.add_done_listener(wake_up)
+        try:
+            version = None
+            while player.is_confirmed and self.is_hosted(game):
+                # clear before looking at the view, not to miss changes
+                changed.clear()
+                view = game.view
+                if view.version != version:
+                    data = self.status_data(
+                        scope, game, player, view, version)
+                    version = view.version
+                    await send_json(dict(data, type='status'))
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass  # check again that the Game is still hosted
+        finally:
+            game.remove_done_listener(wake_up)
+
+    def is_hosted(self, game: models.Game) -> bool:
+        """Tell if the Game is still in the application's registry."""
+        with self.flask_app.app_context():
+            return player_controllers.game_is_hosted(game)
+
+    def status_data(self, scope, game, player, view, since):
+        """Build player.api_status data in a matching request context."""
+        headers = [(k.decode('latin-1'), v.decode('latin-1'))
+                   for (k, v) in scope.get('headers', [])]
+        with self.flask_app.test_request_context(
+                scope['path'], headers=headers):
+            flask.g.game_id = game.id
+            return player_controllers.status_data(game, player, view, since)
+
+
+def perform_action(
+        game: models.Game,
+        player: models.Player,
+        text: str
+) -> Dict[str, Any]:
+    """Run the action requested in a WebSocket message and describe it."""
+    request_id = None
+    try:
+        request = json.loads(text)
+        request_id = request.get('id')
+        action = request['action']
+        turn = request.get('turn')
+        if turn is not None:
+            turn = int(turn)
+        stale = player_controllers.is_stale(game, turn)
+        if action == 'bid':
+            if not stale \
+                    and not player_controllers.bidding_allowed(game, player):
+                raise ValueError('not bidding now')
+            result = player_controllers.versioned_action_result(
+                game, turn, player.place_bid, int(request['bid']))
+        elif action == 'play':
+            if not stale and not player_controllers.card_playing_allowed(
+                    game, player):
+                raise ValueError('not playing cards now')
+            result = player_controllers.versioned_action_result(
+                game, turn, player.play_card,
+                models.Card(int(request['card'])))
+        elif action == 'finish':
+            result = player_controllers.versioned_action_result(
+                game, turn, player_controllers.start_next_round, game,
+                player)
+        else:
+            raise ValueError(f'unknown action {action!r}')
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        result = {'ok': False, 'error': f'Invalid request: {e}'}
+    result.update({'type': 'result', 'id': request_id})
+    return result
+
+
+async def lifespan(receive, send):
+    """Acknowledge ASGI server startup and shutdown."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
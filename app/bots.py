@@ -0,0 +1,207 @@
+"""Bots: bid and play for a Player without a human behind her.
+
+A bot policy decides for one Player of a Round at a time through two
+methods, bid(player, round_) returning the bid and card(player,
+round_) returning the Card to play.  Policies only pick among the
+moves the rules allow, the caller still has to place the bid or play
+the card.
+
+In live Games, BotPlayers take the seats and a BotDriver makes them
+move when it is their turn.
+"""
+import concurrent.futures
+import os
+import random
+from typing import Dict, Optional, Type
+
+from .models import (CARDS_PER_SUIT, Card, Game, ModelError, Player,
+                     PlayerRetryableError, Round, trick_keys)
+from .solver import Solver, round_position
+
+
+class RandomBot:
+    """Bid and play at random (but within the rules)."""
+
+    def __init__(self, rng=random):
+        """Create new bot drawing random numbers from rng."""
+        self._rng = rng
+
+    def bid(self, player: Player, round_: Round) -> int:
+        """Return a random bid."""
+        return self._rng.randint(0, player.card_count)
+
+    def card(self, player: Player, round_: Round) -> Card:
+        """Return a random card among those allowed."""
+        return self._rng.choice(player.playable_cards)
+
+
+class GreedyBot:
+    """Bid high cards, then try to win exactly as many tricks as bid."""
+
+    def bid(self, player: Player, round_: Round) -> int:
+        """Return count of aces and trumps from Jack upwards."""
+        trump_suit = (None
+                      if round_.trump is None
+                      else round_.trump // CARDS_PER_SUIT)
+        return sum(
+            1 for card in player.cards
+            if card % CARDS_PER_SUIT == CARDS_PER_SUIT - 1
+            or (card // CARDS_PER_SUIT == trump_suit
+                and card % CARDS_PER_SUIT >= CARDS_PER_SUIT - 4))
+
+    def card(self, player: Player, round_: Round) -> Card:
+        """Return cheapest winning card or most expensive losing card."""
+        playable = player.playable_cards
+        wants_trick = player.tricks < (player.bid or 0)
+        table = ([c for (_, c) in round_.current_trick]
+                 if round_.state == Round.State.PLAYING
+                 else [])
+        if table == []:
+            # leading the trick: only the rank matters
+            return (max if wants_trick else min)(
+                playable, key=lambda c: c % CARDS_PER_SUIT)
+        keys = trick_keys(table[0], round_.trump)
+        best = max(keys[c] for c in table)
+        winners = [c for c in playable if keys[c] > best]
+        losers = [c for c in playable if keys[c] < best]
+        if wants_trick:
+            return min(winners or playable, key=lambda c: keys[c])
+        elif losers:
+            return max(losers, key=lambda c: keys[c])
+        else:
+            return min(playable, key=lambda c: keys[c])
+
+
+class SolverBot(GreedyBot):
+    """Like GreedyBot, but plays the last tricks perfectly.
+
+    Once she holds at most ENDGAME_CARDS cards, the bot looks at
+    everybody's hand (see app.solver) to win exactly her bid, if the
+    others can not prevent it.
+    """
+
+    ENDGAME_CARDS = 4
+
+    def __init__(self):
+        """Create new bot."""
+        self._solver: Optional[Solver] = None
+
+    def card(self, player: Player, round_: Round) -> Card:
+        """Return card that gets closest to the bid."""
+        if player.card_count > self.ENDGAME_CARDS:
+            return super().card(player, round_)
+        position = round_.players.index(player)
+        wants_trick = player.tricks < (player.bid or 0)
+        solver = self._solver
+        # positions are keyed by the cards in play, so the solver
+        # (and its transposition table) may even serve later Rounds
+        if solver is None or solver.player != position \
+                or solver.maximize != wants_trick \
+                or solver.trump != round_.trump \
+                or len(solver) > 100000:
+            solver = self._solver = Solver(
+                round_.trump, position, maximize=wants_trick)
+        values = solver.card_values(*round_position(round_))
+        return (max if wants_trick else min)(values, key=values.__getitem__)
+
+
+POLICIES: Dict[str, Type] = {
+    'random': RandomBot,
+    'greedy': GreedyBot,
+    'solver': SolverBot,
+}
+"""Bot policies by name."""
+
+
+class BotPlayer(Player):
+    """A Player whose bids and cards are chosen by a bot policy."""
+
+    def __init__(self, name: str, policy: str = 'greedy'):
+        """Create new (already confirmed) BotPlayer.
+
+        policy is the name of one of the POLICIES.
+        """
+        super().__init__(name, "".join(f"{x:02X}" for x in os.urandom(16)))
+        self.policy_name = policy
+        self.policy = POLICIES[policy]()
+        """Decides the BotPlayer's bids and cards."""
+        self.confirm(name)
+
+
+def bot_to_move(game: Game) -> Optional[BotPlayer]:
+    """Return the BotPlayer who must bid or play in the Game, if any."""
+    try:
+        if game.state != Game.State.PLAYING \
+                or game.round.state == Round.State.DONE:
+            return None
+        player = game.round.current_player
+    except ModelError:
+        # the Game is being changed by another thread
+        return None
+    return player if isinstance(player, BotPlayer) else None
+
+
+class BotDriver:
+    """Let the BotPlayers of Games bid and play when it is their turn.
+
+    Games are watched through Game.add_listener.  Bots decide on a
+    thread pool, never on the thread that changed the Game.  A bot
+    that needs more than time_budget seconds to decide (or that
+    fails) makes a random move instead.
+    """
+
+    def __init__(self, max_workers: int = 4, time_budget: float = 2.0):
+        """Create new BotDriver, starting threads on demand."""
+        self.time_budget = time_budget
+        self._turns = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix='rikiki-bot-turn')
+        """Takes the turns, waiting for _thinking within time_budget."""
+        self._thinking = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix='rikiki-bot')
+        """Runs the bot policies."""
+        self._fallback = RandomBot()
+
+    def watch(self, game: Game) -> None:
+        """Make the BotPlayers of the Game move from now on."""
+        game.add_listener(self.game_changed)
+        self.game_changed(game)
+
+    def game_changed(self, game: Game) -> None:
+        """Schedule a turn if a BotPlayer must move."""
+        player = bot_to_move(game)
+        if player is not None:
+            self._turns.submit(self._take_turn, game, player, game.version)
+
+    def _take_turn(self, game: Game, player: BotPlayer, version: int):
+        # Game.changed is called several times per mutation: only
+        # the call for the last version gets to move.
+        if game.version != version:
+            return
+        round_ = game.round
+        if round_.state == Round.State.BIDDING:
+            (decide, fallback, act) = (
+                player.policy.bid, self._fallback.bid, player.place_bid)
+        else:
+            (decide, fallback, act) = (
+                player.policy.card, self._fallback.card, player.play_card)
+        try:
+            move = self._thinking.submit(decide, player, round_).result(
+                timeout=self.time_budget)
+        except Exception:
+            move = fallback(player, round_)
+        # one mutation: nobody may move between the check and the act
+        with game.mutation():
+            if game.version != version:
+                return
+            try:
+                try:
+                    act(move)
+                except (PlayerRetryableError, ValueError):
+                    act(fallback(player, round_))
+            except ModelError:
+                pass  # someone else changed the Game in the meantime
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop taking turns."""
+        self._turns.shutdown(wait)
+        self._thinking.shutdown(wait)
@@ -0,0 +1,97 @@
+"""Memoize what is derived from a Game until the Game changes."""
+import collections
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .models import Game
+
+_Entry = Tuple[int, Dict[Hashable, Any]]
+_History = Dict[Hashable, 'collections.OrderedDict[int, Any]']
+
+
+class VersionCache:
+    """Memoize values computed from a Game in a given version.
+
+    Entries are kept per Game (without keeping the Game alive) and
+    are all evicted as soon as a newer version of that Game is seen.
+    """
+
+    def __init__(self):
+        """Create an empty cache."""
+        self._lock = threading.Lock()
+        self._entries: 'weakref.WeakKeyDictionary[Game, _Entry]' = \
+            weakref.WeakKeyDictionary()
+        """Map Game to its cached version and the values for that version."""
+
+    def get(
+            self,
+            game: Game,
+            version: int,
+            key: Hashable,
+            compute: Callable[[], Any]
+    ) -> Any:
+        """Return compute() for the Game in that version, memoized by key.
+
+        Nothing is memoized if the Game moved past `version' in the
+        meantime.
+        """
+        with self._lock:
+            (cached_version, values) = self._entries.get(game, (-1, {}))
+            if cached_version < version:
+                values = {}
+                self._entries[game] = (version, values)
+            elif cached_version > version:
+                values = {}  # stale request: compute, but do not memoize
+            try:
+                return values[key]
+            except KeyError:
+                pass
+        value = compute()
+        if game.version == version:
+            values[key] = value
+        return value
+
+    def __len__(self) -> int:
+        """Return how many Games have cached values."""
+        return len(self._entries)
+
+
+class SnapshotHistory:
+    """Remember the last values recorded for a Game, by key and version.
+
+    Like VersionCache, this does not keep Games alive.  Only the
+    `depth' most recent versions are kept for each key.
+    """
+
+    def __init__(self, depth: int = 8):
+        """Create an empty history."""
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self._depth = depth
+        self._lock = threading.Lock()
+        self._entries: 'weakref.WeakKeyDictionary[Game, _History]' = \
+            weakref.WeakKeyDictionary()
+        """Map Game to key to version to recorded value."""
+
+    def record(
+            self,
+            game: Game,
+            key: Hashable,
+            version: int,
+            value: Any
+    ) -> None:
+        """Remember the value for the Game in that version."""
+        with self._lock:
+            versions = self._entries.setdefault(game, {}).setdefault(
+                key, collections.OrderedDict())
+            versions[version] = value
+            versions.move_to_end(version)
+            while len(versions) > self._depth:
+                versions.popitem(last=False)
+
+    def get(self, game: Game, key: Hashable, version: int) -> Optional[Any]:
+        """Return the value recorded for the Game in that version, if any."""
+        with self._lock:
+            versions = self._entries.get(game, {}).get(key)
+            return None if versions is None else versions.get(version)
@@ -0,0 +1,168 @@
+"""Command line interface: `flask rikiki <command>'."""
+import concurrent.futures
+import functools
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+import click
+from flask.cli import AppGroup
+
+from .bots import POLICIES
+from .models import Game, MAX_CARDS, Player, Round
+
+rikiki = AppGroup('rikiki', help="Rikiki commands.")
+
+MIN_GAMES_PER_WORKER = 16
+"""Without --workers, fewer games per CPU get fewer workers (none below
+that many games): starting the worker processes and sending them the
+games takes longer than playing them (a Game takes about 40ms)."""
+
+
+def play_game(
+        player_count: int,
+        seed: int,
+        policy_names: Sequence[str],
+        game_index: int
+) -> List[Dict[str, Any]]:
+    """Play a whole Game with bots and return one record per Round.
+
+    The random generator is seeded from seed and game_index so that
+    each Game is reproducible, whatever process plays it.  Seat s
+    is played by policy_names[s % len(policy_names)].
+    """
+    random.seed(f"{seed}:{game_index}")
+    players = [Player(f"Bot {seat}", f"bot secret {seat}")
+               for seat in range(player_count)]
+    bots = {}
+    for (seat, player) in enumerate(players):
+        player.confirm("")
+        bots[player.id] = POLICIES[policy_names[seat % len(policy_names)]]()
+    game = Game(players)
+    game.start_game()
+    records: List[Dict[str, Any]] = []
+    while game.state != Game.State.DONE:
+        round_ = game.round
+        while round_.state == Round.State.BIDDING:
+            player = round_.current_player
+            player.place_bid(bots[player.id].bid(player, round_))
+        while round_.state != Round.State.DONE:
+            player = round_.current_player
+            player.play_card(bots[player.id].card(player, round_))
+        records.append({
+            "game": game_index,
+            "round": len(records),
+            "cards": game.current_card_count,
+            "trump": None if round_.trump is None else int(round_.trump),
+            "first_seat": players.index(game.confirmed_players[0]),
+            "bids": [p.bid for p in players],
+            "tricks": [p.tricks for p in players],
+        })
+        game.start_next_round()
+    return records
+
+
+def round_count(player_count: int) -> int:
+    """Return number of Rounds in a Game (see Game.start_next_round)."""
+    return 2 * (MAX_CARDS // player_count) - 1
+
+
+class JsonlWriter:
+    """Write one JSON object per line."""
+
+    def __init__(self, output: str):
+        """Open output ('-' for stdout)."""
+        self._file = click.open_file(output, 'w')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append a record."""
+        self._file.write(json.dumps(record))
+        self._file.write('\n')
+
+    def close(self) -> None:
+        """Flush and close the output."""
+        self._file.close()
+
+
+class NpyWriter:
+    """Write records into a structured NumPy array file."""
+
+    def __init__(self, output: str, player_count: int, rows: int):
+        """Create the .npy file for that many records."""
+        try:
+            import numpy as np  # type: ignore
+        except ImportError:
+            raise click.UsageError("Writing .npy files needs numpy")
+        dtype = np.dtype([
+            ('game', 'i4'),
+            ('round', 'i2'),
+            ('cards', 'i1'),
+            ('trump', 'i1'),  # -1 if no trump
+            ('first_seat', 'i1'),
+            ('bids', 'i1', (player_count,)),
+            ('tricks', 'i1', (player_count,)),
+        ])
+        self._array = np.lib.format.open_memmap(
+            output, mode='w+', dtype=dtype, shape=(rows,))
+        self._row = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Store a record in the next row."""
+        row = self._array[self._row]
+        for (field, value) in record.items():
+            row[field] = -1 if value is None else value
+        self._row += 1
+
+    def close(self) -> None:
+        """Flush the file."""
+        self._array.flush()
+        del self._array
+
+
+@rikiki.command('simulate')
+@click.option('--players', '-p', type=click.IntRange(2, MAX_CARDS),
+              default=4, show_default=True, help="Players per game.")
+@click.option('--games', '-n', type=click.IntRange(1),
+              default=100, show_default=True, help="Number of games.")
+@click.option('--workers', '-w', type=click.IntRange(1), default=None,
+              help="Worker processes [default: one per CPU].")
+@click.option('--seed', '-s', type=int, default=0, show_default=True,
+              help="Seed of the random generators.")
+@click.option('--policy', type=click.Choice(sorted(POLICIES)),
+              multiple=True, default=['greedy'], show_default=True,
+              help="Bot policy, repeat to assign policies to seats "
+                   "in turn.")
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              default='-', show_default=True,
+              help="JSONL output or .npy file.")
+def simulate(players, games, workers, seed, policy, output):
+    """Play games between bots, recording each round's results."""
+    if output.endswith('.npy'):
+        writer: Any = NpyWriter(output, players, games * round_count(players))
+    else:
+        writer = JsonlWriter(output)
+    job = functools.partial(play_game, players, seed, tuple(policy))
+    if workers is None:
+        workers = max(1, min(os.cpu_count() or 1,
+                             games // MIN_GAMES_PER_WORKER))
+    start = time.perf_counter()
+    try:
+        if workers == 1:
+            for records in map(job, range(games)):
+                for record in records:
+                    writer.write(record)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                chunksize = max(1, games // (8 * workers))
+                for records in executor.map(
+                        job, range(games), chunksize=chunksize):
+                    for record in records:
+                        writer.write(record)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    click.echo(f"{games} games ({games * round_count(players)} rounds) "
+               f"in {elapsed:.2f}s: {games / elapsed:.1f} games/s",
+               err=True)
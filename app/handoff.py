@@ -0,0 +1,125 @@
+"""Hand the Games over to the next process when restarting.
+
+On SIGTERM, the process writes all its Games (see app.snapshot) and
+the keys signing the session cookies to the HANDOFF file, then exits.
+The next process loads them before serving requests: Players keep
+their links and sessions and the Games go on where they were.
+
+The file holds all secrets, and is deleted once loaded.
+"""
+import contextlib
+import json
+import os
+import signal
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import flask
+
+from . import snapshot
+from .registry import RegisteredGame
+
+if TYPE_CHECKING:
+    from . import RikikiApp
+
+MAGIC = b'RKH1'
+
+HANDED_OVER = ('SECRET_KEY', 'CSRF_SESSION_KEY', 'ORGANIZER_SECRET')
+"""Configuration values passed to the next process."""
+
+_HEADER = struct.Struct('<4sI')
+
+
+class HandoffError(ValueError):
+    """The handoff file is damaged or in an unknown format."""
+
+
+def hand_over(app: "RikikiApp", path: str) -> None:
+    """Write the application's Games and secrets to path."""
+    # '_bytes' lists the keys of bytes values, written in hexadecimal
+    config: Dict[str, Any] = {'_bytes': []}
+    for key in HANDED_OVER:
+        value = app.config[key]
+        if isinstance(value, bytes):
+            config['_bytes'].append(key)
+            value = value.hex()
+        config[key] = value
+    header = json.dumps(config).encode('utf-8')
+    games = {game.id: RegisteredGame(
+        game, app.games.organizer_secret(game.id)) for game in app.games}
+    temporary = f"{path}.tmp"
+    # left over by a crash while writing: only the owner may read it
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(temporary)
+    output_fd = os.open(temporary, os.O_CREAT | os.O_EXCL | os.O_WRONLY,
+                        0o600)
+    with contextlib.ExitStack() as frozen, \
+            os.fdopen(output_fd, 'wb') as output:
+        # no Game may change while it is written
+        for entry in games.values():
+            frozen.enter_context(entry.game.mutation())
+        output.write(_HEADER.pack(MAGIC, len(header)))
+        output.write(header)
+        snapshot.dump(games, 0, output)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary, path)
+
+
+def take_over(
+        app: flask.Flask,
+        path: str,
+        wait: float = 0
+) -> Optional[List[RegisteredGame]]:
+    """Load the secrets of path into app.config and return its Games.
+
+    Wait up to `wait' seconds for the previous process to write the
+    file.  Return None if there is no file.
+    """
+    deadline = time.monotonic() + wait
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    try:
+        with open(path, 'rb') as handoff:
+            data = handoff.read()
+    except FileNotFoundError:
+        return None
+    try:
+        (magic, size) = _HEADER.unpack(data[:_HEADER.size])
+        if magic != MAGIC:
+            raise HandoffError(f"Not a handoff file: {magic!r}")
+        config = json.loads(data[_HEADER.size:(_HEADER.size + size)])
+        (games, _) = snapshot.load(data[(_HEADER.size + size):])
+    except (struct.error, ValueError) as e:
+        raise HandoffError(f"Can not load {path}") from e
+    for key in config.pop('_bytes'):
+        config[key] = bytes.fromhex(config[key])
+    app.config.update(config)
+    os.remove(path)
+    return list(games.values())
+
+
+def hand_over_on_sigterm(app: "RikikiApp", path: str) -> None:
+    """Call hand_over before the process terminates on SIGTERM.
+
+    Only possible from the main thread, does nothing otherwise.  Does
+    nothing either if SIGTERM is ignored: the process does not end.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if previous == signal.SIG_IGN:
+        return
+
+    def handler(signum, frame):
+        hand_over(app, path)
+        if callable(previous):
+            signal.signal(signal.SIGTERM, previous)
+            previous(signum, frame)
+        else:
+            # SIG_DFL, or None for a handler not installed by Python
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+    signal.signal(signal.SIGTERM, handler)
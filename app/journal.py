@@ -0,0 +1,404 @@
+"""Journal of model events, to rebuild the Games after a restart.
+
+The journal is a text file with one JSON object per line: either a
+'game_created' record holding all that is needed to recreate a Game
+and its Players (including their secrets), or one of the events of
+Game.add_event_listener, e.g.
+
+  {"game": "0123456789ABCDEF", "event": "bid", "player": "3_1a2b3c4d",
+   "bid": 2}
+
+Journal.append returns once its record is on disk.  A writer thread
+writes and fsyncs all records appended in the meantime at once
+("group commit"): a burst of card plays costs one fsync, not one per
+card.  The events of a watched Game are only queued while its lock is
+held: the thread that changed the Game waits for them to be on disk
+once the mutation is done, so that other requests for the Game do not
+wait for the disk as well.  replay reads the journal back into Games.
+
+To keep replay short, the writer thread renames the journal file
+every `snapshot_every' records to a numbered segment (path.1, path.2,
+...) and starts a new file.  A background thread then loads the
+previous snapshot (see app.snapshot), replays the segment on top of
+it, and writes the result to path.snapshot.  Segments covered by a
+durable snapshot are deleted.
+"""
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import snapshot
+from .bots import BotPlayer
+from .models import Card, Game, ModelError, Player
+from .registry import RegisteredGame
+
+
+class JournalError(RuntimeError):
+    """The journal can not be written or replayed."""
+
+
+def game_created(game: Game, organizer_secret: str) -> Dict[str, Any]:
+    """Return the record of a new Game."""
+    players = []
+    for player in game.players:
+        identity: Dict[str, Any] = player.identity()
+        if isinstance(player, BotPlayer):
+            identity['policy'] = player.policy_name
+        players.append(identity)
+    return {'game': game.id,
+            'event': 'game_created',
+            'csrf_token': game.csrf_token,
+            'organizer_secret': organizer_secret,
+            'players': players}
+
+
+def _segment_path(path: str, segment: int) -> str:
+    return f"{path}.{segment}"
+
+
+def _snapshot_path(path: str) -> str:
+    return f"{path}.snapshot"
+
+
+def _segments(path: str) -> List[int]:
+    # Return numbers of the journal's segments, in increasing order
+    (directory, name) = os.path.split(os.path.abspath(path))
+    pattern = re.compile(re.escape(name) + r'\.([0-9]+)')
+    return sorted(int(match.group(1))
+                  for match in map(pattern.fullmatch, os.listdir(directory))
+                  if match is not None)
+
+
+def _fsync_directory(path: str) -> None:
+    # make renaming or creating path durable
+    directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+def _drop_incomplete_line(path: str) -> None:
+    # A crash while writing leaves half a record at the end: remove it
+    # so that new records start on their own line.
+    try:
+        with open(path, 'rb+') as journal:
+            data = journal.read()
+            if data and not data.endswith(b'\n'):
+                journal.truncate(data.rfind(b'\n') + 1)
+    except FileNotFoundError:
+        pass
+
+
+class Journal:
+    """Append records to a journal file."""
+
+    def __init__(
+            self,
+            path: str,
+            fsync: bool = True,
+            snapshot_every: int = 0
+    ):
+        """Open the journal file for appending.
+
+        snapshot_every is the number of records after which a snapshot
+        is taken, 0 to never take one.
+        """
+        self.path = path
+        self._fsync = fsync
+        self._snapshot_every = snapshot_every
+        _drop_incomplete_line(path)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._segment = max(_segments(path) + [_snapshot_segment(path)])
+        """Number of the last segment."""
+        self._since_rotation = 0
+        """Number of records written since the last segment."""
+        self._checkpoint: Optional[threading.Thread] = None
+        """Thread writing a snapshot."""
+        self.checkpoint_error: Optional[Exception] = None
+        """Why the last snapshot failed, if it did."""
+        self._lock = threading.Condition()
+        """Protects all attributes below, notified when they change."""
+        self._pending: List[str] = []
+        """Lines not handed to the writer thread yet."""
+        self._appended = 0
+        """Number of records appended so far."""
+        self._committed = 0
+        """Number of records on disk."""
+        self._error: Optional[Exception] = None
+        """Why the writer thread stopped."""
+        self._closed = False
+        self._unwritten = threading.local()
+        """Ticket of the last event queued by the thread, see watch."""
+        self._writer = threading.Thread(
+            target=self._write_loop, name='rikiki-journal', daemon=True)
+        self._writer.start()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a record and wait until it is on disk."""
+        self._wait(self._enqueue(record))
+
+    def _enqueue(self, record: Dict[str, Any]) -> int:
+        # Hand the record to the writer thread, return its ticket
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            if self._closed or self._error is not None:
+                raise JournalError(
+                    f"Journal {self.path} is closed") from self._error
+            self._pending.append(line)
+            self._appended += 1
+            self._lock.notify_all()
+            return self._appended
+
+    def _wait(self, ticket: int) -> None:
+        # Wait until the record of the ticket is on disk
+        with self._lock:
+            self._lock.wait_for(
+                lambda: self._committed >= ticket or self._error is not None)
+            if self._committed < ticket:
+                raise JournalError(
+                    f"Writing {self.path} failed") from self._error
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                (lines, self._pending) = (self._pending, [])
+                ticket = self._appended
+            try:
+                self._file.write(''.join(line + '\n' for line in lines))
+                self._file.flush()
+                if self._fsync:
+                    os.fsync(self._file.fileno())
+            except Exception as e:
+                with self._lock:
+                    self._error = e
+                    self._lock.notify_all()
+                return
+            with self._lock:
+                self._committed = ticket
+                self._lock.notify_all()
+            self._since_rotation += len(lines)
+            if 0 < self._snapshot_every <= self._since_rotation \
+                    and (self._checkpoint is None
+                         or not self._checkpoint.is_alive()):
+                try:
+                    self._rotate()
+                except Exception as e:
+                    with self._lock:
+                        self._error = e
+                        self._lock.notify_all()
+                    return
+
+    def _rotate(self) -> None:
+        # Start a new segment and snapshot the previous ones
+        self._file.close()
+        self._segment += 1
+        os.rename(self.path, _segment_path(self.path, self._segment))
+        self._file = open(self.path, 'a', encoding='utf-8')
+        _fsync_directory(self.path)
+        self._since_rotation = 0
+        self._checkpoint = threading.Thread(
+            target=self._take_snapshot, args=(self._segment,),
+            name='rikiki-snapshot', daemon=True)
+        self._checkpoint.start()
+
+    def _take_snapshot(self, segment: int) -> None:
+        try:
+            take_snapshot(self.path, segment)
+            self.checkpoint_error = None
+        except Exception as e:
+            # the segments are still there, the next snapshot retries
+            self.checkpoint_error = e
+
+    def record_game(self, game: Game, organizer_secret: str) -> None:
+        """Append the record of a new Game and watch its events."""
+        self.append(game_created(game, organizer_secret))
+        self.watch(game)
+
+    def watch(self, game: Game) -> None:
+        """Append all events of the Game from now on.
+
+        Each mutation returns once its events are on disk.
+        """
+        game.add_event_listener(self._game_event)
+        game.add_done_listener(self._mutation_done)
+
+    def _game_event(self, game: Game, event: str, data: Dict[str, Any]):
+        # called with the Game's lock held: do not wait for the disk
+        self._unwritten.ticket = self._enqueue(
+            {'game': game.id, 'event': event, **data})
+
+    def _mutation_done(self, game: Game) -> None:
+        ticket = getattr(self._unwritten, 'ticket', 0)
+        if ticket:
+            self._unwritten.ticket = 0
+            self._wait(ticket)
+
+    def close(self) -> None:
+        """Write the pending records and close the file."""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        self._writer.join()
+        self._file.close()
+        if self._checkpoint is not None:
+            self._checkpoint.join()
+
+
+def _new_game(record: Dict[str, Any]) -> RegisteredGame:
+    players: List[Player] = []
+    for identity in record['players']:
+        if 'policy' in identity:
+            player: Player = BotPlayer(identity['provisional_name'],
+                                       identity['policy'])
+        else:
+            player = Player(identity['provisional_name'],
+                            identity['secret_id'])
+        player.restore_identity(identity['player_id'],
+                                identity['confirmed_secret_id'],
+                                identity['cookie'])
+        if identity['confirmed_name'] is not None:
+            player.confirm(identity['confirmed_name'])
+        players.append(player)
+    game = Game(players)
+    game.restore_identity(record['game'], record['csrf_token'])
+    return RegisteredGame(game, record['organizer_secret'])
+
+
+def _apply(game: Game, record: Dict[str, Any]) -> None:
+    event = record['event']
+    if 'player' in record:
+        player = game.player_by_id(record['player'])
+    if event == 'player_confirmed':
+        player.confirm(record['name'])
+    elif event == 'secret_updated':
+        player.update_secret(record['secret_id'], record['cookie'])
+    elif event == 'game_started':
+        game.start_game(record['deck'])
+    elif event == 'bid':
+        player.place_bid(record['bid'])
+    elif event == 'card_played':
+        player.play_card(Card(record['card']))
+    elif event == 'round_finished':
+        # implied by the last card played, only double check
+        if game.state != Game.State.PAUSED_BETWEEN_ROUNDS:
+            raise ModelError(f"Round not finished, Game is in {game.state}")
+    elif event == 'next_round':
+        game.start_next_round(record['deck'])
+    elif event == 'game_restarted':
+        game.restart_with_same_players(record['order'])
+    else:
+        raise ValueError(f"Unknown event {event!r}")
+
+
+class _Replay:
+    """Games being rebuilt from a snapshot and journal files."""
+
+    def __init__(self, games: Dict[str, RegisteredGame]):
+        self.games = games
+        """Map Game.id to RegisteredGame."""
+        self._organizers = {entry.organizer_secret: game_id
+                            for (game_id, entry) in games.items()}
+
+    def add(self, entry: RegisteredGame) -> None:
+        # Like GameRegistry.register: forget the organizer's old Game
+        old_game_id = self._organizers.get(entry.organizer_secret)
+        if old_game_id is not None:
+            del self.games[old_game_id]
+        self._organizers[entry.organizer_secret] = entry.game.id
+        self.games[entry.game.id] = entry
+
+    def replay(self, path: str) -> None:
+        try:
+            journal = open(path, encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with journal:
+            for (number, line) in enumerate(journal, 1):
+                if not line.endswith('\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                    if record['event'] == 'game_created':
+                        self.add(_new_game(record))
+                    elif record['game'] in self.games:
+                        _apply(self.games[record['game']].game, record)
+                    # else a bot still moved in a Game replaced by its
+                    # organizer, maybe before the snapshot: forget it
+                except (KeyError, StopIteration, ValueError,
+                        ModelError) as e:
+                    raise JournalError(
+                        f"{path}:{number}: can not replay {line.strip()}"
+                    ) from e
+
+
+def _load_snapshot(path: str) -> Tuple[Dict[str, RegisteredGame], int]:
+    try:
+        with open(_snapshot_path(path), 'rb') as snapshot_file:
+            data = snapshot_file.read()
+    except FileNotFoundError:
+        return ({}, 0)
+    try:
+        return snapshot.load(data)
+    except (snapshot.SnapshotError, ModelError, ValueError) as e:
+        raise JournalError(f"Can not load {_snapshot_path(path)}") from e
+
+
+def _snapshot_segment(path: str) -> int:
+    try:
+        with open(_snapshot_path(path), 'rb') as snapshot_file:
+            return snapshot.segment(snapshot_file.read(snapshot.HEADER_SIZE))
+    except FileNotFoundError:
+        return 0
+    except snapshot.SnapshotError as e:
+        raise JournalError(f"Can not load {_snapshot_path(path)}") from e
+
+
+def load(
+        path: str,
+        last_segment: Optional[int] = None
+) -> Dict[str, RegisteredGame]:
+    """Return the Games of the journal by id, in order of creation.
+
+    The Games are those of the snapshot, updated by the later segments
+    up to last_segment, or up to the journal file itself if
+    last_segment is None.
+
+    A missing journal holds no Game.  An incomplete last line is the
+    trace of a crash while writing it: since its record never made
+    it to disk, nobody was told it had, so it is ignored.
+    """
+    (games, covered) = _load_snapshot(path)
+    replay = _Replay(games)
+    for segment in _segments(path):
+        if covered < segment and (last_segment is None
+                                  or segment <= last_segment):
+            replay.replay(_segment_path(path, segment))
+    if last_segment is None:
+        replay.replay(path)
+    return replay.games
+
+
+def replay(path: str) -> List[RegisteredGame]:
+    """Return the Games of the journal, in the order they were created."""
+    return list(load(path).values())
+
+
+def take_snapshot(path: str, segment: int) -> None:
+    """Snapshot the journal up to segment and delete the segments."""
+    games = load(path, segment)
+    temporary = _snapshot_path(path) + '.tmp'
+    with open(temporary, 'wb') as output:
+        snapshot.dump(games, segment, output)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary, _snapshot_path(path))
+    _fsync_directory(path)
+    for old_segment in _segments(path):
+        if old_segment <= segment:
+            os.remove(_segment_path(path, old_segment))
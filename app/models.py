@@ -1,11 +1,16 @@
 """Model classes (the M in MVC)."""
 import base64
 import collections
+import contextlib
 import enum
+import functools
 import hashlib
 import os
 import random
-from typing import (List, Optional, Tuple, Union)
+import threading
+import types
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Mapping,
+                    NamedTuple, Optional, Sequence, Tuple, Union)
 
 
 class ModelError(RuntimeError):
@@ -56,6 +61,18 @@ def _ensure_non_blank(s, name, message=None):
         raise ValueError(msg)
 
 
+def _mutation(method):
+    # Run a method of Game, Round or Player in its Game's mutation
+    @functools.wraps(method)
+    def mutate(self, *args, **kwargs):
+        game = self if isinstance(self, Game) else self._game
+        if game is None:
+            return method(self, *args, **kwargs)
+        with game.mutation():
+            return method(self, *args, **kwargs)
+    return mutate
+
+
 class Game:
     """Handle confirming of the players and sequencing the rounds."""
 
@@ -74,8 +91,35 @@ class Game:
         """Create new Game instance."""
         self._players = players
         """List of players invited to the Game."""
+        self._players_by_id: Dict[str, "Player"] = {}
+        """Map Player.id to Player."""
+        self._players_by_secret_id: Dict[str, "Player"] = {}
+        """Map Player.secret_id to Player."""
+        self._players_by_cookie: Dict[str, "Player"] = {}
+        """Map Player.cookie to Player."""
+        for player in players:
+            player.invite(self)
+            self._index_player(player)
+        self._id = "".join(f"{x:02X}" for x in os.urandom(8))
+        """Public identifier of the Game, part of all Player URLs."""
         self._csrf_token = "".join(f"{x:02X}" for x in os.urandom(16))
         """All requests using a session cookie must contain this token."""
+        self._version = 0
+        """Incremented by each mutation, see Game.changed."""
+        self._version_changed = threading.Condition()
+        """Notified each time _version is incremented."""
+        self._turn = 0
+        """Incremented by each move, see Game.turn."""
+        self._lock = threading.RLock()
+        """Held during mutations, see Game.mutation."""
+        self._mutation_depth = 0
+        """Number of nested mutations in progress, protected by _lock."""
+        self._listeners: List[Callable[["Game"], None]] = []
+        """Called with the Game after each change, see add_listener."""
+        self._event_listeners: List[EventListener] = []
+        """Called for each event of the Game, see add_event_listener."""
+        self._done_listeners: List[Callable[["Game"], None]] = []
+        """Called after each mutation, see add_done_listener."""
         self._state: Game.State
         """Game state."""
         self._confirmed_players: List["Player"]
@@ -85,7 +129,10 @@ class Game:
         self._round: Optional["Round"]
         self._increasing: bool
         """Number of cards per Players decreasing or increasing."""
+        self._view: GameView
+        """Published after each mutation, see Game.view."""
         self._prepare_game()
+        self._publish()
 
     def _prepare_game(self):
         self._state = Game.State.CONFIRMING
@@ -94,26 +141,213 @@ class Game:
         self._round = None
         self._increasing = False
 
-    def status_summary(self) -> str:
-        """Return an identifier for the current state.
+    @property
+    def version(self) -> int:
+        """Return a number that increases each time the Game changes.
+
+        Changes of the Game's Round or Players count as well.  This
+        helps detect state changes and trigger redraws of the UI.
+        """
+        return self._version
+
+    @property
+    def turn(self) -> int:
+        """Return a number that increases with each move in the Game.
+
+        Moves (see MOVES) change whose turn it is or what a Player may
+        do.  Unlike the version, the turn stays the same when a Player
+        confirms or gets a new secret: a Player's action based on the
+        Game in some turn still makes sense until the next move.
+        """
+        return self._turn
+
+    @property
+    def view(self) -> "GameView":
+        """Return the state of the Game after the last mutation.
 
-        This identifier helps detect state changes and trigger redraws
-        of the UI.
+        The GameView is immutable: a reader takes it once and sees a
+        consistent state without locking or revalidating anything.
         """
-        result = f'{self._state}+{len(self._players)}' \
-            f'+{sum(p.is_confirmed for p in self._players)}' \
-            f'+{len(self._confirmed_players)}' \
-            f'+{"".join(chr(len(p.name) % 27 + 64) for p in self._players)}'
+        return self._view
+
+    def _publish(self) -> None:
+        # Replace the view and wake up wait_for_change
+        players = {p.id: p.view() for p in self._players}
+        round_ = None
+        if self._state != Game.State.CONFIRMING and self._round is not None:
+            round_ = RoundView(
+                state=self._round.state,
+                trump=self._round.trump,
+                current_player=players[self._round.current_player.id],
+                current_trick=tuple((players[p.id], card)
+                                    for (p, card)
+                                    in self._round.current_trick))
+        view = GameView(
+            version=self._version,
+            turn=self._turn,
+            state=self._state,
+            players=tuple(players.values()),
+            players_by_id=types.MappingProxyType(players),
+            confirmed_players=tuple(players[p.id]
+                                    for p in self._confirmed_players),
+            current_card_count=(self._current_card_count
+                                if self._state in (
+                                        Game.State.PLAYING,
+                                        Game.State.PAUSED_BETWEEN_ROUNDS)
+                                else 0),
+            round=round_)
+        with self._version_changed:
+            self._view = view
+            self._version_changed.notify_all()
+
+    def changed(self) -> None:
+        """Call after each mutation of the Game, its Round or Players."""
+        with self._version_changed:
+            self._version += 1
+        outside_mutation = self._mutation_depth == 0
+        if outside_mutation:
+            # otherwise the mutation publishes its view when done
+            self._publish()
+        for listener in self._listeners:
+            listener(self)
+        if outside_mutation:
+            self._done()
+
+    @contextlib.contextmanager
+    def mutation(self) -> Iterator[None]:
+        """Serialize a mutation of the Game, its Round or Players.
+
+        The mutating methods of the models hold the Game's (reentrant)
+        lock while they run: concurrent requests for one Game apply one
+        after the other.  Enter this context to make several calls
+        (e.g. a check followed by a move) one mutation.
+        """
+        outermost = False
         try:
-            result += str(self._current_card_count)
-        except Exception:
-            pass
-        else:
-            try:
-                result += self.round.status_summary()
-            except Exception:
-                pass
-        return result
+            with self._lock:
+                self._mutation_depth += 1
+                try:
+                    yield
+                finally:
+                    self._mutation_depth -= 1
+                    outermost = self._mutation_depth == 0
+                    if outermost:
+                        self._publish()
+        finally:
+            if outermost:
+                self._done()
+
+    def _done(self) -> None:
+        # Call the done listeners, without holding the lock (iterate
+        # over a copy: other threads may remove their listener)
+        for listener in list(self._done_listeners):
+            listener(self)
+
+    def add_listener(self, listener: Callable[["Game"], None]) -> None:
+        """Call listener(game) after each change of the Game.
+
+        Listeners run on the thread that changed the Game, possibly
+        before the whole mutation is done: they should only schedule
+        work and return quickly.
+        """
+        self._listeners.append(listener)
+
+    def add_event_listener(self, listener: "EventListener") -> None:
+        """Call listener(game, event, data) for each event of the Game.
+
+        Events are the operations on the Game, its Round and Players
+        (e.g. 'bid' with data {'player': player_id, 'bid': 3}).  They
+        are emitted once the operation is known to succeed but before
+        the Game is marked as changed, so that listeners see them in
+        the order in which they happened.  Replaying them in that order
+        on a copy of the Game brings the copy in the same state, see
+        app.journal.
+        """
+        self._event_listeners.append(listener)
+
+    def add_done_listener(self, listener: Callable[["Game"], None]) -> None:
+        """Call listener(game) once each mutation is done.
+
+        Unlike other listeners, these run after the lock is released,
+        on the thread that changed the Game: they may take their time
+        (e.g. wait for a disk write) without holding up the Game.
+        """
+        self._done_listeners.append(listener)
+
+    def remove_done_listener(
+            self,
+            listener: Callable[["Game"], None]
+    ) -> None:
+        """Stop calling a listener given to add_done_listener."""
+        self._done_listeners.remove(listener)
+
+    MOVES = frozenset(['game_started', 'bid', 'card_played', 'next_round',
+                       'game_restarted'])
+    """Events that start a new turn, see Game.turn."""
+
+    def emit(self, event: str, **data: Any) -> None:
+        """Call from Game, Round and Players to notify event listeners."""
+        if event in Game.MOVES:
+            self._turn += 1
+        for listener in self._event_listeners:
+            listener(self, event, data)
+
+    def restore_identity(self, game_id: str, csrf_token: str) -> None:
+        """Take over the id and CSRF token of a Game being restored."""
+        self._id = game_id
+        self._csrf_token = csrf_token
+
+    def progress(self) -> Dict[str, Any]:
+        """Return the arguments of restore_progress for the Game's state.
+
+        Confirmed players are given as indices into players.
+        """
+        return {'state': self._state,
+                'confirmed_players': [self._players.index(p)
+                                      for p in self._confirmed_players],
+                'current_card_count': self._current_card_count,
+                'increasing': self._increasing,
+                'version': self._version}
+
+    def restore_progress(
+            self,
+            state: "Game.State",
+            confirmed_players: Sequence[int],
+            current_card_count: int,
+            increasing: bool,
+            version: int
+    ) -> None:
+        """Take over the state of a Game being restored, see progress.
+
+        Restore the Round with Round.restore and resume_round next.
+        The turn goes on from the version, which is at least as large
+        as any turn before: it never goes back.
+        """
+        self._state = state
+        self._confirmed_players = [self._players[i]
+                                   for i in confirmed_players]
+        self._current_card_count = current_card_count
+        self._increasing = increasing
+        self._version = version
+        self._turn = version
+        self._round = None
+        self._publish()
+
+    def resume_round(self, round_: "Round") -> None:
+        """Take over a restored Round, see Round.restore."""
+        self._round = round_
+        self._publish()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Block until the version of the Game's view differs from `version'.
+
+        Return the version of the current view, which is still
+        `version' if `timeout' seconds elapsed without any change.
+        """
+        with self._version_changed:
+            self._version_changed.wait_for(
+                lambda: self._view.version != version, timeout)
+            return self._view.version
 
     def max_cards_per_player(self):
         """Return maximum amount of cards that can be dealt to each Player."""
@@ -123,8 +357,12 @@ class Game:
             return ModelError(
                 f'Game in state {self._state} has 0 confirmed players')
 
-    def start_game(self) -> "Round":
-        """Start first Round of the Game."""
+    @_mutation
+    def start_game(self, deck: Optional[Sequence[int]] = None) -> "Round":
+        """Start first Round of the Game.
+
+        The cards are shuffled unless a deck is given (see Round.deck).
+        """
         self._ensure_state(Game.State.CONFIRMING)
         confirmed_players = [
             player for player in self.players if player.is_confirmed]
@@ -133,20 +371,33 @@ class Game:
         self._state = Game.State.PLAYING
         self._confirmed_players = confirmed_players
         self._current_card_count = self.max_cards_per_player()
-        self._round = Round(self, self._current_card_count)
+        self._round = Round(self, self._current_card_count, deck)
+        self.emit('game_started', deck=list(self._round.deck))
+        self.changed()
         return self._round
 
-    def restart_with_same_players(self) -> None:
-        """Reset Game state to waiting room, shuffling Players."""
+    @_mutation
+    def restart_with_same_players(
+            self,
+            order: Optional[Sequence[str]] = None
+    ) -> None:
+        """Reset Game state to waiting room, shuffling Players.
+
+        order is a list of Player ids to use instead of shuffling.
+        """
         self._ensure_state(Game.State.DONE)
         old_players = [p.id for p in self._players]
         self._prepare_game()
+        if order is not None:
+            self._players.sort(key=lambda p: list(order).index(p.id))
         # ensure we are not very unlucky and shuffle players list back
         # into same order:
-        while len(self._players) > 1:
+        while order is None and len(self._players) > 1:
             random.shuffle(self._players)
             if old_players != [p.id for p in self._players]:
                 break
+        self.emit('game_restarted', order=[p.id for p in self._players])
+        self.changed()
 
     def _ensure_state(
             self, state: Union[State, List[State]]) -> None:
@@ -158,6 +409,11 @@ class Game:
             raise IllegalStateError(
                 f"Expected {state} for game, not {self._state}")
 
+    @property
+    def id(self) -> str:
+        """Return the public id of the Game."""
+        return self._id
+
     @property
     def csrf_token(self) -> str:
         """Return CSRF token."""
@@ -170,15 +426,42 @@ class Game:
 
     def player_by_id(self, _id) -> "Player":
         """Look up a Player by her public ID."""
-        return next(p for p in self._players if p.id == _id)
+        try:
+            return self._players_by_id[_id]
+        except KeyError:
+            raise StopIteration(_id)
 
     def player_by_cookie(self, cookie) -> "Player":
         """Look up a Player by her cookie."""
-        return next(p for p in self._players if p.cookie == cookie)
+        try:
+            return self._players_by_cookie[cookie]
+        except KeyError:
+            raise StopIteration(cookie)
 
     def player_by_secret_id(self, secret_id) -> "Player":
         """Look up a Player by her secret ID."""
-        return next(p for p in self._players if p.secret_id == secret_id)
+        try:
+            return self._players_by_secret_id[secret_id]
+        except KeyError:
+            raise StopIteration(secret_id)
+
+    def _index_player(self, player: "Player") -> None:
+        self._players_by_id[player.id] = player
+        self._players_by_secret_id[player.secret_id] = player
+        self._players_by_cookie[player.cookie] = player
+
+    def player_secrets_changed(
+            self,
+            player: "Player",
+            old_secret_id: str,
+            old_cookie: str
+    ) -> None:
+        """Call from Player when her secret_id or cookie changed."""
+        if self._players_by_secret_id.get(old_secret_id) is player:
+            del self._players_by_secret_id[old_secret_id]
+        if self._players_by_cookie.get(old_cookie) is player:
+            del self._players_by_cookie[old_cookie]
+        self._index_player(player)
 
     @property
     def confirmed_players(self) -> List["Player"]:
@@ -219,13 +502,20 @@ class Game:
         """Return current Game.State."""
         return self._state
 
+    @_mutation
     def round_finished(self) -> None:
         """Call from Round when all cards have been played."""
         self._ensure_state(Game.State.PLAYING)
         self._state = Game.State.PAUSED_BETWEEN_ROUNDS
+        self.emit('round_finished')
+        self.changed()
+
+    @_mutation
+    def start_next_round(self, deck: Optional[Sequence[int]] = None) -> None:
+        """Call to confirm previous Round is finished and start next Round.
 
-    def start_next_round(self) -> None:
-        """Call to confirm previous Round is finished and start next Round."""
+        The cards are shuffled unless a deck is given (see Round.deck).
+        """
         if (self._state == Game.State.PLAYING
             and self._round is not None
             and self._round.state == Round.State.BIDDING
@@ -233,16 +523,18 @@ class Game:
                 self._state == Game.State.DONE
                 and self._round is not None
                 and self._round.state == Round.State.DONE):
-            # Probably a race: when a Round ends, all Players get a
-            # button to start the next round.  If more than one of
-            # them clicks on the button, just ignore the extra
-            # requests.
+            # When a Round ends, all Players get a button to start
+            # the next round.  If more than one of them clicks on the
+            # button, the first request starts the next Round: just
+            # ignore the extra requests.
             pass
         else:
             self._ensure_state(Game.State.PAUSED_BETWEEN_ROUNDS)
             if self._increasing and (
                     self._current_card_count >= self.max_cards_per_player()):
                 self._state = Game.State.DONE
+                self.emit('next_round', deck=None)
+                self.changed()
                 return
             self._current_card_count += (1 if self._increasing else -1)
             if self._current_card_count < 1:
@@ -252,9 +544,14 @@ class Game:
             # First player of next Round shifts
             first_player = self._confirmed_players.pop(0)
             self._confirmed_players.append(first_player)
-            self._round = Round(self, self._current_card_count)
+            self._round = Round(self, self._current_card_count, deck)
+            self.emit('next_round', deck=list(self._round.deck))
+            self.changed()
 
 
+EventListener = Callable[[Game, str, Dict[str, Any]], None]
+"""See Game.add_event_listener."""
+
 PLAYER_COUNTER = 0
 
 
@@ -279,16 +576,20 @@ class Player:
         """A random string, will be used as public ID in API."""
         self._confirmed_name: Optional[str] = None
         """The name the Player chose for himself."""
-        self._cards: List["Card"] = []
-        """The Player's hand"""
+        self._hand = 0
+        """The Player's hand: bit n is set if she holds Card(n)."""
         self._bid: Optional[int] = None
         """The Player's bid: how much tricks does she believe she will make in
 a Round."""
+        self._game: Optional[Game] = None
+        """Reference to the Game the Player is invited to."""
         self._round: Optional["Round"] = None
         """Reference to the Round the Player is currently participating in."""
         self._tricks = 0
         """How many tricks the Player has already won in a Round."""
         self._cookie = self._generate_cookie()
+        self._version = 0
+        """Incremented by each mutation of the Player."""
 
     def _generate_cookie(self) -> str:
         return base64.a85encode(bytes(os.urandom(10))).decode('ascii')
@@ -316,11 +617,91 @@ a Round."""
     def _generate_confirmed_secret_id(self) -> str:
         return "".join(f"{x:02X}" for x in os.urandom(16))
 
-    def update_secret(self):
-        """Change Player's secret_id & cookie, assuming she's confirmed."""
+    @_mutation
+    def update_secret(
+            self,
+            secret_id: Optional[str] = None,
+            cookie: Optional[str] = None
+    ) -> None:
+        """Change Player's secret_id & cookie, assuming she's confirmed.
+
+        New secrets are generated unless given.
+        """
         self._ensure_confirmed()
-        self._confirmed_secret_id = self._generate_confirmed_secret_id()
-        self._cookie = self._generate_cookie()
+        old_secret_id, old_cookie = self.secret_id, self._cookie
+        self._confirmed_secret_id = (self._generate_confirmed_secret_id()
+                                     if secret_id is None
+                                     else secret_id)
+        self._cookie = self._generate_cookie() if cookie is None else cookie
+        self._emit('secret_updated',
+                   secret_id=self._confirmed_secret_id, cookie=self._cookie)
+        self._secrets_changed(old_secret_id, old_cookie)
+
+    def identity(self) -> Dict[str, Optional[str]]:
+        """Return what it takes to recreate the Player before any Round.
+
+        The keys are the arguments of the constructor and of
+        restore_identity and the confirmed name (None if the Player did
+        not confirm yet).
+        """
+        return {'provisional_name': self._provisional_name,
+                'secret_id': self._secret_id,
+                'player_id': self._id,
+                'confirmed_secret_id': self._confirmed_secret_id,
+                'cookie': self._cookie,
+                'confirmed_name': self._confirmed_name}
+
+    def restore_identity(
+            self,
+            player_id: str,
+            confirmed_secret_id: str,
+            cookie: str
+    ) -> None:
+        """Take over the identity of a Player being restored.
+
+        Call before inviting the Player to a Game.
+        """
+        self._id = player_id
+        self._confirmed_secret_id = confirmed_secret_id
+        self._cookie = cookie
+
+    def invite(self, game: Game) -> None:
+        """Record the Game the Player is invited to."""
+        self._game = game
+
+    def _secrets_changed(self, old_secret_id: str, old_cookie: str) -> None:
+        # keep the Game's lookup tables up to date
+        if self._game is not None:
+            self._game.player_secrets_changed(self, old_secret_id, old_cookie)
+        self._changed()
+
+    @property
+    def version(self) -> int:
+        """Return a number that increases each time the Player changes."""
+        return self._version
+
+    def _changed(self) -> None:
+        self._version += 1
+        if self._game is not None:
+            self._game.changed()
+
+    def view(self) -> "PlayerView":
+        """Return an immutable copy of the Player's state, see Game.view."""
+        return PlayerView(
+            id=self._id,
+            name=self.name,
+            secret_id=self.secret_id,
+            is_confirmed=self.is_confirmed,
+            bid=self._bid,
+            tricks=self._tricks,
+            hand=self._hand,
+            playable=(self._round.playable_mask(self._hand)
+                      if self._round is not None and self._bid is not None
+                      else 0))
+
+    def _emit(self, event: str, **data: Any) -> None:
+        if self._game is not None:
+            self._game.emit(event, player=self.id, **data)
 
     @property
     def id(self) -> str:
@@ -342,6 +723,7 @@ a Round."""
         """Return how many tricks the Player believes she is going to win."""
         return self._bid
 
+    @_mutation
     def place_bid(self, value: int) -> None:
         """Announce how many tricks the Player believes she is going to win."""
         self._ensure_confirmed()
@@ -349,12 +731,13 @@ a Round."""
         assert self._round is not None, \
             ("_ensure_has_cards() should already do that, "
              "but mypy does not see it")
-        if 0 <= value <= len(self._cards):
+        if 0 <= value <= self.card_count:
             self._bid = value
             self._round.place_bid(self, value)
+            self._changed()
         else:
             raise ValueError(
-                f"{self} can't bid {value}: outside [0, {len(self._cards)}]")
+                f"{self} can't bid {value}: outside [0, {self.card_count}]")
 
     def __str__(self) -> str:
         """Return string representation of self."""
@@ -370,33 +753,47 @@ a Round."""
             # ... so we have a fallback:
             return super().__str__()
 
+    @_mutation
     def confirm(self, confirmed_name: str) -> None:
         """Accept invitation by confirming or updating the display name."""
+        old_secret_id = self.secret_id
         if confirmed_name is None or confirmed_name.strip() == '':
             self._confirmed_name = self._provisional_name
         else:
             self._confirmed_name = confirmed_name
+        self._emit('player_confirmed', name=self._confirmed_name)
+        if old_secret_id != self.secret_id:
+            self._secrets_changed(old_secret_id, self._cookie)
+        else:
+            self._changed()
 
     @property
     def tricks(self) -> int:
         """Return how many tricks the player took in this Round."""
         return self._tricks
 
+    @_mutation
     def add_trick(self) -> None:
         """Increment trick count, called by Round for winner of the trick."""
         self._ensure_confirmed()
         self._ensure_has_bid()
         self._tricks += 1
+        self._changed()
 
     @property
     def card_count(self) -> int:
         """Return the number of cards in the Player's hand."""
-        return len(self._cards)
+        return card_count(self._hand)
+
+    @property
+    def hand(self) -> int:
+        """Return the cards in the Player's hand as a set (see card_mask)."""
+        return self._hand
 
     @property
     def cards(self) -> List["Card"]:
-        """Return cards in the Player's hand."""
-        return self._cards
+        """Return (a copy of) the cards in the Player's hand."""
+        return mask_cards(self._hand)
 
     @property
     def playable_cards(self) -> List["Card"]:
@@ -408,8 +805,9 @@ a Round."""
             raise RuntimeError(
                 "Keep mypy happy, he should already know that _round "
                 "can't be None here")
-        return [c for c in self._cards if self._card_allowed(c)]
+        return mask_cards(self._round.playable_mask(self._hand))
 
+    @_mutation
     def accept_cards(
             self,
             round_: "Round",
@@ -417,20 +815,36 @@ a Round."""
     ) -> None:
         """Accept the cards that the Round has dealt."""
         self._ensure_confirmed()
-        if self._round is None or self._cards == []:
+        if self._round is None or self._hand == 0:
             self._round = round_
-            self._cards = cards
+            self._hand = card_mask(cards)
             self._tricks = 0
             self._bid = None
+            self._changed()
         else:
             raise IllegalStateError(f"{self} can't change game round now")
 
+    def resume_round(
+            self,
+            round_: "Round",
+            hand: int,
+            bid: Optional[int],
+            tricks: int
+    ) -> None:
+        """Take part in a restored Round, see Round.restore."""
+        self._ensure_confirmed()
+        self._round = round_
+        self._hand = hand
+        self._bid = bid
+        self._tricks = tricks
+        self._version += 1
+
     def _ensure_confirmed(self) -> None:
         if not self.is_confirmed:
             raise IllegalStateError(f"{self} not confirmed yet")
 
     def _ensure_has_cards(self) -> None:
-        if self._cards == [] or self._round is None:
+        if self._hand == 0 or self._round is None:
             raise IllegalStateError(
                 f"{self} has no cards or not in a round")
 
@@ -439,22 +853,24 @@ a Round."""
             raise IllegalStateError(f"{self} has not placed his bid yet")
 
     def _card_allowed(self, card):
-        return self._round.card_allowed(card, hand=self.cards)
+        return self._round.card_allowed(card, hand=self._hand)
 
+    @_mutation
     def play_card(self, card):
         """Put a card down on the table."""
         self._ensure_confirmed()
         self._ensure_has_cards()
         self._ensure_has_bid()
         if self._card_allowed(card):
-            self._cards.remove(card)
+            self._hand &= ~card_bit(card)
             try:
                 self._round.play_card(self, card)
             except Exception as e:
                 # card was not accepted on table, restore player's hand ...
-                self._cards.append(card)
+                self._hand |= card_bit(card)
                 # ... but do not lose the exception
                 raise
+            self._changed()
         else:
             raise CardNotAllowedError(
                 offending_player=self, offending_card=card)
@@ -536,55 +952,117 @@ def same_suit(card1: Card, card2: Card) -> bool:
     return card1 // CARDS_PER_SUIT == card2 // CARDS_PER_SUIT
 
 
+# Sets of cards are represented as integers: bit n is set if Card(n)
+# is in the set.
+
+SUIT_MASKS = tuple(((1 << CARDS_PER_SUIT) - 1) << (suit * CARDS_PER_SUIT)
+                   for suit in range(SUITS))
+"""Set of all cards of each suit."""
+
+
+def card_bit(card: int) -> int:
+    """Return set containing only this card (empty if no valid card)."""
+    return (1 << card) if 0 <= card < MAX_CARDS else 0
+
+
+def card_mask(cards: Iterable[int]) -> int:
+    """Return set of cards."""
+    result = 0
+    for card in cards:
+        result |= card_bit(card)
+    return result
+
+
+def mask_cards(mask: int) -> List[Card]:
+    """Return cards in the set, in increasing order."""
+    result = []
+    while mask:
+        lowest = mask & -mask
+        result.append(Card(lowest.bit_length() - 1))
+        mask ^= lowest
+    return result
+
+
+def card_count(mask: int) -> int:
+    """Return number of cards in the set."""
+    return bin(mask).count('1')
+
+
+def suit_mask(card: Card) -> int:
+    """Return set of all cards of the same suit as card."""
+    return SUIT_MASKS[card // CARDS_PER_SUIT]
+
+
+def playable_mask(hand: int, first_card: Optional[Card] = None) -> int:
+    """Return set of cards of hand that may be played.
+
+    first_card is the first card on the table (None if the table is
+    empty).
+    """
+    if first_card is None:
+        return hand  # anything goes on an empty table
+    # following suit of starting card is mandatory, playing a
+    # different suit is only allowed if no such card is in hand:
+    return (hand & suit_mask(first_card)) or hand
+
+
 def card_allowed(card: Card, hand: List[Card] = [], table: List[Card] = []):
     """Check if a Card may be played."""
-    if card not in hand:  # must hold the card to play it
-        return False
-    if table == []:
-        return True  # anything goes on an empty table
-    first_card = table[0]
-    if same_suit(first_card, card):
-        return True  # following suit of starting card is always
-    # playing a different suit allowed than first card on table is
-    # only allowed if no other card is present in Player's hand:
-    return not any(same_suit(first_card, c) for c in hand)
+    allowed = playable_mask(card_mask(hand), table[0] if table else None)
+    return (allowed & card_bit(card)) != 0
+
+
+def _trick_key(card: int, lead_suit: int, trump_suit: Optional[int]) -> int:
+    # trumps beat cards of the lead suit which beat all other cards.
+    # Within these groups, the higher card wins.
+    suit = card // CARDS_PER_SUIT
+    if suit == trump_suit:
+        return 2 * MAX_CARDS + card
+    if suit == lead_suit:
+        return MAX_CARDS + card
+    return card
+
+
+TRICK_KEYS = tuple(
+    tuple(tuple(_trick_key(card, lead_suit, trump_suit)
+                for card in range(MAX_CARDS))
+          for trump_suit in [*range(SUITS), None])
+    for lead_suit in range(SUITS))
+"""Sort keys of the cards in a trick: the card with the highest key wins.
+
+TRICK_KEYS[lead_suit][trump_suit][card] where lead_suit is the suit
+of the first card of the trick and trump_suit is SUITS if there is
+no trump."""
+
+
+def trick_keys(first_card_in_trick: Card, trump: Optional[Card] = None):
+    """Return sort keys of all cards for a trick, see TRICK_KEYS."""
+    return TRICK_KEYS[first_card_in_trick // CARDS_PER_SUIT][
+        SUITS if trump is None else trump // CARDS_PER_SUIT]
+
+
+def trick_winner(trick: List[Card], trump: Optional[Card] = None) -> int:
+    """Return index of the card winning the trick (cards in playing order).
+
+    A trick holds at most one card per Player: looking each card up in
+    TRICK_KEYS costs less than building an array to rank them at once.
+    """
+    keys = trick_keys(trick[0], trump)
+    return max(range(len(trick)), key=lambda idx: keys[trick[idx]])
 
 
 def beats(card1: Card,
           card2: Card,
           first_card_in_trick: Card,
           trump: Optional[Card] = None) -> bool:
-    """Return True if card1 beats card2."""
-    if trump is not None:
-        if same_suit(card1, trump) and same_suit(card2, trump):
-            return card1 > card2
-        elif same_suit(card1, trump):
-            return True
-        elif same_suit(card2, trump):
-            return False
-        else:
-            # Neither card is from the same suit as the trump card:
-            # the comparison rules apply as if there was no trump
-            # card:
-            return beats(card1, card2, first_card_in_trick, trump=None)
-    else:
-        if (same_suit(card1, first_card_in_trick) and
-                same_suit(card2, first_card_in_trick)):
-            return card1 > card2
-        elif same_suit(card1, first_card_in_trick):
-            return True
-        elif same_suit(card2, first_card_in_trick):
-            return False
-        elif same_suit(card1, card2):
-            return card1 > card2
-        else:
-            # This case does not really matter (except maybe to sort
-            # the player's hand for display purposes).  When looking
-            # for the winning card in a trick, the first card of the
-            # trick will always trivially satisfy 'same_suit(card1,
-            # first_card_in_trick)' and hence be compared with the
-            # next cards and so on, looking for the maximum.
-            return card1 > card2
+    """Return True if card1 beats card2.
+
+    If neither card follows the first card's suit nor is a trump, the
+    comparison does not really matter (except maybe to sort the
+    player's hand for display purposes): the higher card wins.
+    """
+    keys = trick_keys(first_card_in_trick, trump)
+    return keys[card1] > keys[card2]
 
 
 class Round:
@@ -603,8 +1081,12 @@ class Round:
 
     def __init__(self,
                  game: Game,
-                 how_many_cards: int):
-        """Create new instance with confirmed participating Players."""
+                 how_many_cards: int,
+                 deck: Optional[Sequence[int]] = None):
+        """Create new instance with confirmed participating Players.
+
+        The cards are shuffled unless a deck is given (see deal_cards).
+        """
         confirmed_players = game.confirmed_players
         if (len(confirmed_players) > 1
                 and all(p.is_confirmed for p in confirmed_players)):
@@ -614,48 +1096,89 @@ class Round:
                 "Can't create Round without at least 2 players, all confirmed")
         if (how_many_cards > 0
                 and (how_many_cards * len(confirmed_players)) <= MAX_CARDS):
-            self.deal_cards(how_many_cards)
+            self.deal_cards(how_many_cards, deck)
         else:
             raise ValueError(
                 "how_many_cards must be > 0 but not too large either")
         self._game = game
+        self._version = 0
+        """Incremented by each mutation of the Round."""
         # type hints for mypy, but initialized by _init_new_trick
         self._current_player: int
         self._current_trick: List[Tuple[Player, Card]]
         self._first_card: Optional[Card]
-        self._trick_winner: Optional[int]
-        self._trick_winner_card: Optional[Card]
+        self._trick_leader: int
+        """Index of the Player who played the first card of the trick."""
         self._init_new_trick(0)  # start with first player
         self._current_trick = []
         self._state = Round.State.BIDDING
 
+    @classmethod
+    def restore(
+            cls,
+            game: Game,
+            trump: Optional[Card],
+            dealt: Tuple[int, ...],
+            hands: Tuple[int, ...],
+            bids: Tuple[Optional[int], ...],
+            tricks: Tuple[int, ...],
+            state: "Round.State",
+            current_player: int,
+            table: Tuple[Card, ...],
+            table_leader: int
+    ) -> "Round":
+        """Recreate a Round of the Game's confirmed Players from its parts.
+
+        The arguments are those of app.state.RoundState, no cards are
+        dealt.  The Game is not told about the new Round.
+        """
+        round_ = cls.__new__(cls)
+        round_._players = game.confirmed_players
+        if len(hands) != len(round_._players):
+            raise ValueError(
+                f"{len(hands)} hands for {len(round_._players)} players")
+        round_._game = game
+        round_._version = 0
+        round_._trump = trump
+        round_._dealt_hands = dealt
+        round_._deck = None
+        for (player, hand, bid, won) in zip(
+                round_._players, hands, bids, tricks):
+            player.resume_round(round_, hand, bid, won)
+        round_._state = state
+        round_._current_player = current_player
+        round_._current_trick = [
+            (round_._players[(table_leader + i) % len(hands)], card)
+            for (i, card) in enumerate(table)]
+        round_._first_card = None
+        if state == Round.State.PLAYING and table:
+            round_._first_card = table[0]
+            round_._trick_leader = table_leader
+        elif state == Round.State.BIDDING:
+            # the first Player leads the first trick
+            round_._trick_leader = 0
+        else:
+            round_._trick_leader = current_player
+        return round_
+
     @property
     def state(self) -> State:
         """Return Round's State."""
         return self._state
 
-    def status_summary(self) -> str:
-        """Return an identifier for the current state.
+    @property
+    def version(self) -> int:
+        """Return a number that increases each time the Round changes."""
+        return self._version
 
-        This identifier helps detect state changes and trigger redraws
-        of the UI.
-        """
-        result = f'{chr(self._state - Round.State.BIDDING + ord("0"))}' \
-            f'{self._current_player}'
-        if self._state == Round.State.BIDDING:
-            idx = 0
-            while True:
-                try:
-                    p = self._players[idx]
-                    result += chr(p.bid + ord("A"))  # type: ignore
-                except Exception:
-                    break
-                else:
-                    idx += 1
-        elif self._state == Round.State.PLAYING:
-            result += ''.join(chr(p.card_count + ord("a"))
-                              for p in self._players)
-        return result
+    def _changed(self) -> None:
+        self._version += 1
+        self._game.changed()
+
+    @property
+    def players(self) -> List[Player]:
+        """Return Players of the Round, the first one leads the first trick."""
+        return self._players
 
     @property
     def current_player(self) -> Player:
@@ -667,10 +1190,12 @@ class Round:
         """Return cards currently on the table."""
         return self._current_trick
 
+    @_mutation
     def play_card(self, player: Player, card: Card) -> None:
         """Call from player to notify that she put a card down."""
         self._ensure_state([Round.State.PLAYING, Round.State.BETWEEN_TRICKS])
         self._ensure_current_player(player, "play")
+        self._game.emit('card_played', player=player.id, card=int(card))
         # TODO: it would be nice to test that all players always have
         # a consistent number of cards... but code would be
         # complicated & hard to test
@@ -680,34 +1205,21 @@ class Round:
             self._current_trick = []
             self._state = Round.State.PLAYING
         if self._current_trick == []:
-            # this is the start of a new trick, track who wins the trick
+            # this is the start of a new trick
             self._first_card = card
-            self._trick_winner = self._current_player
-            self._trick_winner_card = card
-        else:
-            assert (self._trick_winner_card is not None
-                    and self._first_card is not None), \
-                ("reassure mypy, these are set in the other branch "
-                 "before getting here")
-            if beats(card,
-                     self._trick_winner_card,
-                     first_card_in_trick=self._first_card,
-                     trump=self._trump):
-                self._trick_winner = self._current_player
-                self._trick_winner_card = card
 
         self._current_trick.append((self.current_player, card))
         # advance to next player
         self._current_player = (self._current_player + 1) % len(self._players)
         # check if trick is complete:
         if len(self._current_trick) >= len(self._players):
-            assert self._trick_winner is not None, \
-                ("reassure mypy, self._trick_winner should always "
-                 "be initialized when we get here")
             # trick is complete: every player put her card down on the
             # table, attribute the trick to the winner
-            self._players[self._trick_winner].add_trick()
-            self._init_new_trick(self._trick_winner)
+            winner = (self._trick_leader + trick_winner(
+                [c for (_, c) in self._current_trick], self._trump)) \
+                % len(self._players)
+            self._players[winner].add_trick()
+            self._init_new_trick(winner)
             # check if Round is complete:
             if any(p.card_count == 0 for p in self._players):
                 # At the end of the Round, all players must have no
@@ -722,33 +1234,39 @@ class Round:
                 # reinitializing, so that Players can see the last
                 # card put down
                 self._state = Round.State.BETWEEN_TRICKS
+        self._changed()
 
-    def card_allowed(self, card: Card, hand: List[Card]) -> bool:
-        """Tell whether a card may be put on the table."""
+    def card_allowed(self, card: Card, hand: int) -> bool:
+        """Tell whether a card of the hand (a set of cards) may be played."""
+        return (self.playable_mask(hand) & card_bit(card)) != 0
+
+    def playable_mask(self, hand: int) -> int:
+        """Return the set of cards of the hand that may be played."""
         if self._state == Round.State.BETWEEN_TRICKS:
-            # between tricks, _current_trick is actually the trick
-            # that ended, so pass explicitly an empty table:
-            return card_allowed(card, hand=hand, table=[])
+            # between tricks, _first_card is actually the first card
+            # of the trick that ended, so the table is really empty:
+            return playable_mask(hand)
         elif self._state == Round.State.PLAYING:
-            return card_allowed(
-                card, hand=hand, table=[c for _, c in self._current_trick])
+            return playable_mask(hand, self._first_card)
         else:
-            return False
+            return 0
 
     def _init_new_trick(self, first_player: int) -> None:
         self._current_player = first_player
         self._first_card = None
-        self._trick_winner = None
-        self._trick_winner_card = None
+        self._trick_leader = first_player
 
+    @_mutation
     def place_bid(self, player: Player, bid: int) -> None:
         """Call from player to notify that she placed a bid."""
         self._ensure_state(Round.State.BIDDING)
         self._ensure_current_player(player, "bid")
+        self._game.emit('bid', player=player.id, bid=bid)
         self._current_player += 1
         if self._current_player >= len(self._players):
             self._current_player = 0
             self._state = Round.State.PLAYING
+        self._changed()
 
     def _ensure_state(self, desired_state: Union[State, List[State]]) -> None:
         if isinstance(desired_state, collections.abc.Iterable):
@@ -765,20 +1283,114 @@ class Round:
                                  current_player=self.current_player,
                                  offending_player=player)
 
-    def deal_cards(self, how_many_cards):
-        """Shuffle cards and tell each player what cards he has."""
-        cards = list(range(MAX_CARDS))
-        random.shuffle(cards)
+    def deal_cards(
+            self,
+            how_many_cards: int,
+            deck: Optional[Sequence[int]] = None
+    ) -> None:
+        """Shuffle cards and tell each player what cards he has.
+
+        deck is the order of the cards to use instead of shuffling.
+        """
+        if deck is None:
+            cards = list(range(MAX_CARDS))
+            random.shuffle(cards)
+        else:
+            cards = list(deck)
+        self._deck: Optional[Tuple[int, ...]] = tuple(cards)
         for (i, p) in enumerate(self._players):
             p.accept_cards(
                 self, cards[(i * how_many_cards):((i + 1) * how_many_cards)])
+        self._dealt_hands = tuple(
+            card_mask(cards[(i * how_many_cards):((i + 1) * how_many_cards)])
+            for i in range(len(self._players)))
         if (how_many_cards + 1) * len(self._players) > MAX_CARDS:
-            self._trump = None
+            self._trump: Optional[Card] = None
         else:
             trump_idx = how_many_cards * len(self._players)
-            self._trump = cards[trump_idx]
+            self._trump = Card(cards[trump_idx])
 
     @property
     def trump(self) -> Optional[Card]:
         """Return trump card."""
         return self._trump
+
+    @property
+    def dealt_hands(self) -> Tuple[int, ...]:
+        """Return the hands dealt to the Players (see card_mask)."""
+        return self._dealt_hands
+
+    @property
+    def deck(self) -> Tuple[int, ...]:
+        """Return the order of the cards after shuffling.
+
+        Passing it to deal_cards deals the same hands and trump again.
+        """
+        if self._deck is None:
+            raise ModelError("Deck of a restored Round is unknown")
+        return self._deck
+
+
+class PlayerView(NamedTuple):
+    """Immutable state of a Player, see Game.view."""
+
+    id: str
+    name: str
+    secret_id: str
+    is_confirmed: bool
+    bid: Optional[int]
+    tricks: int
+    hand: int
+    """Cards in the Player's hand, see card_mask."""
+    playable: int
+    """Cards of the hand that may be played now, see card_mask."""
+
+    @property
+    def card_count(self) -> int:
+        """Return the number of cards in the Player's hand."""
+        return card_count(self.hand)
+
+    @property
+    def cards(self) -> List[Card]:
+        """Return the cards in the Player's hand."""
+        return mask_cards(self.hand)
+
+    @property
+    def playable_cards(self) -> List[Card]:
+        """Return the cards that the Player may play now."""
+        return mask_cards(self.playable)
+
+
+class RoundView(NamedTuple):
+    """Immutable state of a Round, see Game.view."""
+
+    state: Round.State
+    trump: Optional[Card]
+    current_player: PlayerView
+    current_trick: Tuple[Tuple[PlayerView, Card], ...]
+
+
+class GameView(NamedTuple):
+    """Immutable state of a Game after a mutation, see Game.view.
+
+    Players appear once, the same PlayerView is used in all fields.
+    """
+
+    version: int
+    turn: int
+    """See Game.turn."""
+    state: Game.State
+    players: Tuple[PlayerView, ...]
+    """All invited Players."""
+    players_by_id: Mapping[str, PlayerView]
+    """Read-only map of PlayerView.id to PlayerView, see player."""
+    confirmed_players: Tuple[PlayerView, ...]
+    """Empty while the Game is in CONFIRMING state."""
+    current_card_count: int
+    """0 unless a Round is being played or paused."""
+    round: Optional[RoundView]
+    """None while the Game is in CONFIRMING state."""
+
+    def player(self, player_id: str) -> PlayerView:
+        """Look up a Player by her public ID, raise KeyError if unknown."""
+        return self.players_by_id[player_id]
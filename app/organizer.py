@@ -2,18 +2,43 @@
 
 import functools
 import os
-from typing import List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
-from flask import (Blueprint, abort, current_app, flash, jsonify,
+from flask import (Blueprint, abort, current_app, flash, g, jsonify,
                    redirect, render_template, request, url_for)
 from flask_babel import _  # type: ignore
 
-from . import models
-from .player import organizer_url_for_player
+from . import bots, models
+from .player import not_modified, organizer_url_for_player, version_etag
 
 bp = Blueprint('organizer', __name__, url_prefix='/organizer')
 
 
+def organizer_game(organizer_secret: str) -> Optional[models.Game]:
+    """Return the Game created by the organizer.
+
+    The secret printed to the console only allows to set up new Games,
+    so None is returned for it.  Unknown secrets are rejected with 403.
+    """
+    try:
+        game = current_app.games.game_by_organizer_secret(organizer_secret)
+    except KeyError:
+        if organizer_secret != current_app.organizer_secret:
+            abort(403)
+        return None
+    g.game_id = game.id
+    return game
+
+
+def bot_ids(game: models.Game) -> Set[str]:
+    """Return the ids of the Game's BotPlayers, whose links are not shown.
+
+    Nobody plays through a bot's secret link: showing it would only
+    let someone take over the bot's seat.
+    """
+    return {p.id for p in game.players if isinstance(p, bots.BotPlayer)}
+
+
 @bp.route('/setup/game/', methods=('POST',))
 @bp.route('/<organizer_secret>/setup/game/')
 def setup_game(organizer_secret=''):
@@ -23,30 +48,42 @@ def setup_game(organizer_secret=''):
             flash(error, 'error')
         return render_template('organizer/setup_game.html',
                                playerlist=playerlist,
-                               organizer_secret=current_app.organizer_secret)
+                               organizer_secret=organizer_secret,
+                               bot_policies=sorted(bots.POLICIES))
     if request.method == 'POST':
         organizer_secret = request.form.get('organizer_secret', '')
-        if organizer_secret != current_app.organizer_secret:
-            abort(403)
+        old_game = organizer_game(organizer_secret)
         playerlist = request.form.get('playerlist', '').strip()
         if playerlist == '':
             return render(playerlist, error='No player list provided')
         elif len(playerlist) > 32768:
             return render(playerlist, error='Player list too large')
+        try:
+            bot_count = int(request.form.get('bots', '').strip() or '0')
+        except ValueError:
+            bot_count = -1
+        bot_policy = request.form.get('bot_policy', 'greedy')
+        if bot_count < 0 or bot_policy not in bots.POLICIES:
+            return render(playerlist, error='Invalid bots')
         # First validations OK, now parse the list
         player_names = parse_playerlist(playerlist)
-        if len(player_names) < 3:
+        if len(player_names) + bot_count < 3:
             return render(playerlist, error=_('Not enough players in list'))
-        elif len(player_names) > 26:
+        elif len(player_names) + bot_count > 26:
             return render(playerlist, error='Too many players in list')
-        current_app.create_game(
+        # An organizer replaces her own Game, but the console secret
+        # always sets up a new Game with a new organizer secret.
+        game = current_app.create_game(
             [models.Player(p, "".join(f"{x:02X}" for x in os.urandom(16)))
-             for p in player_names])
-        return redirect(url_for('organizer.wait_for_users',
-                                organizer_secret=organizer_secret))
+             for p in player_names]
+            + [bots.BotPlayer(f'Bot {i + 1}', bot_policy)
+               for i in range(bot_count)],
+            organizer_secret=(None if old_game is None else organizer_secret))
+        return redirect(url_for(
+            'organizer.wait_for_users',
+            organizer_secret=current_app.games.organizer_secret(game.id)))
     else:
-        if organizer_secret != current_app.organizer_secret:
-            abort(403)
+        organizer_game(organizer_secret)
         return render('')
 
 
@@ -72,28 +109,28 @@ def parse_playerlist(playerlist: str) -> List[str]:
 @bp.route('/<organizer_secret>/wait_for_users/')
 def wait_for_users(organizer_secret: str):
     """Present a dashboard for the organizer to track Players joining."""
-    if organizer_secret != current_app.organizer_secret:
-        abort(403)
-    else:
-        try:
-            game = current_app.game
-        except RuntimeError as e:
-            flash(str(e), 'error')
-            return redirect(url_for('organizer.setup_game',
-                                    organizer_secret=organizer_secret))
-        return render_template('organizer/wait_for_users.html',
-                               organizer_secret=organizer_secret,
-                               players=current_app.game.players)
+    game = organizer_game(organizer_secret)
+    if game is None:
+        flash('Game not initialized.', 'error')
+        return redirect(url_for('organizer.setup_game',
+                                organizer_secret=organizer_secret))
+    return render_template('organizer/wait_for_users.html',
+                           organizer_secret=organizer_secret,
+                           players=game.players,
+                           bot_ids=bot_ids(game))
 
 
 @bp.route('/start_game/', methods=('POST',))
 def start_game():
     """Start the first round of the game at organizer's request."""
     organizer_secret = request.form.get('organizer_secret', '')
-    if organizer_secret != current_app.organizer_secret:
-        abort(403)
+    game = organizer_game(organizer_secret)
+    if game is None:
+        flash('Game has not been created yet.', 'error')
+        return redirect(url_for('organizer.setup_game',
+                                organizer_secret=organizer_secret))
     try:
-        current_app.game.start_game()
+        game.start_game()
     except models.ModelError as e:
         flash(f'Game not started: {e}', 'error')
         return redirect(url_for('organizer.wait_for_users',
@@ -105,11 +142,8 @@ def start_game():
 @bp.route('/<organizer_secret>/dashboard/')
 def dashboard(organizer_secret: str):
     """View game play status."""
-    if organizer_secret != current_app.organizer_secret:
-        abort(403)
-    try:
-        game = current_app.game
-    except RuntimeError:
+    game = organizer_game(organizer_secret)
+    if game is None:
         flash('Game has not been created yet.', 'error')
         return redirect(url_for('organizer.setup_game',
                                 organizer_secret=organizer_secret))
@@ -119,64 +153,96 @@ def dashboard(organizer_secret: str):
                                 organizer_secret=organizer_secret))
     return render_template('organizer/dashboard.html',
                            organizer_secret=organizer_secret,
-                           game=current_app.game)
+                           game=game,
+                           bot_ids=bot_ids(game))
 
 
 @bp.route('/<organizer_secret>/api/game_status/')
 def api_game_status(organizer_secret):
-    """Return Game status for AJAX API."""
-    if current_app.organizer_secret != organizer_secret:
-        abort(403)
-    try:
-        game = current_app.game
-    except RuntimeError:
+    """Return Game status for AJAX API.
+
+    Honour If-None-Match with an empty 304 response while the Game's
+    version does not change.
+    """
+    game = organizer_game(organizer_secret)
+    if game is None:
         abort(404)
+    view = game.view
+    etag = version_etag(game, view.version)
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+    hidden = bot_ids(game)
+
+    def player_status(p: models.PlayerView) -> Dict[str, Any]:
+        status: Dict[str, Any] = (
+            {'name': p.name}
+            if view.state == models.Game.State.CONFIRMING
+            else {'bid': p.bid, 'cards': p.card_count, 'name': p.name})
+        if p.id not in hidden:
+            status['url'] = organizer_url_for_player(p)
+        return status
+
     result = {
-        'players': {p.id: ({'name': p.name, 'url': organizer_url_for_player(p)}
-                           if game.state == game.state.CONFIRMING
-                           else {'bid': p.bid,
-                                 'cards': p.card_count,
-                                 'name': p.name,
-                                 'url': organizer_url_for_player(p)})
+        'players': {p.id: player_status(p)
                     for p
-                    in (game.confirmed_players
-                        if game.state != game.state.CONFIRMING
+                    in (view.confirmed_players
+                        if view.state != models.Game.State.CONFIRMING
                         # in CONFIRMING game.state, players are still
                         # adding themselves, game.confirmed_players
                         # is not valid yet.
-                        else (_p for _p in game.players if _p.is_confirmed))},
-        'game_state': game.state
+                        else (_p for _p in view.players if _p.is_confirmed))},
+        'game_state': view.state
     }
-    if game.state == game.state.PLAYING:
-        result['currentCardCount'] = game.current_card_count
-        result['round'] = {'currentPlayer': game.round.current_player.id,
-                           'state': game.round.state}
-    return jsonify(result)
+    if view.state == models.Game.State.PLAYING:
+        result['currentCardCount'] = view.current_card_count
+        result['round'] = {'currentPlayer': view.round.current_player.id,
+                           'state': view.round.state}
+    response = jsonify(result)
+    response.set_etag(etag)
+    return response
+
+
+@bp.route('/<organizer_secret>/api/history/')
+def api_history(organizer_secret):
+    """Return bids and tricks of the Game's finished Rounds for AJAX API."""
+    game = organizer_game(organizer_secret)
+    if game is None:
+        abort(404)
+    storage = current_app.storage
+    return jsonify({
+        'players': {p.id: {'name': p.name, 'bot': p.bot}
+                    for p in storage.players(game.id)},
+        'rounds': [{'cards': r.cards,
+                    'trump': r.trump,
+                    'results': [{'player': p.player,
+                                 'bid': p.bid,
+                                 'tricks': p.tricks}
+                                for p in r.results]}
+                   for r in storage.round_results(game.id)],
+    })
 
 
 @bp.route('/restart/with/same/players/', methods=('POST',))
 def restart_with_same_players():
     """Reset Game to reuse existing Players."""
     organizer_secret = request.form.get('organizer_secret', '')
-    if organizer_secret != current_app.organizer_secret:
-        abort(403)
-    else:
-        try:
-            game = current_app.game
-        except RuntimeError as e:
-            flash(str(e), 'error')
-            return redirect(url_for('organizer.setup_game',
-                                    organizer_secret=organizer_secret,
-                                    _method='GET'))
-        try:
-            game.restart_with_same_players()
-        except RuntimeError as e:
-            flash(str(e), 'error')
-            if game.state in [game.state.PLAYING,
-                              game.state.PAUSED_BETWEEN_ROUNDS]:
-                return render_template('organizer/dashboard.html',
-                                       organizer_secret=organizer_secret,
-                                       game=current_app.game)
-        return render_template('organizer/wait_for_users.html',
-                               organizer_secret=organizer_secret,
-                               players=current_app.game.players)
+    game = organizer_game(organizer_secret)
+    if game is None:
+        flash('Game not initialized.', 'error')
+        return redirect(url_for('organizer.setup_game',
+                                organizer_secret=organizer_secret,
+                                _method='GET'))
+    try:
+        game.restart_with_same_players()
+    except RuntimeError as e:
+        flash(str(e), 'error')
+        if game.state in [game.state.PLAYING,
+                          game.state.PAUSED_BETWEEN_ROUNDS]:
+            return render_template('organizer/dashboard.html',
+                                   organizer_secret=organizer_secret,
+                                   game=game,
+                                   bot_ids=bot_ids(game))
+    return render_template('organizer/wait_for_users.html',
+                           organizer_secret=organizer_secret,
+                           players=game.players,
+                           bot_ids=bot_ids(game))
@@ -2,17 +2,31 @@
 
 import functools
 import os
-from typing import List, Optional, Set
+from typing import Any, Dict, List, NamedTuple, Optional, Set
 
-from flask import (Blueprint, abort, current_app, flash, jsonify,
-                   redirect, render_template, request, session, url_for)
+from flask import (Blueprint, Response, abort, current_app, flash, g, json,
+                   jsonify, redirect, render_template, request, session,
+                   stream_with_context, url_for)
 import jinja2
-from flask_babel import _  # type: ignore
+from flask_babel import _, format_decimal, get_locale  # type: ignore
 from flask_babel import lazy_gettext as _l  # type: ignore
 
 from . import USER_COOKIE, models
 
-bp = Blueprint('player', __name__, url_prefix='/player')
+bp = Blueprint('player', __name__, url_prefix='/player/<game_id>')
+
+
+@bp.url_value_preprocessor
+def pull_game_id(endpoint, values):
+    """Remember which Game the request is about."""
+    g.game_id = values.pop('game_id', None) if values else None
+
+
+@bp.url_defaults
+def add_game_id(endpoint, values):
+    """Fill in the Game in URLs built while handling a request for it."""
+    if 'game_id' not in values and g.get('game_id') is not None:
+        values['game_id'] = g.game_id
 
 
 def organizer_url_for_player(player, _method='GET'):
@@ -41,16 +55,16 @@ def with_valid_game(f):
     @functools.wraps(f)
     def work(*args, **kwargs):
         try:
-            game = current_app.game
-        except RuntimeError:
+            game = current_app.games.game(g.game_id)
+        except KeyError:
             abort(403)
         else:
             return f(*args, **kwargs, game=game)
     return work
 
 
-def get_player(current_app, request, secret_id):
-    """Return Player matching the secret ID.
+def get_player(game, request, secret_id):
+    """Return Player of the Game matching the secret ID.
 
     NB: if request.method == 'POST', secret_id is disregarded and
     taken from request.form.
@@ -58,7 +72,7 @@ def get_player(current_app, request, secret_id):
     if request.method == 'POST':
         secret_id = request.form.get('secret_id', '')
     try:
-        return current_app.game.player_by_secret_id(secret_id)
+        return game.player_by_secret_id(secret_id)
     except StopIteration:
         abort(403)
 
@@ -68,7 +82,7 @@ def get_player(current_app, request, secret_id):
 @with_valid_game
 def confirm(secret_id='', game=None):
     """Render player confirmation page and handle confirmation process."""
-    player = get_player(current_app, request, secret_id)
+    player = get_player(game, request, secret_id)
     if player.is_confirmed:
         flash(_('Your name is already confirmed as %(n)s', n=player.name),
               'error')
@@ -95,7 +109,7 @@ def confirm(secret_id='', game=None):
 @with_valid_game
 def player(secret_id='', game=None):
     """Control Player model for the players."""
-    player = get_player(current_app, request, secret_id)
+    player = get_player(game, request, secret_id)
     if not player.is_confirmed:
         flash(_('You must confirm your participation first'), 'error')
         return redirect(url_for('player.confirm',
@@ -106,74 +120,132 @@ def player(secret_id='', game=None):
 
 @bp.route('/place/bid/', methods=('POST',))
 @with_valid_game
-def place_bid(secret_id='', previous_status_summary='', game=None):
+def place_bid(secret_id='', game=None):
     """Control Player model for the players: place a bid."""
-    player = get_player(current_app, request, secret_id)
-    if (not player.is_confirmed or
-        (game is None) or
-        (game.state != models.Game.State.PLAYING) or
-        (game.round is None) or
-            (game.round.state != models.Round.State.BIDDING)):
+    player = get_player(game, request, secret_id)
+    turn = request.form.get('turn', None, type=int)
+    if not is_stale(game, turn) and not bidding_allowed(game, player):
         abort(404)
     # just let it crash if form data is invalid (missing or not a number)
     bid = int(request.form.get('bidInput'))
-    try:
-        player.place_bid(bid)
-    except Exception as e:
-        return jsonify({'ok': False, 'error': str(e)})
-    else:
-        return jsonify({'ok': True})
+    return action_response(game, turn, player.place_bid, bid)
 
 
 @bp.route('/play/card/', methods=('POST',))
 @with_valid_game
-def play_card(secret_id='', previous_status_summary='', game=None):
+def play_card(secret_id='', game=None):
     """Control Player model for the players: place a bid."""
-    player = get_player(current_app, request, secret_id)
-    # TODO: this logic belongs in the model?
-    if (not player.is_confirmed or
-        (game is None) or
-        (game.state != models.Game.State.PLAYING) or
-        (game.round is None) or
-            (game.round.state not in [
-                models.Round.State.PLAYING,
-                models.Round.State.BETWEEN_TRICKS])):
+    player = get_player(game, request, secret_id)
+    turn = request.form.get('turn', None, type=int)
+    if not is_stale(game, turn) \
+            and not card_playing_allowed(game, player):
         abort(404)
     # just let it crash if form data is invalid (missing, not a number
     # or out of card range): normal UI usage should only send a
     # corrrect card number
     card = models.Card(int(request.form.get('card')))
-    try:
-        player.play_card(card)
-    except Exception as e:
-        return jsonify({'ok': False, 'error': str(e)})
-    else:
-        return jsonify({'ok': True})
+    return action_response(game, turn, player.play_card, card)
 
 
 @bp.route('/finish/round/', methods=('POST',))
 @with_valid_game
-def finish_round(secret_id='', previous_status_summary='', game=None):
+def finish_round(secret_id='', game=None):
     """Control Player model for the players: place a bid."""
-    player = get_player(current_app, request, secret_id)
-    # # TODO: this logic belongs in the model?
-    # if (not player.is_confirmed or
-    #     (game is None) or
-    #     (game.state != models.Game.State.PLAYING) or
-    #     (game.round is None) or
-    #         (game.round.state not in [
-    #             models.Round.State.PLAYING,
-    #             models.Round.State.BETWEEN_TRICKS])):
-    #     abort(404)
+    player = get_player(game, request, secret_id)
+    turn = request.form.get('turn', None, type=int)
+    return action_response(game, turn, start_next_round, game, player)
+
+
+def bidding_allowed(game: models.Game, player: models.Player) -> bool:
+    """Tell if Player may try to place a bid in the Game's current state."""
+    # TODO: this logic belongs in the model?
+    return (player.is_confirmed and
+            (game is not None) and
+            is_round_in(game.view, [models.Round.State.BIDDING]))
+
+
+def card_playing_allowed(game: models.Game, player: models.Player) -> bool:
+    """Tell if Player may try to play a card in the Game's current state."""
+    # TODO: this logic belongs in the model?
+    return (player.is_confirmed and
+            (game is not None) and
+            is_round_in(game.view, [models.Round.State.PLAYING,
+                                    models.Round.State.BETWEEN_TRICKS]))
+
+
+def is_round_in(
+        view: models.GameView,
+        states: List[models.Round.State]
+) -> bool:
+    """Tell if the Game is playing a Round in one of the given states."""
+    return (view.state == models.Game.State.PLAYING and
+            view.round is not None and
+            view.round.state in states)
+
+
+def start_next_round(game: models.Game, player: models.Player) -> None:
+    """Let a (confirmed) Player start the Game's next Round."""
+    if player.is_confirmed:
+        game.start_next_round()
+    else:
+        raise Exception(f'{player.name} should be confirmed to do this')
+
+
+def action_result(action, *args) -> Dict[str, Any]:
+    """Call action(*args) and describe the outcome for the client."""
     try:
-        if player.is_confirmed:
-            game.start_next_round()
-        else:
-            raise Exception(f'{player.name} should be confirmed to do this')
+        action(*args)
     except Exception as e:
-        return jsonify({'ok': False, 'error': str(e)})
+        return {'ok': False, 'error': str(e)}
     else:
-        return jsonify({'ok': True})
+        return {'ok': True}
+
+
+def is_stale(game: models.Game, turn: Optional[int]) -> bool:
+    """Tell if a move was made since the Player saw the Game in that turn.
+
+    Without turn, the Player did not say what she saw: never stale.
+    Other changes (e.g. a Player confirming) do not make it stale.
+    """
+    return turn is not None and turn != game.view.turn
+
+
+def stale_result(game: models.Game) -> Dict[str, Any]:
+    """Describe an action rejected because of a move made meanwhile."""
+    return {'ok': False, 'stale': True, 'turn': game.view.turn}
+
+
+def versioned_action_result(
+        game: models.Game,
+        turn: Optional[int],
+        action,
+        *args
+) -> Dict[str, Any]:
+    """Like action_result, but only if the Game is still in that turn.
+
+    Stale actions (e.g. a second click on `Finish Round') are rejected
+    without taking the Game's lock, see stale_result.  The last check
+    and the action are one mutation of the Game.
+    """
+    if turn is None:
+        return action_result(action, *args)
+    if is_stale(game, turn):
+        return stale_result(game)
+    with game.mutation():
+        if game.turn != turn:
+            return stale_result(game)
+        return action_result(action, *args)
+
+
+def action_response(
+        game: models.Game,
+        turn: Optional[int],
+        action,
+        *args
+):
+    """Return versioned_action_result as JSON, with 409 if it is stale."""
+    result = versioned_action_result(game, turn, action, *args)
+    return jsonify(result), (409 if result.get('stale') else 200)
 
 
 def other_player_status(p: models.Player):
@@ -310,14 +382,19 @@ def player_css_class(p1, p2, cp=None):
     If cp is defined, it indicates which p1 should get the
     'current_player' class extra.
     """
-    return ("self_player" if p1 is p2 else "other_player") + (
-        " current_player" if p1 is cp else "")
+    return ("self_player" if same_player(p1, p2) else "other_player") + (
+        " current_player" if same_player(p1, cp) else "")
+
+
+def same_player(p1, p2) -> bool:
+    """Tell if 2 Players (or PlayerViews) are the same Player."""
+    return p1 is not None and p2 is not None and p1.id == p2.id
 
 
 def player_html(
-        subject: models.Player,
-        viewer: models.Player,
-        current_player: models.Player,
+        subject: models.PlayerView,
+        viewer: Optional[models.PlayerView],
+        current_player: models.PlayerView,
         round_state: models.Round.State
 ) -> str:
     """Return HTML content describing the Player's status."""
@@ -337,72 +414,412 @@ def player_html(
 
 
 @bp.route('/<secret_id>/api/status/')
-@bp.route('/<secret_id>/api/status/<previous_status_summary>/')
 @with_valid_game
-def api_status(secret_id='', previous_status_summary='', game=None):
-    """Return JSON formatted status for Player."""
-    player = get_player(current_app, request, secret_id)
+def api_status(secret_id='', game=None):
+    """Return JSON formatted status for Player.
+
+    The response's ETag identifies the Game version.  If the request's
+    If-None-Match header still matches, the `wait' query parameter
+    holds the request (long-poll) until the Game changes or that many
+    seconds elapse, before answering with an empty 304 response.
+    Each long-poll holds a server thread: once LONG_POLL_WAITERS of
+    them wait, the next ones get an immediate 304 with a Retry-After
+    header instead.
+
+    With a `since' query parameter (the version the client displays),
+    the response only describes what changed, see delta_payload.
+    """
+    player = get_player(game, request, secret_id)
     if not player.is_confirmed:
         abort(404)
 
-    status_summary = game.status_summary()
-    if (status_summary == previous_status_summary) and (
-            previous_status_summary != ''):
-        return jsonify({'summary': status_summary})
-    elif game.state == game.State.CONFIRMING:
-        return jsonify({
-            'summary': status_summary,
-            'game_state': game_state(game, player),
-            'id': player.id,
+    locale = str(get_locale())
+    view = game.view
+    if request.if_none_match.contains(
+            version_etag(game, view.version, locale)):
+        wait = min(request.args.get('wait', 0, type=float),
+                   current_app.config['LONG_POLL_TIMEOUT'])
+        if wait > 0:
+            if not current_app.long_polls.acquire(blocking=False):
+                response = not_modified(
+                    version_etag(game, view.version, locale))
+                response.headers['Retry-After'] = str(
+                    current_app.config['LONG_POLL_RETRY'])
+                return response
+            try:
+                game.wait_for_change(view.version, wait)
+            finally:
+                current_app.long_polls.release()
+            view = game.view
+        etag = version_etag(game, view.version, locale)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+    since = request.args.get('since', None, type=int)
+    response = current_app.response_class(
+        status_body(game, player, view, since),
+        mimetype='application/json')
+    response.set_etag(version_etag(game, view.version, locale))
+    response.vary.add('Accept-Language')
+    return response
+
+
+@bp.route('/<secret_id>/api/bid_hint/')
+@with_valid_game
+def api_bid_hint(secret_id='', game=None):
+    """Return JSON formatted bid hint for Player, see bid_hint.
+
+    The hint is not part of the status: the BidAdvisor refines it
+    without changing the Game, so the client asks for it again as
+    long as it is `refining'.
+    """
+    player = get_player(game, request, secret_id)
+    if not player.is_confirmed or not current_app.config['BID_HINTS']:
+        abort(404)
+    view = game.view
+    round_ = view.round
+    viewer = view.player(player.id)
+    if (round_ is None
+            or round_.state != models.Round.State.BIDDING
+            or viewer.bid is not None):
+        result = {'bid_hint': '', 'refining': False}
+    else:
+        result = bid_hint(view, round_, viewer)
+    response = jsonify(result)
+    response.cache_control.no_store = True
+    return response
+
+
+def version_etag(
+        game: models.Game,
+        version: int,
+        locale: Optional[str] = None
+) -> str:
+    """Return the strong ETag of a Game status in that version."""
+    return f'{game.id}-{version}' + ('' if locale is None else f'-{locale}')
+
+
+def not_modified(etag: str):
+    """Return an empty 304 response for the given ETag."""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
+
+
+@bp.route('/<secret_id>/api/events/')
+@with_valid_game
+def api_events(secret_id='', game=None):
+    """Stream JSON formatted status for Player as server-sent events.
+
+    Each event carries the same data as api_status and the Game
+    version as its id.  After the first event, only changes are sent.
+    A reconnecting client sends the last id it saw in the
+    Last-Event-ID header, and only gets what changed since then.
+
+    Only available if SERVER_SENT_EVENTS is set: a stream holds a
+    server thread for as long as it is open.
+    """
+    if not current_app.config['SERVER_SENT_EVENTS']:
+        abort(404)
+    player = get_player(game, request, secret_id)
+    if not player.is_confirmed:
+        abort(404)
+
+    last_version = request.headers.get('Last-Event-ID', type=int)
+    timeout = current_app.config['LONG_POLL_TIMEOUT']
+
+    @stream_with_context
+    def events():
+        version = last_version
+        while player.is_confirmed and game_is_hosted(game):
+            if version is not None:
+                game.wait_for_change(version, timeout)
+            view = game.view
+            if view.version == version:
+                # comment line to keep proxies from closing the stream
+                yield ': keep-alive\n\n'
+                continue
+            data = status_body(game, player, view, version)
+            version = view.version
+            yield f'id: {version}\ndata: {data}\n\n'
+
+    return Response(events(),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache',
+                             'X-Accel-Buffering': 'no'})
+
+
+@bp.route('/<secret_id>/ws/')
+def websocket(secret_id=''):
+    """Reserve the URL of the Player's WebSocket, served by app.asgi."""
+    abort(400)
+
+
+def game_is_hosted(game: models.Game) -> bool:
+    """Tell if the Game is still in the application's registry."""
+    try:
+        return current_app.games.game(game.id) is game
+    except KeyError:
+        return False
+
+
+def status_body(
+        game: models.Game,
+        player: models.Player,
+        view: models.GameView,
+        since: Optional[int] = None
+) -> str:
+    """Return status_data serialized as JSON.
+
+    The result is memoized until the Game changes, so that repeated
+    requests between two moves do not render anything.  `since' is
+    part of the memo's key only if a delta from that version can be
+    computed: other values all get the full status.
+    """
+    locale = str(get_locale())
+    if since is not None and (
+            since == view.version
+            or current_app.status_history.get(
+                game, (player.id, locale), since) is None):
+        since = None
+    return current_app.status_cache.get(
+        game, view.version, ('body', player.id, locale, since),
+        lambda: json.dumps(status_data(game, player, view, since)))
+
+
+def status_data(
+        game: models.Game,
+        player: models.Player,
+        view: models.GameView,
+        since: Optional[int] = None
+) -> Dict[str, Any]:
+    """Return status of the Game (as seen in view) for Player.
+
+    The status is a delta relative to the status sent for version
+    `since' if possible.  If that version is too old, a full
+    status_payload is returned.
+    """
+    snapshot = status_snapshot(game, player, view)
+    if since is not None and since != view.version:
+        previous = current_app.status_history.get(
+            game, (player.id, str(get_locale())), since)
+        if previous is not None:
+            delta = delta_payload(previous, snapshot, since)
+            if delta is not None:
+                return delta
+    return snapshot.payload
+
+
+class StatusSnapshot(NamedTuple):
+    """A status_payload and what is needed to compute deltas from it."""
+
+    payload: Dict[str, Any]
+    card_ids: List[str]
+    """HTML ids of the cards in the Player's hand."""
+    table_cards: List[str]
+    """HTML fragments of the cards on the table, in playing order."""
+
+
+def status_snapshot(
+        game: models.Game,
+        player: models.Player,
+        view: models.GameView
+) -> StatusSnapshot:
+    """Build status_payload and record it for later deltas."""
+    locale = str(get_locale())
+
+    def compute():
+        shared = shared_status(game, view)
+        snapshot = StatusSnapshot(
+            payload=status_payload(game, view, player),
+            card_ids=[card_html_id(card)
+                      for card in view.player(player.id).cards],
+            table_cards=shared.get('table_cards', []))
+        current_app.status_history.record(
+            game, (player.id, locale), view.version, snapshot)
+        return snapshot
+
+    return current_app.status_cache.get(
+        game, view.version, ('snapshot', player.id, locale), compute)
+
+
+def delta_payload(
+        old: StatusSnapshot,
+        new: StatusSnapshot,
+        since: int
+) -> Optional[Dict[str, Any]]:
+    """Describe what changed between 2 snapshots.
+
+    Small items (game_state, trump, round, playable_cards) are always
+    repeated.  Only changed `players' are sent, `cards_removed' lists
+    the HTML ids of the cards that left the hand and `table_added'
+    the cards put on the table (or `table' if a new trick started).
+
+    Return None if a full status_payload is better, e.g. after new
+    cards were dealt or when the list of Players changed.
+    """
+    if 'round' not in old.payload or 'round' not in new.payload:
+        return None
+    old_players = {p['id']: p['h'] for p in old.payload['players']}
+    if list(old_players) != [p['id'] for p in new.payload['players']]:
+        return None
+    if not set(new.card_ids).issubset(old.card_ids):
+        return None
+    result = {key: value
+              for (key, value) in new.payload.items()
+              if key not in ('cards', 'players', 'table')}
+    result['since'] = since
+    result['players'] = [p for p in new.payload['players']
+                         if old_players[p['id']] != p['h']]
+    result['cards_removed'] = [card_id
+                               for card_id in old.card_ids
+                               if card_id not in new.card_ids]
+    if 'table' in new.payload:
+        prefix = len(old.table_cards)
+        if ('table' in old.payload and
+                new.table_cards[:prefix] == old.table_cards):
+            result['table_added'] = new.table_cards[prefix:]
+        else:
+            result['table'] = new.payload['table']
+    return result
+
+
+def shared_status(game: models.Game, view: models.GameView) -> Dict[str, Any]:
+    """Return the parts of status_payload that are the same for all Players.
+
+    They are computed once per Game version (and language) instead
+    of once per Player.  `players' maps Player ids to their HTML
+    fragment as seen by the other Players.
+    """
+    def compute():
+        if view.state == models.Game.State.CONFIRMING:
+            return {
+                'game_state': game_state(view, None),
+                'players': {
+                    p.id: CONFIRMING_PLAYER_LI_FRAGMENT.render(
+                        player=p,
+                        player_class=player_css_class(p, None, None))
+                    for p in view.players if p.is_confirmed}}
+        round_ = view.round
+        assert round_ is not None, "only CONFIRMING Games have no Round"
+        total_bids = sum((p.bid or 0) for p in view.confirmed_players)
+        result = {
+            'game_state': game_state(view, None, total_bids=total_bids),
+            'trump': (_('No trump')
+                      if round_.trump is None
+                      else (_('Trump: ')
+                            + render_player_card_fragment(round_.trump))),
+            'players': {
+                p.id: player_html(
+                    subject=p,
+                    viewer=None,
+                    current_player=round_.current_player,
+                    round_state=round_.state)
+                for p in view.confirmed_players}}
+        if round_.state in [models.Round.State.PLAYING,
+                            models.Round.State.BETWEEN_TRICKS,
+                            models.Round.State.DONE]:
+            result['table_cards'] = table_cards(round_)
+            result['table'] = ''.join(result['table_cards'])
+        return result
+
+    return current_app.status_cache.get(
+        game, view.version, ('shared', str(get_locale())), compute)
+
+
+def status_payload(
+        game: models.Game,
+        view: models.GameView,
+        player: models.Player
+) -> Dict[str, Any]:
+    """Build status of the Game (as seen in view) for the confirmed Player."""
+    shared = shared_status(game, view)
+    viewer = view.player(player.id)
+    if view.state == models.Game.State.CONFIRMING:
+        return {
+            'version': view.version,
+            'turn': view.turn,
+            'game_state': shared['game_state'],
+            'id': viewer.id,
             'players': [
                 {'id': p.id,
-                 'h': CONFIRMING_PLAYER_LI_FRAGMENT.render(
+                 'h': (CONFIRMING_PLAYER_LI_FRAGMENT.render(
                      player=p,
-                     player_class=player_css_class(p, player, None))}
-                for p in game.players if p.is_confirmed]})
-    elif game.state in [models.Game.State.PLAYING,
+                     player_class=player_css_class(p, viewer, None))
+                       if p is viewer
+                       else shared['players'][p.id])}
+                for p in view.players if p.is_confirmed]}
+    elif view.state in [models.Game.State.PLAYING,
                         models.Game.State.PAUSED_BETWEEN_ROUNDS,
                         models.Game.State.DONE]:
-        total_bids = sum((p.bid or 0) for p in game.confirmed_players)
-        cards = [render_player_card_fragment(card) for card in player.cards]
+        round_ = view.round
+        assert round_ is not None, "only CONFIRMING Games have no Round"
+        cards = [render_player_card_fragment(card) for card in viewer.cards]
         cards.sort(reverse=True)
         result = {
-            'summary': status_summary,
-            'game_state': game_state(game, player, total_bids=total_bids),
-            'id': player.id,
+            'version': view.version,
+            'turn': view.turn,
+            'game_state': (shared['game_state']
+                           + viewer_game_state(view, viewer)),
+            'id': viewer.id,
             'cards': ''.join(cards),
-            'trump': (_('No trump')
-                      if game.round.trump is None
-                      else (_('Trump: ')
-                            + render_player_card_fragment(game.round.trump))),
-            'round': {'state': game.round.state,
-                      'current_player': game.round.current_player.id},
+            'trump': shared['trump'],
+            'round': {'state': round_.state,
+                      'current_player': round_.current_player.id},
             'players': [
                 {'id': p.id,
-                 'h': player_html(
+                 'h': (player_html(
                      subject=p,
-                     viewer=player,
-                     current_player=game.round.current_player,
-                     round_state=game.round.state)}
-                for p in game.confirmed_players]}
-        if game.round.state in [models.Round.State.PLAYING,
-                                models.Round.State.BETWEEN_TRICKS]:
-            result['table'] = render_table(game)
+                     viewer=viewer,
+                     current_player=round_.current_player,
+                     round_state=round_.state)
+                       if p is viewer
+                       else shared['players'][p.id])}
+                for p in view.confirmed_players]}
+        if round_.state in [models.Round.State.PLAYING,
+                            models.Round.State.BETWEEN_TRICKS]:
+            result['table'] = shared['table']
             result['playable_cards'] = [
-                card_html_id(card) for card in player.playable_cards
-            ] if player is game.round.current_player \
+                card_html_id(card) for card in viewer.playable_cards
+            ] if viewer is round_.current_player \
                 else []
-        elif game.round.state == models.Round.State.DONE:
-            result['table'] = render_table(game)
+        elif round_.state == models.Round.State.DONE:
+            result['table'] = shared['table']
             result['playable_cards'] = []
-        return jsonify(result)
+        elif (round_.state == models.Round.State.BIDDING
+              and viewer.bid is None
+              and current_app.config['BID_HINTS']):
+            result['bid_hint_url'] = url_for(
+                'player.api_bid_hint', secret_id=player.secret_id)
+        return result
     abort(500, "Should not be reached")
 
 
-def render_table(game):
-    """Render current cards on table as HTML fragment."""
-    return ''.join(render_player_card_fragment(c, player=p)
-                   for p, c in game.round.current_trick)
+def bid_hint(
+        view: models.GameView,
+        round_: models.RoundView,
+        player: models.PlayerView
+) -> Dict[str, Any]:
+    """Describe how many tricks the Player may expect.
+
+    `bid_hint' is '' if unknown yet and `refining' tells if the
+    BidAdvisor's pool still works on a better estimate.
+    """
+    query = (player.hand,
+             round_.trump,
+             view.confirmed_players.index(player),
+             len(view.confirmed_players))
+    tricks = current_app.bid_advisor.expected_tricks(*query)
+    return {
+        'bid_hint': ('' if tricks is None
+                     else _('Expected tricks: %(tricks)s',
+                            tricks=format_decimal(tricks, format='0.0'))),
+        'refining': current_app.bid_advisor.is_refining(*query)}
+
+
+def table_cards(round_: models.RoundView) -> List[str]:
+    """Render current cards on table as HTML fragments."""
+    return [render_player_card_fragment(c, player=p)
+            for p, c in round_.current_trick]
 
 
 def pluralize(n, s):
@@ -413,46 +830,62 @@ def pluralize(n, s):
         return f'{n} {s}s'
 
 
+def viewer_game_state(
+        view: models.GameView,
+        player: Optional[models.PlayerView]
+) -> str:
+    """Return the part of game_state that is specific to the Player."""
+    if (player is None) or (
+            view.state != models.Game.State.PAUSED_BETWEEN_ROUNDS):
+        return ''
+    return finish_round_fragment(player=player)
+
+
 def game_state(
-        game: models.Game,
-        player: models.Player,
+        view: models.GameView,
+        player: Optional[models.PlayerView],
         total_bids: Optional[int] = None
 ) -> str:
-    """Return HTML fragment describing game state for Player's dashboard."""
-    if game.state == game.State.CONFIRMING:
+    """Return HTML fragment describing game state for Player's dashboard.
+
+    Without Player, leave out what is specific to her, see
+    viewer_game_state.
+    """
+    if view.state == models.Game.State.CONFIRMING:
         return _('Waiting for other players to join and '
                  'organizer to start the game.')
     card_count = _(' with %(cards)s',
-                   cards=pluralize(game.current_card_count, i18n_card))
+                   cards=pluralize(view.current_card_count, i18n_card))
     bid_count = (''
                  if total_bids is None
                  else (_('1 trick bid')
                        if total_bids == 1
                        else _('%(tricks)s bid',
                               tricks=pluralize(total_bids, i18n_trick))))
-    if game.round.state == models.Round.State.BIDDING:
+    round_ = view.round
+    assert round_ is not None, "only CONFIRMING Games have no Round"
+    if round_.state == models.Round.State.BIDDING:
         return _('Bidding %(card_count)s, %(bid_count)s so far.',
                  card_count=card_count,
                  bid_count=bid_count)
-    elif game.round.state == models.Round.State.PLAYING:
+    elif round_.state == models.Round.State.PLAYING:
         return _('Playing %(card_count)s, %(bid_count)s.',
                  card_count=card_count,
                  bid_count=bid_count)
-    elif game.round.state in [
+    elif round_.state in [
             models.Round.State.BETWEEN_TRICKS,
             models.Round.State.DONE]:
-        winner = WINNER_FRAGMENT.render(name=game.round.current_player.name,
+        winner = WINNER_FRAGMENT.render(name=round_.current_player.name,
                                         i18n=_(' won the trick.'))
-        if game.state == models.Game.State.PAUSED_BETWEEN_ROUNDS:
+        if view.state == models.Game.State.PAUSED_BETWEEN_ROUNDS:
             return _('Round finished.') + winner + \
-                finish_round_fragment(player=player)
+                viewer_game_state(view, player)
         else:
             return _('Playing %(card_count)s, %(bid_count)s.',
                      card_count=card_count,
                      bid_count=bid_count
                      ) + winner
-    return (f'NOT REACHED game.state={game.state}, round:'
-            f'{"No Round" if game._round is None else game._round.state}')
+    return f'NOT REACHED game.state={view.state}, round:{round_.state}'
 
 
 @bp.route('/restore/link/', methods=('GET', 'POST',))
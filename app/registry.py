@@ -0,0 +1,121 @@
+"""Registry of all Games hosted by one application instance."""
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from .models import Game, Player
+
+
+def new_organizer_secret() -> str:
+    """Return a random string to authenticate an organizer."""
+    return "".join(f"{x:02X}" for x in os.urandom(16))
+
+
+class RegisteredGame(NamedTuple):
+    """A Game and the secret of the organizer who created it."""
+
+    game: Game
+    organizer_secret: str
+
+
+class _Shard:
+    """Part of the registry: Games whose id hashes to the same shard."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        """Serialize read-modify-write sequences on `organizers'."""
+        self.games: Dict[str, RegisteredGame] = {}
+        """Map Game.id to RegisteredGame."""
+        self.organizers: Dict[str, str] = {}
+        """Map organizer secret to Game.id."""
+
+
+class GameRegistry:
+    """Hold all Games, keyed by their id.
+
+    Lookups are plain dictionary reads and never take a lock.
+    Creating or removing a Game only locks the shard its organizer
+    secret hashes to, so that organizers setting up different tables
+    do not contend with each other.
+    """
+
+    def __init__(self, shard_count: int = 16):
+        """Create an empty registry."""
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self._shards = [_Shard() for _ in range(shard_count)]
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def __len__(self) -> int:
+        """Return number of registered Games."""
+        return sum(len(shard.games) for shard in self._shards)
+
+    def __iter__(self):
+        """Iterate over the registered Games."""
+        for shard in self._shards:
+            for entry in list(shard.games.values()):
+                yield entry.game
+
+    def game(self, game_id: str) -> Game:
+        """Return Game by its id or raise KeyError."""
+        return self._shard(game_id).games[game_id].game
+
+    def organizer_secret(self, game_id: str) -> str:
+        """Return secret of the organizer of a Game or raise KeyError."""
+        return self._shard(game_id).games[game_id].organizer_secret
+
+    def game_by_organizer_secret(self, organizer_secret: str) -> Game:
+        """Return Game created by an organizer or raise KeyError."""
+        game_id = self._shard(organizer_secret).organizers[organizer_secret]
+        return self.game(game_id)
+
+    def is_organizer(self, organizer_secret: str) -> bool:
+        """Tell if the secret belongs to the organizer of a Game."""
+        return organizer_secret in self._shard(organizer_secret).organizers
+
+    def create_game(
+            self,
+            players: List[Player],
+            organizer_secret: Optional[str] = None
+    ) -> Game:
+        """Create and register a new Game.
+
+        Without organizer_secret, a new one is generated.  Otherwise,
+        the organizer's previous Game (if any) is discarded.
+        """
+        game = Game(players)
+        self.register(game, organizer_secret)
+        return game
+
+    def register(
+            self,
+            game: Game,
+            organizer_secret: Optional[str] = None
+    ) -> None:
+        """Register an existing Game, see create_game."""
+        if organizer_secret is None:
+            organizer_secret = new_organizer_secret()
+        organizer_shard = self._shard(organizer_secret)
+        # Register the Game before publishing the organizer secret so
+        # that a concurrent lookup never sees a dangling Game.id.
+        self._shard(game.id).games[game.id] = RegisteredGame(
+            game, organizer_secret)
+        with organizer_shard.lock:
+            old_game_id = organizer_shard.organizers.get(organizer_secret)
+            organizer_shard.organizers[organizer_secret] = game.id
+        if old_game_id is not None and old_game_id != game.id:
+            self._shard(old_game_id).games.pop(old_game_id, None)
+
+    def remove_game(self, game_id: str) -> None:
+        """Forget a Game and its organizer secret."""
+        try:
+            organizer_secret = self.organizer_secret(game_id)
+        except KeyError:
+            return
+        organizer_shard = self._shard(organizer_secret)
+        with organizer_shard.lock:
+            if organizer_shard.organizers.get(organizer_secret) == game_id:
+                del organizer_shard.organizers[organizer_secret]
+        self._shard(game_id).games.pop(game_id, None)
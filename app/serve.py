@@ -0,0 +1,106 @@
+"""Serve the application in production: `python -m app.serve'.
+
+waitress (an optional dependency) serves the HTTP requests on a pool
+of worker threads, keeping idle connections open without holding a
+thread.  There is a single process on purpose: the Games live in its
+memory, so all the requests for a Game reach the process holding it.
+Scale up with more threads.
+
+Long polls (see player.api_status) hold a worker thread while they
+wait, one per connected Player: at most LONG_POLL_WAITERS of them
+wait, leaving the other threads to the remaining requests.  Event
+streams (player.api_events) hold one for as long as a Player's page
+is open, without such a limit, so they are off unless
+SERVER_SENT_EVENTS is set.  Requests beyond the connection limit wait
+in the listen backlog, and are refused once it is full.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import click
+
+from instance.config import app_config
+
+from . import create_app
+
+try:
+    import waitress  # type: ignore
+except ImportError:
+    waitress = None
+
+
+def server_options(
+        config: Dict[str, Any],
+        host: str,
+        port: int,
+        threads: Optional[int] = None,
+        connection_limit: Optional[int] = None,
+        backlog: Optional[int] = None,
+        keep_alive: Optional[float] = None
+) -> Dict[str, Any]:
+    """Return the keyword arguments of waitress.serve.
+
+    Missing values come from the SERVE_* entries of the configuration.
+    """
+    def setting(value, key):
+        return config[key] if value is None else value
+    return {
+        'host': host,
+        'port': port,
+        'threads': setting(threads, 'SERVE_THREADS'),
+        'connection_limit': setting(connection_limit,
+                                    'SERVE_CONNECTION_LIMIT'),
+        'backlog': setting(backlog, 'SERVE_BACKLOG'),
+        # idle keep-alive connections are closed after this many seconds
+        'channel_timeout': setting(keep_alive, 'SERVE_KEEP_ALIVE'),
+        # select() can not watch more than 1024 connections
+        'asyncore_use_poll': True,
+        'ident': 'rikiki',
+    }
+
+
+def long_poll_waiters(config: Dict[str, Any], threads: int) -> int:
+    """Return how many long polls may wait with that many threads.
+
+    LONG_POLL_WAITERS is meant for SERVE_THREADS: keep the same
+    proportion of threads free for the other requests.
+    """
+    return max(1, threads * config['LONG_POLL_WAITERS']
+               // config['SERVE_THREADS'])
+
+
+@click.command()
+@click.option('--config', 'config_name', type=click.Choice(sorted(app_config)),
+              default='production', show_default=True,
+              help="Configuration of the application.")
+@click.option('--host', default='0.0.0.0', show_default=True,
+              help="Interface to listen on.")
+@click.option('--port', type=click.IntRange(1, 65535), default=8080,
+              show_default=True, help="Port to listen on.")
+@click.option('--threads', type=click.IntRange(1), default=None,
+              help="Worker threads [default: SERVE_THREADS].")
+@click.option('--connection-limit', type=click.IntRange(1), default=None,
+              help="Most open connections [default: "
+                   "SERVE_CONNECTION_LIMIT].")
+@click.option('--backlog', type=click.IntRange(1), default=None,
+              help="Connections waiting to be accepted [default: "
+                   "SERVE_BACKLOG].")
+@click.option('--keep-alive', type=click.FloatRange(0), default=None,
+              help="Seconds before closing idle connections [default: "
+                   "SERVE_KEEP_ALIVE].")
+def serve(config_name, host, port, threads, connection_limit, backlog,
+          keep_alive):
+    """Serve rikiki with a production WSGI server."""
+    if waitress is None:
+        raise click.UsageError("Serving needs waitress (pip install waitress)")
+    app = create_app(config_name)
+    if threads is not None:
+        app.long_polls = threading.BoundedSemaphore(
+            long_poll_waiters(app.config, threads))
+    waitress.serve(app, **server_options(
+        app.config, host, port, threads, connection_limit, backlog,
+        keep_alive))
+
+
+if __name__ == '__main__':
+    serve()
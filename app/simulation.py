@@ -0,0 +1,273 @@
+"""Simulate many Rikiki games at once with NumPy (offline analysis).
+
+The rules are those of models.Round and models.Game, but instead of
+one Player object per participant, the hands of thousands of games
+are held in one boolean array and all games advance in lockstep:
+
+  hands[game, position, card] is True if the Player at that position
+  of the Round holds Card(card).
+
+Inside a Round, position 0 bids first and leads the first trick.
+Like Game.start_next_round, the Players rotate after each Round:
+position p of the Round with index r is seat (p + r) % players.
+
+Bid and play decisions come from policies, i.e. functions receiving
+a BidView or PlayView describing all games at once and returning one
+bid or card per game.  NumPy is an optional dependency that only this
+module needs.
+"""
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np  # type: ignore
+
+from .models import CARDS_PER_SUIT, MAX_CARDS, SUITS, TRICK_KEYS
+
+NO_CARD = -1
+"""Card number in arrays where there is no card (e.g. no trump)."""
+
+CARD_SUITS = np.arange(MAX_CARDS) // CARDS_PER_SUIT
+"""Suit of each card."""
+
+SUIT_MATRIX = CARD_SUITS[np.newaxis, :] == np.arange(SUITS)[:, np.newaxis]
+"""SUIT_MATRIX[suit, card] is True if card belongs to suit."""
+
+TRICK_KEY_ARRAY = np.array(TRICK_KEYS)
+"""models.TRICK_KEYS as an array indexed by [lead_suit, trump_suit, card]."""
+
+
+class BidView(NamedTuple):
+    """What a bid policy knows when the Players at `position' bid."""
+
+    hand: np.ndarray
+    """hand[game, card]: the bidding Player's cards."""
+    trump: np.ndarray
+    """trump[game]: trump card or NO_CARD."""
+    position: int
+    """Position of the bidding Player in the Round."""
+    card_count: int
+    """How many cards each Player got in this Round."""
+    bids: np.ndarray
+    """bids[game, position]: bids placed so far, -1 if none yet."""
+
+
+class PlayView(NamedTuple):
+    """What a play policy knows when it is someone's turn to play."""
+
+    hand: np.ndarray
+    """hand[game, card]: the current Player's cards."""
+    legal: np.ndarray
+    """legal[game, card]: cards of the hand that may be played."""
+    trump: np.ndarray
+    """trump[game]: trump card or NO_CARD."""
+    position: np.ndarray
+    """position[game]: position of the current Player in the Round."""
+    table: np.ndarray
+    """table[game, turn]: cards of the trick in playing order or NO_CARD."""
+    bids: np.ndarray
+    """bids[game, position]: all bids of the Round."""
+    tricks: np.ndarray
+    """tricks[game, position]: tricks won so far in the Round."""
+
+
+BidPolicy = Callable[[BidView], np.ndarray]
+PlayPolicy = Callable[[PlayView], np.ndarray]
+
+
+class RoundResult(NamedTuple):
+    """Outcome of a Round in all games, indexed by [game, position]."""
+
+    bids: np.ndarray
+    tricks: np.ndarray
+
+
+class SimulationResult(NamedTuple):
+    """Outcome of whole games, indexed by seat (not by position)."""
+
+    card_counts: List[int]
+    """How many cards each Player got in each Round."""
+    trump: np.ndarray
+    """trump[game, round]: trump card or NO_CARD."""
+    bids: np.ndarray
+    """bids[game, round, seat]."""
+    tricks: np.ndarray
+    """tricks[game, round, seat]."""
+
+
+def round_card_counts(players: int) -> List[int]:
+    """Return how many cards are dealt in each Round of a Game.
+
+    Like Game.start_next_round: decreasing from the maximum down to
+    1, then increasing again up to the maximum.
+    """
+    if players < 2:
+        raise ValueError("At least 2 players necessary")
+    most = MAX_CARDS // players
+    return list(range(most, 0, -1)) + list(range(2, most + 1))
+
+
+def random_decks(rng: np.random.Generator, shape: Tuple[int, ...]):
+    """Return shuffled decks: an array of card orders of shape (*shape, 52)."""
+    return rng.random((*shape, MAX_CARDS)).argsort(axis=-1)
+
+
+def deal(
+        decks: np.ndarray,
+        players: int,
+        how_many_cards: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Deal the shuffled decks[game, :] like Round.deal_cards.
+
+    Return (hands, trump): position p gets the cards at indices
+    [p * how_many_cards, (p + 1) * how_many_cards) of the deck and the
+    next card is the trump, if there is one left.
+    """
+    if how_many_cards < 1 or how_many_cards * players > MAX_CARDS:
+        raise ValueError(
+            "how_many_cards must be > 0 but not too large either")
+    games = decks.shape[0]
+    dealt = decks[:, :how_many_cards * players].reshape(
+        games, players, how_many_cards)
+    hands = np.zeros((games, players, MAX_CARDS), dtype=bool)
+    np.put_along_axis(hands, dealt, True, axis=2)
+    if (how_many_cards + 1) * players > MAX_CARDS:
+        trump = np.full(games, NO_CARD)
+    else:
+        trump = decks[:, how_many_cards * players].copy()
+    return (hands, trump)
+
+
+def legal_cards(hand: np.ndarray, lead_suit: Optional[np.ndarray]):
+    """Return legal[game, card] like models.playable_mask.
+
+    lead_suit[game] is the suit of the first card of the trick (None
+    if the table is empty in all games).
+    """
+    if lead_suit is None:
+        return hand
+    follow = hand & SUIT_MATRIX[lead_suit]
+    return np.where(follow.any(axis=1, keepdims=True), follow, hand)
+
+
+def play_round(
+        hands: np.ndarray,
+        trump: np.ndarray,
+        bid_policy: BidPolicy,
+        play_policy: PlayPolicy
+) -> RoundResult:
+    """Bid and play one Round in all games.
+
+    hands and trump are as returned by deal (hands is not modified).
+    """
+    (games, players, _) = hands.shape
+    hands = hands.copy()
+    card_count = int(hands[0, 0].sum())
+    every_game = np.arange(games)
+    trump_suit = np.where(trump == NO_CARD, SUITS, trump // CARDS_PER_SUIT)
+    bids = np.full((games, players), -1)
+    for position in range(players):
+        bid = np.asarray(bid_policy(BidView(
+            hands[:, position], trump, position, card_count, bids.copy())))
+        if ((bid < 0) | (bid > card_count)).any():
+            raise ValueError(
+                f"Bid policy bid outside [0, {card_count}]")
+        bids[:, position] = bid
+    tricks = np.zeros((games, players), dtype=int)
+    leader = np.zeros(games, dtype=int)
+    for _ in range(card_count):
+        table = np.full((games, players), NO_CARD)
+        lead_suit = None
+        for turn in range(players):
+            position = (leader + turn) % players
+            hand = hands[every_game, position]
+            legal = legal_cards(hand, lead_suit)
+            card = np.asarray(play_policy(PlayView(
+                hand, legal, trump, position, table.copy(), bids,
+                tricks.copy())))
+            if not legal[every_game, card].all():
+                raise ValueError("Play policy played a card not allowed")
+            hands[every_game, position, card] = False
+            table[:, turn] = card
+            if lead_suit is None:
+                lead_suit = CARD_SUITS[card]
+        keys = TRICK_KEY_ARRAY[CARD_SUITS[table[:, :1]],
+                               trump_suit[:, np.newaxis],
+                               table]
+        # the winner leads the next trick
+        leader = (leader + keys.argmax(axis=1)) % players
+        tricks[every_game, leader] += 1
+    return RoundResult(bids, tricks)
+
+
+def simulate_games(
+        games: int,
+        players: int,
+        bid_policy: BidPolicy,
+        play_policy: PlayPolicy,
+        rng: Union[None, int, np.random.Generator] = None,
+        decks: Optional[np.ndarray] = None
+) -> SimulationResult:
+    """Play all Rounds of `games' Games with `players' Players each.
+
+    Without decks (an array of card orders indexed by [game, round,
+    card]), the cards are shuffled with rng (a Generator or a seed).
+    """
+    card_counts = round_card_counts(players)
+    if decks is None:
+        decks = random_decks(np.random.default_rng(rng),
+                             (games, len(card_counts)))
+    trump = np.empty((games, len(card_counts)), dtype=int)
+    bids = np.empty((games, len(card_counts), players), dtype=int)
+    tricks = np.empty_like(bids)
+    for (round_index, how_many_cards) in enumerate(card_counts):
+        (hands, trump[:, round_index]) = deal(
+            decks[:, round_index], players, how_many_cards)
+        result = play_round(
+            hands, trump[:, round_index], bid_policy, play_policy)
+        seats = (np.arange(players) + round_index) % players
+        bids[:, round_index, seats] = result.bids
+        tricks[:, round_index, seats] = result.tricks
+    return SimulationResult(card_counts, trump, bids, tricks)
+
+
+def zero_bid(view: BidView) -> np.ndarray:
+    """Bid policy: always bid 0."""
+    return np.zeros(view.hand.shape[0], dtype=int)
+
+
+def random_bid(rng: np.random.Generator) -> BidPolicy:
+    """Return bid policy bidding uniformly in [0, card_count]."""
+    def policy(view: BidView) -> np.ndarray:
+        return rng.integers(0, view.card_count + 1,
+                            size=(view.hand.shape[0],))
+    return policy
+
+
+def high_cards_bid(view: BidView) -> np.ndarray:
+    """Bid policy: count aces and trumps above 10."""
+    ranks = np.arange(MAX_CARDS) % CARDS_PER_SUIT
+    aces = (view.hand & (ranks == CARDS_PER_SUIT - 1)).sum(axis=1)
+    trump_suit = np.where(view.trump == NO_CARD, SUITS,
+                          view.trump // CARDS_PER_SUIT)
+    high_trumps = (view.hand
+                   & (CARD_SUITS == trump_suit[:, np.newaxis])
+                   & (ranks >= CARDS_PER_SUIT - 4)
+                   & (ranks < CARDS_PER_SUIT - 1)).sum(axis=1)
+    return np.minimum(aces + high_trumps, view.card_count)
+
+
+def lowest_card(view: PlayView) -> np.ndarray:
+    """Play policy: play the allowed card with the lowest Card value."""
+    return view.legal.argmax(axis=1)
+
+
+def highest_card(view: PlayView) -> np.ndarray:
+    """Play policy: play the allowed card with the highest Card value."""
+    return MAX_CARDS - 1 - view.legal[:, ::-1].argmax(axis=1)
+
+
+def random_card(rng: np.random.Generator) -> PlayPolicy:
+    """Return play policy picking uniformly among the allowed cards."""
+    def policy(view: PlayView) -> np.ndarray:
+        return np.where(view.legal, rng.random(view.legal.shape), -1.0
+                        ).argmax(axis=1)
+    return policy
@@ -0,0 +1,204 @@
+"""Compact binary snapshots of Games, see app.journal.
+
+A snapshot holds the Games of a journal as they were after a given
+journal segment, so that only the later segments need replaying.
+All integers are little endian, strings are UTF-8 preceded by their
+length (2 bytes):
+
+  snapshot := b'RKS1' segment:u32 game_count:u32 game*
+  game     := id csrf_token organizer_secret:str state:u8
+              current_card_count:u8 increasing:u8 version:u32
+              player_count:u8 player* confirmed_count:u8 index:u8*
+              [round, unless the Game is in CONFIRMING state]
+  player   := provisional_name secret_id player_id confirmed_secret_id
+              cookie:str confirmed_name:str? policy:str?
+  round    := state:u8 trump:i8 current_player:u8 table_leader:u8
+              table_size:u8 card:u8* (dealt:u64 hand:u64 bid:i8
+              tricks:u8)*confirmed_count
+  str?     := 0:u8 | 1:u8 str
+
+Absent trump and bids are -1.
+"""
+import struct
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from .bots import BotPlayer
+from .models import Card, Game, Player, Round
+from .registry import RegisteredGame
+from .state import RoundState, from_round, restore_round
+
+MAGIC = b'RKS1'
+
+_HEADER = struct.Struct('<4sII')
+_LENGTH = struct.Struct('<H')
+_FLAG = struct.Struct('<B')
+_GAME = struct.Struct('<BBBI')
+_ROUND = struct.Struct('<BbBBB')
+_SEAT = struct.Struct('<QQbB')
+
+HEADER_SIZE = _HEADER.size
+
+
+class SnapshotError(ValueError):
+    """The snapshot is damaged or in an unknown format."""
+
+
+class _Writer:
+    def __init__(self, output: BinaryIO):
+        self._output = output
+
+    def write(self, data: bytes) -> None:
+        self._output.write(data)
+
+    def pack(self, format: struct.Struct, *values) -> None:
+        self._output.write(format.pack(*values))
+
+    def byte_list(self, values: List[int]) -> None:
+        self.pack(_FLAG, len(values))
+        self.write(bytes(values))
+
+    def string(self, value: str) -> None:
+        data = value.encode('utf-8')
+        self.pack(_LENGTH, len(data))
+        self.write(data)
+
+    def optional_string(self, value: Optional[str]) -> None:
+        self.pack(_FLAG, value is not None)
+        if value is not None:
+            self.string(value)
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self._data = data
+        self._offset = 0
+
+    def read(self, size: int) -> bytes:
+        if self._offset + size > len(self._data):
+            raise SnapshotError("Snapshot is truncated")
+        self._offset += size
+        return self._data[(self._offset - size):self._offset]
+
+    def unpack(self, format: struct.Struct) -> Tuple:
+        return format.unpack(self.read(format.size))
+
+    def byte_list(self) -> List[int]:
+        (size,) = self.unpack(_FLAG)
+        return list(self.read(size))
+
+    def string(self) -> str:
+        (size,) = self.unpack(_LENGTH)
+        return self.read(size).decode('utf-8')
+
+    def optional_string(self) -> Optional[str]:
+        (present,) = self.unpack(_FLAG)
+        return self.string() if present else None
+
+    def done(self) -> bool:
+        return self._offset == len(self._data)
+
+
+def _dump_game(writer: _Writer, entry: RegisteredGame) -> None:
+    (game, organizer_secret) = entry
+    progress = game.progress()
+    writer.string(game.id)
+    writer.string(game.csrf_token)
+    writer.string(organizer_secret)
+    writer.pack(_GAME, progress['state'], progress['current_card_count'],
+                progress['increasing'], progress['version'])
+    writer.pack(_FLAG, len(game.players))
+    for player in game.players:
+        identity = player.identity()
+        for key in ('provisional_name', 'secret_id', 'player_id',
+                    'confirmed_secret_id', 'cookie'):
+            writer.string(identity[key] or '')
+        writer.optional_string(identity['confirmed_name'])
+        writer.optional_string(player.policy_name
+                               if isinstance(player, BotPlayer)
+                               else None)
+    writer.byte_list(progress['confirmed_players'])
+    if game.state == Game.State.CONFIRMING:
+        return
+    state = from_round(game.round)
+    writer.pack(_ROUND, state.state - Round.State.BIDDING,
+                -1 if state.trump is None else state.trump,
+                state.current_player, state.table_leader, len(state.table))
+    writer.write(bytes(state.table))
+    for seat in zip(state.dealt, state.hands, state.bids, state.tricks):
+        writer.pack(_SEAT, seat[0], seat[1],
+                    -1 if seat[2] is None else seat[2], seat[3])
+
+
+def _load_game(reader: _Reader) -> RegisteredGame:
+    (game_id, csrf_token, organizer_secret) = (
+        reader.string(), reader.string(), reader.string())
+    (state, current_card_count, increasing, version) = reader.unpack(_GAME)
+    (player_count,) = reader.unpack(_FLAG)
+    players: List[Player] = []
+    for _ in range(player_count):
+        (provisional_name, secret_id, player_id, confirmed_secret_id,
+         cookie) = [reader.string() for _ in range(5)]
+        confirmed_name = reader.optional_string()
+        policy = reader.optional_string()
+        player = (Player(provisional_name, secret_id)
+                  if policy is None
+                  else BotPlayer(provisional_name, policy))
+        player.restore_identity(player_id, confirmed_secret_id, cookie)
+        if confirmed_name is not None:
+            player.confirm(confirmed_name)
+        players.append(player)
+    game = Game(players)
+    game.restore_identity(game_id, csrf_token)
+    game.restore_progress(Game.State(state), reader.byte_list(),
+                          current_card_count, bool(increasing), version)
+    if game.state != Game.State.CONFIRMING:
+        (round_state, trump, current_player, table_leader,
+         table_size) = reader.unpack(_ROUND)
+        table = tuple(Card(c) for c in reader.read(table_size))
+        seats = [reader.unpack(_SEAT) for _ in game.confirmed_players]
+        game.resume_round(restore_round(game, RoundState(
+            trump=None if trump < 0 else Card(trump),
+            dealt=tuple(s[0] for s in seats),
+            hands=tuple(s[1] for s in seats),
+            bids=tuple(None if s[2] < 0 else s[2] for s in seats),
+            tricks=tuple(s[3] for s in seats),
+            state=Round.State(Round.State.BIDDING + round_state),
+            current_player=current_player,
+            table=table,
+            table_leader=table_leader)))
+    return RegisteredGame(game, organizer_secret)
+
+
+def segment(header: bytes) -> int:
+    """Return the segment of a snapshot given its first HEADER_SIZE bytes."""
+    if len(header) < HEADER_SIZE:
+        raise SnapshotError("Snapshot is truncated")
+    (magic, segment, _) = _HEADER.unpack(header[:HEADER_SIZE])
+    if magic != MAGIC:
+        raise SnapshotError(f"Not a snapshot: {magic!r}")
+    return segment
+
+
+def dump(
+        games: Dict[str, RegisteredGame],
+        segment: int,
+        output: BinaryIO
+) -> None:
+    """Write snapshot of games after journal segment to output."""
+    writer = _Writer(output)
+    writer.pack(_HEADER, MAGIC, segment, len(games))
+    for entry in games.values():
+        _dump_game(writer, entry)
+
+
+def load(data: bytes) -> Tuple[Dict[str, RegisteredGame], int]:
+    """Return the Games of a snapshot (by id) and its segment."""
+    reader = _Reader(data)
+    (_, _, game_count) = reader.unpack(_HEADER)
+    games: Dict[str, RegisteredGame] = {}
+    for _ in range(game_count):
+        entry = _load_game(reader)
+        games[entry.game.id] = entry
+    if not reader.done():
+        raise SnapshotError("Trailing data after snapshot")
+    return (games, segment(data))
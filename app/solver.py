@@ -0,0 +1,184 @@
+"""Solve the end of a Round exactly, seeing all hands ("double dummy").
+
+The question answered is how many tricks one Player wins from now on
+if she plays perfectly and all other Players play perfectly against
+her, i.e. to make her win as few tricks as possible (or as many when
+she wants to lose tricks).  This is exact for the last few tricks of
+any Round and for whole Rounds with 1 or 2 cards per Player.
+
+Hands are sets of cards (see models.card_mask) in the Round's playing
+order; the trick in progress is a tuple of the cards on the table,
+the first one played by the Player at index `leader'.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models import (CARDS_PER_SUIT, Card, Round, card_bit, card_count,
+                     card_mask, mask_cards, playable_mask, trick_keys,
+                     trick_winner)
+
+Hands = Tuple[int, ...]
+Table = Tuple[Card, ...]
+
+
+class Solver:
+    """Alpha-beta search with a transposition table.
+
+    The transposition table maps (hands, leader, table) to bounds of
+    the tricks the Player still wins.  It stays valid between calls
+    for the same trump, Player and goal, so reuse the Solver while a
+    Round goes on.
+    """
+
+    def __init__(
+            self,
+            trump: Optional[Card],
+            player: int,
+            maximize: bool = True
+    ):
+        """Create new Solver counting tricks of the Player at that index."""
+        self.trump = trump
+        self.player = player
+        self.maximize = maximize
+        self._table: Dict[Tuple[Hands, int, Table], Tuple[int, int]] = {}
+        """Map position to (lower bound, upper bound) of tricks."""
+
+    def __len__(self) -> int:
+        """Return number of positions in the transposition table."""
+        return len(self._table)
+
+    def tricks(
+            self,
+            hands: Sequence[int],
+            leader: int = 0,
+            table: Sequence[Card] = ()
+    ) -> int:
+        """Return tricks the Player wins from this position on.
+
+        The trick in progress counts if the Player wins it.
+        """
+        hands = tuple(hands)
+        remaining = card_count(hands[(leader + len(table)) % len(hands)])
+        return self._search(hands, leader, tuple(table), 0, remaining + 1)
+
+    def card_values(
+            self,
+            hands: Sequence[int],
+            leader: int = 0,
+            table: Sequence[Card] = ()
+    ) -> Dict[Card, int]:
+        """Return the value of tricks() after each allowed card.
+
+        The cards are those the Player whose turn it is may play.
+        """
+        hands = tuple(hands)
+        table = tuple(table)
+        seat = (leader + len(table)) % len(hands)
+        result = {}
+        for card in mask_cards(playable_mask(
+                hands[seat], table[0] if table else None)):
+            (won, next_hands, next_leader, next_table) = self._play(
+                hands, leader, table, seat, card)
+            result[card] = won + self.tricks(
+                next_hands, next_leader, next_table)
+        return result
+
+    def _play(self, hands: Hands, leader: int, table: Table, seat: int,
+              card: Card) -> Tuple[int, Hands, int, Table]:
+        # Return (tricks won by Player, position after playing card)
+        hands = hands[:seat] + (hands[seat] & ~card_bit(card),) \
+            + hands[seat + 1:]
+        table = table + (card,)
+        if len(table) < len(hands):
+            return (0, hands, leader, table)
+        winner = (leader + trick_winner(list(table), self.trump)) \
+            % len(hands)
+        return (int(winner == self.player), hands, winner, ())
+
+    def _moves(self, hands: Hands, table: Table, seat: int) -> List[Card]:
+        # Allowed cards, leaving out cards equivalent to a lower card
+        # of the same hand (no card still in play between them)
+        # and trying the highest cards first.
+        legal = playable_mask(hands[seat], table[0] if table else None)
+        in_play = card_mask(table)
+        for hand in hands:
+            in_play |= hand
+        result = []
+        previous = None
+        for card in mask_cards(legal):
+            between: Optional[int] = \
+                card_bit(card) - (card_bit(previous) << 1) \
+                if previous is not None \
+                and previous // CARDS_PER_SUIT == card // CARDS_PER_SUIT \
+                else None
+            if between is None or (in_play & between) != 0:
+                result.append(card)
+            previous = card
+        if table:
+            keys = trick_keys(table[0], self.trump)
+            result.sort(key=lambda c: keys[c], reverse=True)
+        else:
+            result.reverse()
+        return result
+
+    def _search(self, hands: Hands, leader: int, table: Table,
+                alpha: int, beta: int) -> int:
+        seat = (leader + len(table)) % len(hands)
+        if hands[seat] == 0:
+            return 0
+        key = (hands, leader, table)
+        # the Player whose turn it is has one card per remaining trick
+        (lower, upper) = self._table.get(key, (0, card_count(hands[seat])))
+        if lower >= beta or lower == upper:
+            return lower
+        if upper <= alpha:
+            return upper
+        (alpha, beta) = (max(alpha, lower), min(beta, upper))
+        (window_alpha, window_beta) = (alpha, beta)
+        maximizing = (seat == self.player) == self.maximize
+        best = None
+        for card in self._moves(hands, table, seat):
+            (won, next_hands, next_leader, next_table) = self._play(
+                hands, leader, table, seat, card)
+            value = won + self._search(next_hands, next_leader, next_table,
+                                       alpha - won, beta - won)
+            if maximizing:
+                best = value if best is None else max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = value if best is None else min(best, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+        assert best is not None
+        if best <= window_alpha:
+            upper = min(upper, best)
+        elif best >= window_beta:
+            lower = max(lower, best)
+        else:
+            (lower, upper) = (best, best)
+        self._table[key] = (lower, upper)
+        return best
+
+
+def round_position(round_: Round) -> Tuple[Hands, int, Table]:
+    """Return (hands, leader, table) of a Round being played."""
+    players = round_.players
+    if round_.state == Round.State.PLAYING:
+        trick = round_.current_trick
+        table = tuple(card for (_, card) in trick)
+        leader = (players.index(round_.current_player) - len(trick)) \
+            % len(players)
+    else:
+        table = ()
+        leader = players.index(round_.current_player)
+    return (tuple(p.hand for p in players), leader, table)
+
+
+def best_possible(hands: Sequence[int], trump: Optional[Card]) -> List[int]:
+    """Return most tricks each Player can win against all others.
+
+    hands are those dealt at the start of the Round, the Player at
+    index 0 leads.
+    """
+    return [Solver(trump, player).tricks(hands)
+            for player in range(len(hands))]
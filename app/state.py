@@ -0,0 +1,143 @@
+"""Immutable snapshots of a Round, for what-if search.
+
+A RoundState holds what decides the rest of a Round (hands, bids,
+tricks, cards on the table, current Player, trump) in tuples of
+integers, without Player objects, secrets or back references.
+Copying one is free: place_bid and play_card return a new RoundState
+and leave their argument untouched, so a search can branch from the
+same RoundState as often as it wants.
+
+Players are identified by their index in the Round (index 0 bids
+first and leads the first trick).  The rules and errors are those of
+models.Round and models.Player.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from .models import (Card, CardNotAllowedError, Game, IllegalStateError,
+                     Round, card_bit, card_count, playable_mask, trick_winner)
+
+
+class RoundState(NamedTuple):
+    """State of a Round, see module documentation."""
+
+    trump: Optional[Card]
+    dealt: Tuple[int, ...]
+    """Hands dealt at the start of the Round (see models.card_mask)."""
+    hands: Tuple[int, ...]
+    """Cards each Player still holds."""
+    bids: Tuple[Optional[int], ...]
+    tricks: Tuple[int, ...]
+    state: Round.State
+    current_player: int
+    table: Tuple[Card, ...]
+    """Cards of Round.current_trick (i.e. of the last complete trick
+    in BETWEEN_TRICKS and DONE states)."""
+    table_leader: int
+    """Index of the Player who played table[0] (current_player if the
+    table is empty)."""
+
+    @property
+    def playable(self) -> int:
+        """Return set of cards the current Player may play."""
+        if self.state == Round.State.PLAYING:
+            return playable_mask(self.hands[self.current_player],
+                                 self.table[0] if self.table else None)
+        elif self.state == Round.State.BETWEEN_TRICKS:
+            return self.hands[self.current_player]
+        else:
+            return 0
+
+
+def deal(
+        hands: Tuple[int, ...],
+        trump: Optional[Card] = None
+) -> RoundState:
+    """Return RoundState of a Round that just dealt these hands."""
+    players = len(hands)
+    return RoundState(trump=trump,
+                      dealt=hands,
+                      hands=hands,
+                      bids=(None,) * players,
+                      tricks=(0,) * players,
+                      state=Round.State.BIDDING,
+                      current_player=0,
+                      table=(),
+                      table_leader=0)
+
+
+def place_bid(state: RoundState, bid: int) -> RoundState:
+    """Return RoundState after the current Player bid."""
+    if state.state != Round.State.BIDDING:
+        raise IllegalStateError(
+            f"Round is in {state.state}, not in {Round.State.BIDDING}")
+    current = state.current_player
+    if not 0 <= bid <= card_count(state.hands[current]):
+        raise ValueError(f"Player {current} can't bid {bid}")
+    bids = state.bids[:current] + (bid,) + state.bids[current + 1:]
+    if current + 1 < len(state.hands):
+        return state._replace(bids=bids,
+                              current_player=current + 1,
+                              table_leader=current + 1)
+    return state._replace(bids=bids,
+                          current_player=0,
+                          table_leader=0,
+                          state=Round.State.PLAYING)
+
+
+def play_card(state: RoundState, card: Card) -> RoundState:
+    """Return RoundState after the current Player played card."""
+    if state.state not in (Round.State.PLAYING, Round.State.BETWEEN_TRICKS):
+        raise IllegalStateError(
+            f"Round is in {state.state}, not one of "
+            f"{[Round.State.PLAYING, Round.State.BETWEEN_TRICKS]}")
+    if not state.playable & card_bit(card):
+        raise CardNotAllowedError(
+            offending_player=state.current_player, offending_card=card)
+    players = len(state.hands)
+    current = state.current_player
+    hands = state.hands[:current] + (state.hands[current] & ~card_bit(card),) \
+        + state.hands[current + 1:]
+    table: Tuple[Card, ...]
+    if state.state == Round.State.BETWEEN_TRICKS or not state.table:
+        (table, leader) = ((card,), current)
+    else:
+        (table, leader) = (state.table + (card,), state.table_leader)
+    if len(table) < players:
+        return state._replace(hands=hands,
+                              state=Round.State.PLAYING,
+                              current_player=(current + 1) % players,
+                              table=table,
+                              table_leader=leader)
+    winner = (leader + trick_winner(list(table), state.trump)) % players
+    tricks = state.tricks[:winner] + (state.tricks[winner] + 1,) \
+        + state.tricks[winner + 1:]
+    return state._replace(hands=hands,
+                          tricks=tricks,
+                          state=(Round.State.DONE
+                                 if hands[winner] == 0
+                                 else Round.State.BETWEEN_TRICKS),
+                          current_player=winner,
+                          table=table,
+                          table_leader=leader)
+
+
+def from_round(round_: Round) -> RoundState:
+    """Return RoundState of a live Round."""
+    players = round_.players
+    trick = round_.current_trick
+    current_player = players.index(round_.current_player)
+    return RoundState(
+        trump=round_.trump,
+        dealt=round_.dealt_hands,
+        hands=tuple(p.hand for p in players),
+        bids=tuple(p.bid for p in players),
+        tricks=tuple(p.tricks for p in players),
+        state=round_.state,
+        current_player=current_player,
+        table=tuple(card for (_, card) in trick),
+        table_leader=(players.index(trick[0][0]) if trick else current_player))
+
+
+def restore_round(game: Game, state: RoundState) -> Round:
+    """Return live Round of the Game's confirmed Players in that state."""
+    return Round.restore(game, **state._asdict())
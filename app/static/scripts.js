@@ -69,6 +69,9 @@ function clearElement(elt) {
 
 let updateTimer = null;
 
+// ETag of the last status received by polling, sent back as If-None-Match
+let lastStatusETag = null;
+
 const currentPlayerClass = 'current_player'; // css class defined in style.css
 
 
@@ -78,8 +81,9 @@ async function updatePlayerStatusForOrganizer(statusUrl) {
     try {
         response = await fetch(statusUrl, {
             method: 'GET',
+            headers: lastStatusETag === null ? {} : {'If-None-Match': lastStatusETag},
             mode: 'cors',
-            cache: 'no-cache',
+            cache: 'no-store',
             credentials: 'same-origin',
             redirect: 'follow'});
     } catch {
@@ -89,6 +93,9 @@ async function updatePlayerStatusForOrganizer(statusUrl) {
     if (null == response) {
         return updateTimer;
     }
+    if (response.status == 304) {
+        return updateTimer; // nothing changed
+    }
     if (!response.ok) {
         const nav = document.getElementsByTagName('nav');
         if (nav) {
@@ -102,6 +109,7 @@ async function updatePlayerStatusForOrganizer(statusUrl) {
         return -1;
     }
     const data = await response.json();
+    lastStatusETag = response.headers.get('ETag');
     const classToRemove = 'unconfirmed_player';
     for (p in data.players) {
         const li = document.getElementById(p);
@@ -109,7 +117,9 @@ async function updatePlayerStatusForOrganizer(statusUrl) {
             li.classList.remove(classToRemove);
             li.classList.add('confirmed_player');
             li.children[0].textContent = data.players[p].name;
-            li.children[1].textContent = prependHostName(data.players[p].url);
+            if (data.players[p].url) {  // bots have no link
+                li.children[1].textContent = prependHostName(data.players[p].url);
+            }
         }
     }
     return updateTimer;
@@ -122,8 +132,9 @@ async function updateGameStatusOrganizerDashboard(statusUrl) {
     try {
         response = await fetch(statusUrl, {
             method: 'GET',
+            headers: lastStatusETag === null ? {} : {'If-None-Match': lastStatusETag},
             mode: 'cors',
-            cache: 'no-cache',
+            cache: 'no-store',
             credentials: 'same-origin',
             redirect: 'follow'});
     } catch {
@@ -133,6 +144,9 @@ async function updateGameStatusOrganizerDashboard(statusUrl) {
     if (null == response) {
         return updateTimer;
     }
+    if (response.status == 304) {
+        return updateTimer; // nothing changed
+    }
     if (!response.ok) {
         const nav = document.getElementsByTagName('nav');
         if (nav) {
@@ -143,6 +157,7 @@ async function updateGameStatusOrganizerDashboard(statusUrl) {
         return -1;
     }
     const data = await response.json();
+    lastStatusETag = response.headers.get('ETag');
     const round = data.round;
     const currentPlayer = round && round.currentPlayer;
     const roundState = round && round.state;
@@ -157,7 +172,7 @@ async function updateGameStatusOrganizerDashboard(statusUrl) {
             }
             const playerLink = li.getElementsByClassName('hostify');
             console.log(playerLink);
-            if (playerLink) {
+            if (playerLink.length > 0 && data.players[pid].url) {
                 playerLink[0].textContent = prependHostName(data.players[pid].url);
             }
         }
@@ -196,44 +211,206 @@ function fillPlayerDashboardPlayerList(players, selfId, playersElt, callback) {
     });
 }
 
-let lastGameStatusSummary = null;
+let lastGameVersion = null;
+// Game.turn of the last status: actions carry it, see postPlayerAction
+let lastGameTurn = null;
+
+// seconds the server may hold a status request, see LONG_POLL_TIMEOUT
+const longPollWait = 25;
 
-function maybeJoin(url, trail) {
-    if (!trail) {
-        return url;
+// Player URLs look like /player/<game_id>/<secret_id>/...
+function playerUrlSegments(url) {
+    const startMarker = '/player/';
+    const startIdx = url.indexOf(startMarker);
+    if (startIdx < 0) {
+        return null;
     }
 
-    const leftPart = url.endsWith('/') ? url.slice(0, -1): url;
-    const rightPart = trail.startsWith('/') ? trail.substring(1): trail;
-    return leftPart + '/' + rightPart + (trail.endsWith('/') ? '' : '/');
+    const segments = url.substring(startIdx + startMarker.length).split('/');
+    return {prefix: url.substring(0, startIdx + startMarker.length) + segments[0] + '/',
+            secretId: segments.length > 1 ? segments[1] : ''};
 }
 
 function extractPlayerSecret(url) {
-    const startMarker = '/player/';
-    const secretLength = 32;
-    const startIdx = url.indexOf(startMarker);
-    if (startIdx < 0) {
-        return '';
+    const segments = playerUrlSegments(url);
+    return segments ? segments.secretId : '';
+}
+
+// URL of a Player action (e.g. 'play/card/') in the same Game as url
+function playerActionUrl(url, action) {
+    const segments = playerUrlSegments(url);
+    return (segments ? segments.prefix : '/player/') + action;
+}
+
+// Make the cards in the Player's hand clickable if she may play them
+function setupPlayableCards(cardsElt, roundState, playableCards, statusUrl) {
+    if (roundState != ROUND_STATE_PLAYING && roundState != ROUND_STATE_BETWEEN_TRICKS) {
+        return;
+    }
+    const secretId = extractPlayerSecret(statusUrl);
+    for (let spanElt of cardsElt.getElementsByTagName('SPAN')) {
+        spanElt.className = 'playing_card';
+        spanElt.onclick = null;
+        if (playableCards.indexOf(spanElt.id) < 0) {
+            spanElt.classList.add('unplayable_card');
+            continue;
+        }
+        spanElt.classList.add('playable_card');
+        spanElt.onclick = async function playCard(e) {
+            e.preventDefault()
+            const playError = document.getElementById('playError');
+            clearElement(playError);
+            playError.classList.remove('error');
+            const playUrl = playerActionUrl(statusUrl, 'play/card/');
+            let formData = new FormData();
+            formData.append('secret_id', secretId);
+            formData.append('card', spanElt.id.substr(1));
+            const data = await (
+                socketAction({action: 'play', card: Number(spanElt.id.substr(1))})
+                    || postPlayerAction(playUrl, formData));
+            if (!data.ok && !data.stale) {
+                playError.classList.add('error');
+                playError.textContent = data.error;
+            }
+        };
+    };
+}
+
+// Redraw the Player dashboard with the data of one status update:
+// either a full status or, if it has a `since' version, only what
+// changed since then
+function showPlayerStatus(data, statusUrl) {
+    const isDelta = data.since !== undefined;
+    const gameState = data.game_state;
+    const selfId = data.id;
+    const players = data.players;
+    const cards = data.cards;
+    const trump = data.trump;
+    const gameStatusElt = document.getElementById('game_status');
+    const playersElt = document.getElementById('players');
+    const cardsElt = document.getElementById('cards');
+    const trumpElt = document.getElementById('trump');
+    const roundState = data.round && data.round.state;
+    const currentPlayerId = data.round && data.round.current_player;
+    clearElement(gameStatusElt);
+    if (gameState) {
+        gameStatusElt.insertAdjacentHTML('beforeend', gameState);
+    }
+    if (isDelta) {
+        // cards on the table have the same HTML id: only look in the hand
+        (data.cards_removed || []).forEach(cardId => {
+            const cardElt = cardsElt.querySelector(`#${cardId}`);
+            if (cardElt) {
+                cardsElt.removeChild(cardElt);
+            }
+        });
+    } else {
+        clearElement(cardsElt);
+        if (cards) {
+            cardsElt.insertAdjacentHTML('beforeend', cards);
+        }
+    }
+    setupPlayableCards(cardsElt, roundState, data.playable_cards || [], statusUrl);
+    if (isDelta) {
+        players.forEach(player => {
+            const li = document.getElementById(player.id);
+            if (li) {
+                li.outerHTML = player.h;
+            }
+        });
+    } else {
+        fillPlayerDashboardPlayerList(players, selfId, playersElt);
+    }
+    if (trump) {
+        trumpElt.innerHTML = trump;
+    } else {
+        clearElement(trumpElt);
     }
+    const tableElt = document.getElementById('table');
+    if (isDelta && data.table_added) {
+        data.table_added.forEach(cardHtml => {
+            tableElt.insertAdjacentHTML('beforeend', cardHtml);
+        });
+    } else {
+        clearElement(tableElt);
+        if (roundState == ROUND_STATE_PLAYING
+            || roundState == ROUND_STATE_BETWEEN_TRICKS
+            || roundState == ROUND_STATE_DONE) {
+            tableElt.insertAdjacentHTML('beforeend', data.table);
+        }
+    }
+    updateBidHint(data.bid_hint_url);
+    const bidElt = document.getElementById('bid');
+    if (roundState == ROUND_STATE_BIDDING && currentPlayerId == selfId) {
+        bidElt.onsubmit = submitBid;
+        bidElt.style.display = "inline";
+        const bidInput = document.getElementById('bidInput');
+        bidInput.value = undefined;
+        bidInput.max = document.getElementById('cards').childNodes.length;
+    } else {
+        bidElt.style.display = "none";
+    }
+}
 
-    return url.substr(startIdx + startMarker.length, 32);
+let bidHintTimer = null;
+let bidHintUrlShown = null;
+
+// The bid hint is not part of the status: the server refines it in
+// the background, ask for it again as long as it is `refining'
+async function updateBidHint(bidHintUrl) {
+    clearTimeout(bidHintTimer);
+    bidHintUrlShown = bidHintUrl;
+    const hintElt = document.getElementById('bidHint');
+    if (!bidHintUrl) {
+        hintElt.textContent = '';
+        return;
+    }
+    let data = null;
+    try {
+        const response = await fetch(bidHintUrl, {
+            method: 'GET',
+            mode: 'cors',
+            cache: 'no-store',
+            credentials: 'same-origin',
+            redirect: 'follow'});
+        if (!response.ok) {
+            return;
+        }
+        data = await response.json();
+    } catch {
+        return;
+    }
+    if (bidHintUrlShown !== bidHintUrl) {
+        return; // a status arrived meanwhile
+    }
+    hintElt.textContent = data.bid_hint;
+    if (data.refining) {
+        bidHintTimer = setTimeout(updateBidHint, 1000, bidHintUrl);
+    }
 }
 
 async function updatePlayerDashboard(statusUrl) {
-    let delay = 1000 /* milliseconds */;
+    // a long-poll returns as soon as something changed: ask again at once
+    const longPoll = lastStatusETag !== null;
+    const delay = longPoll ? 0 : 1000 /* milliseconds */;
     let response = null;
     try {
-        response = await fetch(maybeJoin(statusUrl, lastGameStatusSummary), {
+        const query = longPoll ? `?wait=${longPollWait}&since=${lastGameVersion}` : '';
+        response = await fetch(statusUrl + query, {
             method: 'GET',
+            headers: longPoll ? {'If-None-Match': lastStatusETag} : {},
             mode: 'cors',
-            cache: 'no-cache',
+            cache: 'no-store', // handle 304 Not Modified here, not in the browser cache
             credentials: 'same-origin',
             redirect: 'follow'});
     } catch {
-        delay *= 3;
+        updateTimer = setTimeout(updatePlayerDashboard, 3000, statusUrl);
+        return updateTimer;
     }
-    updateTimer = setTimeout(updatePlayerDashboard, delay, statusUrl);
-    if (null == response) {
+    if (response.status == 304) {
+        // too many long polls are waiting: the server asks to come back later
+        const retryAfter = Number(response.headers.get('Retry-After')) * 1000;
+        updateTimer = setTimeout(updatePlayerDashboard, retryAfter || delay, statusUrl);
         return updateTimer;
     }
     if (!response.ok) {
@@ -246,114 +423,96 @@ async function updatePlayerDashboard(statusUrl) {
         return -1;
     }
     const data = await response.json();
-    const newStatusSummary = data.summary;
-    if (newStatusSummary && newStatusSummary != lastGameStatusSummary) {
-        // change in status -> display update
-        const gameState = data.game_state;
-        const selfId = data.id;
-        const players = data.players;
-        const cards = data.cards;
-        const trump = data.trump;
-        const gameStatusElt = document.getElementById('game_status');
-        const playersElt = document.getElementById('players');
-        const cardsElt = document.getElementById('cards');
-        const statsElt = document.getElementById('stats');
-        const trumpElt = document.getElementById('trump');
-        const round = data.round;
-        const roundState = data.round && data.round.state;
-        const currentPlayerId = data.round && data.round.current_player;
-        clearElement(gameStatusElt);
-        if (gameState) {
-            gameStatusElt.insertAdjacentHTML('beforeend', gameState);
-        }
-        clearElement(cardsElt);
-        if (cards) {
-            cardsElt.insertAdjacentHTML('beforeend', cards);
-            if (roundState == ROUND_STATE_PLAYING || roundState == ROUND_STATE_BETWEEN_TRICKS) {
-                const secretId = extractPlayerSecret(statusUrl);
-                const playableCards = data.playable_cards || [];
-                for (let spanElt of cardsElt.getElementsByTagName('SPAN')) {
-                    spanElt.className = 'playing_card';
-                    if (playableCards.indexOf(spanElt.id) < 0) {
-                        spanElt.classList.add('unplayable_card');
-                        continue;
-                    }
-                    spanElt.classList.add('playable_card');
-                    spanElt.onclick = async function playCard(e) {
-                        e.preventDefault()
-                        const playError = document.getElementById('playError');
-                        clearElement(playError);
-                        playError.classList.remove('error');
-                        const playUrl = '/player/play/card/';
-                        let formData = new FormData();
-                        formData.append('secret_id', secretId);
-                        formData.append('card', spanElt.id.substr(1));
-                        let response;
-                        try {
-                            response = await fetch(playUrl, {
-                                method: 'POST',
-                                body: formData,
-                                mode: 'cors',
-                                cache: 'no-cache',
-                                credentials: 'same-origin',
-                                redirect: 'follow'});
-                        } catch (e) {
-                            playError.classList.add('error');
-                            playError.textContent = `${e} Please retry/veuillez réessayer`;
-                            return;
-                        }
-                        if (!response.ok) {
-                            playError.classList.add('error');
-                            playError.textContent = `${response.status}, ${response.statusText}`;
-                            return;
-                        }
-                        const data = await response.json();
-                        if (!data.ok) {
-                            playError.classList.add('error');
-                            playError.textContent = data.error;
-                        }
-                    };
-                };
+    lastStatusETag = response.headers.get('ETag');
+    lastGameVersion = data.version;
+    lastGameTurn = data.turn;
+    showPlayerStatus(data, statusUrl);
+    // schedule next request only now that lastStatusETag is up to date
+    updateTimer = setTimeout(updatePlayerDashboard, delay, statusUrl);
+    return updateTimer;
+}
+
+let playerSocket = null;
+let lastSocketActionId = 0;
+const pendingSocketActions = new Map();
+
+// Receive status updates pushed by the server (over a WebSocket or as
+// server-sent events), or poll for them in older browsers
+function followPlayerDashboard(eventsUrl, statusUrl, socketUrl) {
+    if (socketUrl && typeof WebSocket !== 'undefined') {
+        const socket = new WebSocket(prependHostName(socketUrl).replace(/^http/, 'ws'));
+        socket.onopen = function (_) {
+            playerSocket = socket;
+        };
+        socket.onmessage = function (e) {
+            const data = JSON.parse(e.data);
+            if (data.type === 'result') {
+                const resolve = pendingSocketActions.get(data.id);
+                pendingSocketActions.delete(data.id);
+                if (resolve) {
+                    resolve(data);
+                }
+            } else if (data.type === 'status') {
+                lastGameVersion = data.version;
+                lastGameTurn = data.turn;
+                showPlayerStatus(data, socketUrl);
             }
+        };
+        socket.onclose = function (_) {
+            playerSocket = null;
+            for (const resolve of pendingSocketActions.values()) {
+                resolve({ok: false, error: 'Connection lost.  Please retry/veuillez réessayer'});
+            }
+            pendingSocketActions.clear();
+            followPlayerDashboard(eventsUrl, statusUrl, null);
+        };
+        return;
+    }
+    if (!eventsUrl || typeof EventSource === 'undefined') {
+        updateTimer = setTimeout(updatePlayerDashboard, 0, statusUrl);
+        return;
+    }
+    const source = new EventSource(prependHostName(eventsUrl));
+    source.onmessage = function (e) {
+        const data = JSON.parse(e.data);
+        lastGameVersion = data.version;
+        lastGameTurn = data.turn;
+        showPlayerStatus(data, eventsUrl);
+    };
+    source.onerror = function (_) {
+        // EventSource reconnects by itself (sending Last-Event-ID)
+        // unless the server refused the stream: fall back to polling
+        if (source.readyState === EventSource.CLOSED) {
+            updateTimer = setTimeout(updatePlayerDashboard, 0, statusUrl);
         }
-        fillPlayerDashboardPlayerList(players, selfId, playersElt);
-        if (trump) {
-            trumpElt.innerHTML = trump;
-        } else {
-            clearElement(trumpElt);
-        }
-        const tableElt = document.getElementById('table');
-        clearElement(tableElt);
-        if (roundState == ROUND_STATE_PLAYING
-            || roundState == ROUND_STATE_BETWEEN_TRICKS
-            || roundState == ROUND_STATE_DONE) {
-            tableElt.insertAdjacentHTML('beforeend', data.table);
-        }
-        const bidElt = document.getElementById('bid');
-        if (roundState == ROUND_STATE_BIDDING && currentPlayerId == selfId) {
-            bidElt.onsubmit = submitBid;
-            bidElt.style.display = "inline";
-            const bidInput = document.getElementById('bidInput');
-            bidInput.value = undefined;
-            bidInput.max = document.getElementById('cards').childNodes.length;
-        } else {
-            bidElt.style.display = "none";
-        }
+    };
+}
+
+// Send a Player action over the WebSocket: return a Promise of the
+// {ok, error} result or null if there is no open WebSocket
+function socketAction(message) {
+    if (playerSocket === null || playerSocket.readyState !== WebSocket.OPEN) {
+        return null;
     }
-    lastGameStatusSummary = newStatusSummary;
-    return updateTimer;
+    const id = ++lastSocketActionId;
+    const turn = lastGameTurn === null ? {} : {turn: lastGameTurn};
+    return new Promise(resolve => {
+        pendingSocketActions.set(id, resolve);
+        playerSocket.send(JSON.stringify(Object.assign({id: id}, turn, message)));
+    });
 }
 
-async function submitFinishRound(secretId) {
-    const finishRoundError = document.getElementById('finishRoundError');
-    clearElement(finishRoundError);
-    finishRoundError.classList.remove('error');
-    const finishRoundUrl = '/player/finish/round/';
-    const formData = new FormData();
-    formData.append('secret_id', secretId);
+// POST a Player action: return a Promise of the {ok, error} result.
+// The action carries the Game turn the Player sees: if a move was
+// made since, the server answers {ok: false, stale: true} and the
+// next status update redraws the dashboard.
+async function postPlayerAction(url, formData) {
+    if (lastGameTurn !== null) {
+        formData.append('turn', lastGameTurn);
+    }
     let response;
     try {
-        response = await fetch(finishRoundUrl, {
+        response = await fetch(url, {
             method: 'POST',
             body: formData,
             mode: 'cors',
@@ -361,17 +520,24 @@ async function submitFinishRound(secretId) {
             credentials: 'same-origin',
             redirect: 'follow'});
     } catch (e) {
-        finishRoundError.classList.add('error');
-        finishRoundError.textContent = `${e} Please retry/veuillez réessayer`;
-        return false;
+        return {ok: false, error: `${e} Please retry/veuillez réessayer`};
     }
-    if (!response.ok) {
-        finishRoundError.classList.add('error');
-        finishRoundError.textContent = `${response.status}, ${response.statusText}`;
-        return false;
+    if (!response.ok && response.status != 409) {
+        return {ok: false, error: `${response.status}, ${response.statusText}`};
     }
-    const data = await response.json();
-    if (data.ok) {
+    return await response.json();
+}
+
+async function submitFinishRound(secretId) {
+    const finishRoundError = document.getElementById('finishRoundError');
+    clearElement(finishRoundError);
+    finishRoundError.classList.remove('error');
+    const finishRoundUrl = playerActionUrl(document.location.pathname, 'finish/round/');
+    const formData = new FormData();
+    formData.append('secret_id', secretId);
+    const data = await (socketAction({action: 'finish'})
+                        || postPlayerAction(finishRoundUrl, formData));
+    if (data.ok || data.stale) {
         document.getElementById('finishRound').style.display = 'none';
     } else {
         finishRoundError.classList.add('error');
@@ -386,30 +552,13 @@ async function submitBid(e) {
     const bidError = document.getElementById('bidError');
     clearElement(bidError);
     bidError.classList.remove('error');
-    const bidUrl = '/player/place/bid/';
-    let response;
-    try {
-        response = await fetch(bidUrl, {
-            method: 'POST',
-            body: new FormData(bidElt),
-            mode: 'cors',
-            cache: 'no-cache',
-            credentials: 'same-origin',
-            redirect: 'follow'});
-    } catch (e) {
-        bidError.classList.add('error');
-        bidError.textContent = `${e} Please retry/veuillez réessayer`;
-        return false;
-    }        
-    if (!response.ok) {
-        bidError.classList.add('error');
-        bidError.textContent = `${response.status}, ${response.statusText}`;
-        return false;
-    }
-    const data = await response.json();
+    const bidUrl = playerActionUrl(document.location.pathname, 'place/bid/');
+    const formData = new FormData(bidElt);
+    const data = await (socketAction({action: 'bid', bid: Number(formData.get('bidInput'))})
+                        || postPlayerAction(bidUrl, formData));
     if (data.ok) {
         bidElt.style.display = 'none';
-    } else {
+    } else if (!data.stale) {
         bidError.classList.add('error');
         bidError.textContent = data.error;
     }
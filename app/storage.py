@@ -0,0 +1,374 @@
+"""Keep a record of Games, their Players and the results of their Rounds.
+
+A Storage watches Games (see Game.add_event_listener) and records the
+Players' names and the bids and tricks of each finished Round, for the
+organizer's history.  MemoryStorage keeps them in memory, like the
+Games themselves.  SQLiteStorage writes them to a SQLite database.
+
+Recording never waits for the disk: SQLiteStorage queues the writes
+for a writer thread, which commits all the writes queued in the
+meantime in one transaction (a failing write only loses itself, not
+the rest of its batch).  Reads use a pool of connections that
+the writer never blocks (the database is in WAL mode).
+"""
+import abc
+import contextlib
+import queue
+import sqlite3
+import threading
+import time
+from typing import (Any, Callable, Dict, Iterator, List, NamedTuple,
+                    Optional, Tuple, Union)
+
+from .bots import BotPlayer
+from .models import Game
+
+
+class PlayerRecord(NamedTuple):
+    """A Player of a Game."""
+
+    id: str
+    name: str
+    bot: bool
+
+
+class PlayerResult(NamedTuple):
+    """Bid and tricks of one Player in a Round."""
+
+    player: str
+    """Player.id"""
+    bid: int
+    tricks: int
+
+
+class RoundResult(NamedTuple):
+    """Outcome of a finished Round."""
+
+    round: int
+    """Number of the Round in the Game, starting from 0."""
+    cards: int
+    """Cards dealt to each Player."""
+    trump: Optional[int]
+    results: Tuple[PlayerResult, ...]
+    """In the Round's playing order."""
+
+
+class Storage(abc.ABC):
+    """Record Games, see module documentation."""
+
+    def watch(self, game: Game) -> None:
+        """Record the Game and its Players, then follow its events."""
+        self._save_game(game.id, [
+            PlayerRecord(p.id, p.name, isinstance(p, BotPlayer))
+            for p in game.players])
+        game.add_event_listener(self._game_event)
+
+    def _game_event(self, game: Game, event: str, data: Dict[str, Any]):
+        if event == 'player_confirmed':
+            self._save_player(game.id, data['player'], data['name'])
+        elif event == 'round_finished':
+            round_ = game.round
+            self._save_round(
+                game.id, game.current_card_count,
+                None if round_.trump is None else int(round_.trump),
+                tuple(PlayerResult(p.id, p.bid or 0, p.tricks)
+                      for p in round_.players))
+
+    @abc.abstractmethod
+    def _save_game(self, game_id: str, players: List[PlayerRecord]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def _save_player(self, game_id: str, player_id: str, name: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def _save_round(
+            self,
+            game_id: str,
+            cards: int,
+            trump: Optional[int],
+            results: Tuple[PlayerResult, ...]
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def players(self, game_id: str) -> List[PlayerRecord]:
+        """Return the Players of a Game in the order they were invited."""
+
+    @abc.abstractmethod
+    def round_results(self, game_id: str) -> List[RoundResult]:
+        """Return the results of the finished Rounds of a Game."""
+
+    def flush(self) -> None:
+        """Wait until what was recorded so far can be read."""
+
+    def close(self) -> None:
+        """Release the resources of the Storage."""
+
+
+class MemoryStorage(Storage):
+    """Keep the records in memory."""
+
+    def __init__(self):
+        """Create an empty Storage."""
+        self._lock = threading.Lock()
+        self._players: Dict[str, List[PlayerRecord]] = {}
+        """Map Game.id to its Players."""
+        self._rounds: Dict[str, List[RoundResult]] = {}
+        """Map Game.id to its finished Rounds."""
+
+    def _save_game(self, game_id: str, players: List[PlayerRecord]) -> None:
+        with self._lock:
+            self._players[game_id] = players
+            self._rounds.setdefault(game_id, [])
+
+    def _save_player(self, game_id: str, player_id: str, name: str) -> None:
+        with self._lock:
+            self._players[game_id] = [
+                p._replace(name=name) if p.id == player_id else p
+                for p in self._players[game_id]]
+
+    def _save_round(
+            self,
+            game_id: str,
+            cards: int,
+            trump: Optional[int],
+            results: Tuple[PlayerResult, ...]
+    ) -> None:
+        with self._lock:
+            rounds = self._rounds[game_id]
+            rounds.append(RoundResult(len(rounds), cards, trump, results))
+
+    def players(self, game_id: str) -> List[PlayerRecord]:
+        """Return the Players of a Game in the order they were invited."""
+        with self._lock:
+            return list(self._players.get(game_id, []))
+
+    def round_results(self, game_id: str) -> List[RoundResult]:
+        """Return the results of the finished Rounds of a Game."""
+        with self._lock:
+            return list(self._rounds.get(game_id, []))
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id TEXT NOT NULL REFERENCES games (id),
+    id TEXT NOT NULL,
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    bot INTEGER NOT NULL,
+    PRIMARY KEY (game_id, id)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id TEXT NOT NULL REFERENCES games (id),
+    round INTEGER NOT NULL,
+    cards INTEGER NOT NULL,
+    trump INTEGER,
+    PRIMARY KEY (game_id, round)
+);
+CREATE TABLE IF NOT EXISTS results (
+    game_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    bid INTEGER NOT NULL,
+    tricks INTEGER NOT NULL,
+    PRIMARY KEY (game_id, round, position),
+    FOREIGN KEY (game_id, round) REFERENCES rounds (game_id, round)
+);
+"""
+
+_Write = Callable[[sqlite3.Connection], None]
+_Task = Union[None, _Write, threading.Event]
+"""Write, Event to set once committed or None to stop the writer."""
+
+
+class SQLiteStorage(Storage):
+    """Keep the records in a SQLite database."""
+
+    MAX_BATCH = 1000
+    """Most writes committed in one transaction."""
+
+    def __init__(self, path: str, readers: int = 4):
+        """Open (or create) the database, with up to `readers' connections.
+
+        Writes are not durable before the next checkpoint of the
+        write-ahead log: a crash of the machine (not of the process)
+        may lose the last ones.
+        """
+        self.path = path
+        self.error: Optional[sqlite3.Error] = None
+        """Why the last failed write failed, if one did."""
+        writer = self._connect()
+        writer.execute('PRAGMA journal_mode = WAL')
+        writer.execute('PRAGMA synchronous = NORMAL')
+        writer.executescript(SCHEMA)
+        self._readers: 'queue.LifoQueue[sqlite3.Connection]' = \
+            queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(readers)
+        """Limit the number of read connections."""
+        self._tasks: 'queue.Queue[_Task]' = queue.Queue()
+        """Work for the writer thread."""
+        self._writer = threading.Thread(
+            target=self._write_loop, args=(writer,),
+            name='rikiki-sqlite', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None)
+        connection.execute('PRAGMA busy_timeout = 5000')
+        return connection
+
+    def _write_loop(self, connection: sqlite3.Connection) -> None:
+        while True:
+            batch = [self._tasks.get()]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._tasks.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                connection.execute('BEGIN')
+                for task in batch:
+                    if task is not None \
+                            and not isinstance(task, threading.Event):
+                        self._write(connection, task)
+                connection.execute('COMMIT')
+            except sqlite3.Error as e:
+                self.error = e
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+            for task in batch:
+                if isinstance(task, threading.Event):
+                    task.set()
+            if None in batch:
+                connection.close()
+                return
+
+    def _write(self, connection: sqlite3.Connection, write: _Write) -> None:
+        # Undo a failing write, keeping the others of the transaction
+        connection.execute('SAVEPOINT write')
+        try:
+            write(connection)
+        except sqlite3.Error as e:
+            self.error = e
+            connection.execute('ROLLBACK TO write')
+        connection.execute('RELEASE write')
+
+    @contextlib.contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        with self._reader_slots:
+            try:
+                connection = self._readers.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            try:
+                yield connection
+            finally:
+                self._readers.put(connection)
+
+    def _save_game(self, game_id: str, players: List[PlayerRecord]) -> None:
+        created = time.time()
+
+        def write(connection):
+            connection.execute(
+                'INSERT OR IGNORE INTO games (id, created) VALUES (?, ?)',
+                (game_id, created))
+            connection.executemany(
+                'INSERT OR REPLACE INTO players (game_id, id, seat, name, bot)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                [(game_id, p.id, seat, p.name, p.bot)
+                 for (seat, p) in enumerate(players)])
+        self._tasks.put(write)
+
+    def _save_player(self, game_id: str, player_id: str, name: str) -> None:
+        def write(connection):
+            connection.execute(
+                'UPDATE players SET name = ? WHERE game_id = ? AND id = ?',
+                (name, game_id, player_id))
+        self._tasks.put(write)
+
+    def _save_round(
+            self,
+            game_id: str,
+            cards: int,
+            trump: Optional[int],
+            results: Tuple[PlayerResult, ...]
+    ) -> None:
+        def write(connection):
+            (round_number,) = connection.execute(
+                'SELECT COALESCE(MAX(round) + 1, 0) FROM rounds'
+                ' WHERE game_id = ?',
+                (game_id,)).fetchone()
+            connection.execute(
+                'INSERT INTO rounds (game_id, round, cards, trump)'
+                ' VALUES (?, ?, ?, ?)',
+                (game_id, round_number, cards, trump))
+            connection.executemany(
+                'INSERT INTO results'
+                ' (game_id, round, position, player_id, bid, tricks)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                [(game_id, round_number, position) + tuple(result)
+                 for (position, result) in enumerate(results)])
+        self._tasks.put(write)
+
+    def players(self, game_id: str) -> List[PlayerRecord]:
+        """Return the Players of a Game in the order they were invited."""
+        with self._reader() as connection:
+            return [PlayerRecord(player_id, name, bool(bot))
+                    for (player_id, name, bot) in connection.execute(
+                            'SELECT id, name, bot FROM players'
+                            ' WHERE game_id = ? ORDER BY seat',
+                            (game_id,))]
+
+    def round_results(self, game_id: str) -> List[RoundResult]:
+        """Return the results of the finished Rounds of a Game."""
+        with self._reader() as connection:
+            # one read transaction for a consistent view of both tables
+            connection.execute('BEGIN')
+            try:
+                rounds = connection.execute(
+                    'SELECT round, cards, trump FROM rounds'
+                    ' WHERE game_id = ? ORDER BY round',
+                    (game_id,)).fetchall()
+                results: Dict[int, List[PlayerResult]] = {}
+                for (round_number, player_id, bid, tricks) \
+                        in connection.execute(
+                            'SELECT round, player_id, bid, tricks'
+                            ' FROM results WHERE game_id = ?'
+                            ' ORDER BY round, position',
+                            (game_id,)):
+                    results.setdefault(round_number, []).append(
+                        PlayerResult(player_id, bid, tricks))
+            finally:
+                connection.execute('COMMIT')
+        return [RoundResult(round_number, cards, trump,
+                            tuple(results.get(round_number, [])))
+                for (round_number, cards, trump) in rounds]
+
+    def flush(self) -> None:
+        """Wait until the writes queued so far are committed."""
+        done = threading.Event()
+        self._tasks.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Commit the queued writes and close the database."""
+        self._tasks.put(None)
+        self._writer.join()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def open_storage(database: Optional[str]) -> Storage:
+    """Return SQLiteStorage for database, MemoryStorage if it is None."""
+    return MemoryStorage() if database is None else SQLiteStorage(database)
@@ -23,6 +23,8 @@ stdenv.mkDerivation rec {
         # Add pythonPackages without the prefix
         flask
         flask-babel
+        numpy
+        waitress
       ] ++ (if lib.inNixShell
             then [
                     autopep8
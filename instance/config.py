@@ -19,6 +19,56 @@ class Config(object):
     BABEL_DEFAULT_TIMEZONE = 'UTC'
     SESSION_COOKIE_SAMESITE = 'Strict'
     SESSION_COOKIE_HTTPONLY = True
+    # Longest time (seconds) a status request may wait for a change,
+    # how many such long polls may wait at once (each holds a server
+    # thread) and after how many seconds the others poll again.  Each
+    # Player's page keeps one long poll waiting: the default serves
+    # 200 tables of 4 Players
+    LONG_POLL_TIMEOUT = 25
+    LONG_POLL_WAITERS = 800
+    LONG_POLL_RETRY = 2
+    # Set by app.asgi when it serves the Players' WebSockets, and the
+    # threads running the actions received on them
+    WEBSOCKETS = False
+    WEBSOCKET_ACTION_WORKERS = 8
+    # Offer server-sent events (player.api_events) instead of long
+    # polls.  Each event stream holds a server thread as long as the
+    # Player's page is open: only enable with few Players per thread
+    SERVER_SENT_EVENTS = False
+    # Threads deciding the moves of bots and how long (seconds) a bot
+    # may think before making a random move
+    BOT_WORKERS = 4
+    BOT_TIME_BUDGET = 2.0
+    # Show expected tricks while bidding, estimated by BID_ADVISOR_WORKERS
+    # processes (0 for none) and at most BID_ADVISOR_BUDGET seconds of
+    # each request for player.api_bid_hint.  Off by default: each
+    # bidding Player's page asks for the hint until it is refined
+    BID_HINTS = False
+    BID_ADVISOR_WORKERS = 2
+    BID_ADVISOR_BUDGET = 0.05
+    # File journaling all Games to restore them after a restart (None
+    # to keep Games only in memory)
+    JOURNAL = os.environ.get('RIKIKI_JOURNAL')
+    # Snapshot the Games and truncate the journal every that many events
+    JOURNAL_SNAPSHOT_EVERY = 1000
+    # SQLite database recording the players and round results of all
+    # Games (None to keep them in memory)
+    DATABASE = os.environ.get('RIKIKI_DATABASE')
+    # File where the Games and secrets are handed over to the next
+    # process on SIGTERM, and how long (seconds) the next process
+    # waits for it at startup
+    HANDOFF = os.environ.get('RIKIKI_HANDOFF')
+    HANDOFF_WAIT = float(os.environ.get('RIKIKI_HANDOFF_WAIT', '0'))
+    # Defaults of `python -m app.serve': worker threads, open
+    # connections, connections waiting to be accepted and seconds
+    # before closing idle connections.  Waiting long polls may take
+    # LONG_POLL_WAITERS threads, the others serve the remaining
+    # requests (actions, pages): raise both together.  `--threads'
+    # scales LONG_POLL_WAITERS in the same proportion
+    SERVE_THREADS = LONG_POLL_WAITERS + 64
+    SERVE_CONNECTION_LIMIT = 2 * LONG_POLL_WAITERS
+    SERVE_BACKLOG = 1024
+    SERVE_KEEP_ALIVE = 120
 
 
 class DevelopmentConfig(Config):
@@ -35,6 +85,11 @@ class TestingConfig(Config):
     DEBUG = True
     SECRET_KEY = b"development-secret"
     BABEL_DEFAULT_LOCALE = 'en'
+    BID_ADVISOR_WORKERS = 0
+    BID_ADVISOR_BUDGET = 0.005
+    JOURNAL = None
+    DATABASE = None
+    HANDOFF = None
 
 
 class StagingConfig(Config):
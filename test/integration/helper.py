@@ -57,6 +57,20 @@ def extract_player_dict(driver):
     return result
 
 
+def organizer_secret_from_url(url):
+    """Extract organizer secret from an organizer page URL.
+
+    The organizer secret printed on the console only sets up Games:
+    each Game gets its own organizer secret.
+    """
+    return url.split('/organizer/')[1].split('/')[0]
+
+
+def game_id_from_url(url):
+    """Extract Game.id from a Player URL."""
+    return url.split('/player/')[1].split('/')[0]
+
+
 def submit_form(driver):
     """Find and click the submit button."""
     submit = driver.find_element_by_xpath("//input[@type='submit']")
@@ -197,7 +211,9 @@ def start_a_game(driver, organizer_secret):
     # Check that we are in the right state:
     # 1. On the right page
     assert driver.current_url.endswith(
-        url_for('organizer.dashboard', organizer_secret=organizer_secret))
+        url_for('organizer.dashboard',
+                organizer_secret=organizer_secret_from_url(
+                    driver.current_url)))
     for player, player_info in player_dict.items():
         # player = unconfirmed name
         # player_info = (player.id, player url)
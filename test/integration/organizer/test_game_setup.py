@@ -14,6 +14,7 @@ from ..helper import ff_driver as driver
 from ..helper import (
     INITIAL_PLAYER_NAMES,
     extract_player_dict,
+    organizer_secret_from_url,
     element_has_css_class,
     organizer_secret,
     start_a_game,
@@ -40,9 +41,11 @@ def define_players(driver, organizer_secret):
     # fill in player list
     playerlist.send_keys('\n'.join(INITIAL_PLAYER_NAMES))
     submit_form(driver)
-    # submission takes us to waiting page ...
-    assert driver.current_url.endswith(url_for('organizer.wait_for_users',
-                                               organizer_secret=organizer_secret))
+    # submission takes us to waiting page of the new Game ...
+    game_organizer_secret = organizer_secret_from_url(driver.current_url)
+    assert game_organizer_secret != organizer_secret
+    assert driver.current_url.endswith(url_for(
+        'organizer.wait_for_users', organizer_secret=game_organizer_secret))
     # ... without errors ...
     with pytest.raises(NoSuchElementException):
         driver.find_element_by_class_name("error")
@@ -114,7 +117,7 @@ def define_players(driver, organizer_secret):
                 assert player_link == player_dict[p][1]
     submit_form(driver)
     assert driver.current_url.endswith(
-        url_for('organizer.dashboard', organizer_secret=organizer_secret))
+        url_for('organizer.dashboard', organizer_secret=game_organizer_secret))
 
 
 def dashboard(driver, organizer_secret):
@@ -15,6 +15,7 @@ from ..helper import (
     element_has_css_class,
     organizer_secret,
     create_a_game,
+    game_id_from_url,
     start_a_game,
     submit_form,
     temporary_new_tab,
@@ -22,13 +23,15 @@ from ..helper import (
 )
 
 
-def restore_player(driver):
+def restore_player(driver, player_url):
     """Navigate to & confirm player's restore link, return new Player URL.
 
     The Player to operate on is implicit in the cookies set in the
-    driver.
+    driver, player_url only tells which Game she is playing.
     """
-    driver.get(url_for('player.restore_link', _external=True))
+    driver.get(url_for('player.restore_link',
+                       game_id=game_id_from_url(player_url),
+                       _external=True))
     # make sure we are not on an error page
     driver.find_element_by_id('submit_restore')
     submit_form(driver)
@@ -37,6 +40,7 @@ def restore_player(driver):
 
 def while_others_confirm(driver, organizer_secret):
     player_dict = create_a_game(driver, organizer_secret)
+    organizer_url = driver.current_url
     player_unconfirmed_names = list(player_dict.keys())
     (player_unconfirmed_name, (player_id, player_confirmation_url)) = next(
         iter(player_dict.items()))
@@ -45,7 +49,7 @@ def while_others_confirm(driver, organizer_secret):
     old_player_url = driver.current_url
     with temporary_session(driver, session=KEEP_EXISTING_SESSION) as \
             first_player_session_info:
-        first_player_url = restore_player(driver)
+        first_player_url = restore_player(driver, old_player_url)
     assert first_player_url != old_player_url
     nav_title = driver.find_element_by_tag_name('nav').text
     assert player_unconfirmed_name in nav_title
@@ -56,9 +60,7 @@ def while_others_confirm(driver, organizer_secret):
                            url=second_player_confirmation_url) as second_player_session_info:
         submit_form(driver)
         second_player_url = driver.current_url
-    driver.get(url_for('organizer.wait_for_users',
-                       _external=True,
-                       organizer_secret=organizer_secret))
+    driver.get(organizer_url)
     # organizer dashboard is updated
     WebDriverWait(driver, 5).until(EC.presence_of_element_located(
         (By.XPATH, f"//span[text()='{first_player_url}']")))
@@ -68,7 +70,8 @@ def while_others_confirm(driver, organizer_secret):
     with temporary_session(driver,
                            session=second_player_session_info['after']):
         with temporary_new_tab(driver):
-            new_second_player_url = restore_player(driver)
+            new_second_player_url = restore_player(
+                driver, second_player_url)
     # organizer dashboard is updated:
     WebDriverWait(driver, 5).until(EC.presence_of_element_located(
         (By.XPATH, f"//span[text()='{new_second_player_url}']")))
@@ -76,7 +79,7 @@ def while_others_confirm(driver, organizer_secret):
     with temporary_session(driver,
                            session=first_player_session_info['after']):
         with temporary_new_tab(driver):
-            new_first_player_url = restore_player(driver)
+            new_first_player_url = restore_player(driver, old_player_url)
     # organizer dashboard is updated
     WebDriverWait(driver, 5).until(EC.presence_of_element_located(
         (By.XPATH, f"//span[text()='{new_first_player_url}']")))
@@ -85,9 +88,10 @@ def while_others_confirm(driver, organizer_secret):
 def while_bidding(driver, organizer_secret):
     players = start_a_game(driver, organizer_secret)
     organizer_url = driver.current_url
+    any_player_url = next(iter(players.values()))[1]
     with temporary_new_tab(driver):
         # new URL for last player to confirm:
-        new_player_url = restore_player(driver)
+        new_player_url = restore_player(driver, any_player_url)
     url_span = WebDriverWait(driver, 5).until(EC.presence_of_element_located(
         (By.XPATH, f"//span[text()='{new_player_url}']")))
     player_id = url_span.get_property('parentNode').get_attribute('id')
@@ -102,7 +106,7 @@ def while_bidding(driver, organizer_secret):
             break
     # restoring player's link ...
     with temporary_new_tab(driver):
-        newer_player_url = restore_player(driver)
+        newer_player_url = restore_player(driver, new_player_url)
     # ... will invalidate his current dashboard ...
     assert 'forbidden' in WebDriverWait(driver, 5).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, ".error"))
@@ -0,0 +1,79 @@
+import time
+
+import pytest  # type: ignore
+
+from app.advisor import BidAdvisor, play_out, sample_tricks
+from app.models import Card, card_mask
+
+
+def test_play_out__trumps_win():
+    hands = [card_mask([Card.Spade2, Card.SpadeAce]),
+             card_mask([Card.Heart2, Card.Heart3]),
+             card_mask([Card.Spade3, Card.Club4])]
+    # Heart2 trumps the Ace of Spades, then Heart3 wins the trick it leads
+    assert play_out(hands, Card.Heart9, 1) == 2
+    assert play_out(hands, Card.Heart9, 0) == 0
+    # without trump, nobody else can follow spades
+    assert play_out(hands, None, 0) == 2
+
+
+def test_sample_tricks__sure_winner():
+    hand = card_mask([Card.HeartAce])
+    assert sample_tricks(hand, Card.Heart2, 1, 4, 20) == 20
+
+
+def test_sample_tricks__seeded():
+    hand = card_mask([Card.SpadeAce, Card.Club3, Card.Diamond9])
+    results = [sample_tricks(hand, Card.Club10, 2, 5, 30, seed=7)
+               for _ in range(2)]
+    assert results[0] == results[1]
+    assert 0 <= results[0] <= 3 * 30
+
+
+def test_BidAdvisor__without_pool__memoizes():
+    advisor = BidAdvisor(max_workers=0, time_budget=10, samples=40)
+    hand = card_mask([Card.SpadeAce, Card.HeartKing])
+    tricks = advisor.expected_tricks(hand, Card.Heart3, 0, 3)
+    assert 0 <= tricks <= 2
+    start = time.monotonic()
+    assert advisor.expected_tricks(hand, Card.Heart3, 0, 3) == tricks
+    assert time.monotonic() - start < 0.01
+
+
+def test_BidAdvisor__respects_time_budget():
+    advisor = BidAdvisor(max_workers=0, time_budget=0.01, samples=10**6)
+    hand = card_mask(list(Card)[::4])
+    start = time.monotonic()
+    advisor.expected_tricks(hand, None, 0, 4)
+    assert time.monotonic() - start < 0.1
+
+
+def test_BidAdvisor__pool_refines_estimate():
+    advisor = BidAdvisor(max_workers=1, time_budget=0, samples=100)
+    hand = card_mask([Card.HeartAce])
+    try:
+        assert advisor.expected_tricks(hand, Card.Heart2, 0, 3) is None
+        deadline = time.monotonic() + 30
+        while advisor.expected_tricks(hand, Card.Heart2, 0, 3) is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert advisor.expected_tricks(hand, Card.Heart2, 0, 3) == 1
+    finally:
+        advisor.shutdown()
+
+
+def test_BidAdvisor__is_refining_until_pool_is_done():
+    advisor = BidAdvisor(max_workers=1, time_budget=0, samples=100)
+    hand = card_mask([Card.HeartAce])
+    query = (hand, Card.Heart2, 0, 3)
+    try:
+        assert not advisor.is_refining(*query)
+        assert advisor.expected_tricks(*query) is None
+        assert advisor.is_refining(*query)
+        deadline = time.monotonic() + 30
+        while advisor.is_refining(*query) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not advisor.is_refining(*query)
+        assert advisor.expected_tricks(*query) == 1
+    finally:
+        advisor.shutdown()
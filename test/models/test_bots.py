@@ -0,0 +1,90 @@
+import time
+
+import pytest  # type: ignore
+
+from app.bots import (BotDriver, BotPlayer, GreedyBot, POLICIES, RandomBot,
+                      bot_to_move)
+from app.models import Game, Player, Round
+
+
+def wait_until(game, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        remaining = deadline - time.monotonic()
+        assert remaining > 0, "Timed out"
+        game.wait_for_change(game.version, min(remaining, 0.1))
+
+
+def human(name):
+    player = Player(name, f"{name} secret")
+    player.confirm('')
+    return player
+
+
+@pytest.fixture
+def driver():
+    driver = BotDriver(max_workers=2, time_budget=1)
+    yield driver
+    driver.shutdown()
+
+
+def test_BotPlayer__is_confirmed():
+    bot = BotPlayer("Robot", 'random')
+    assert bot.is_confirmed
+    assert bot.name == "Robot"
+    assert isinstance(bot.policy, RandomBot)
+
+
+def test_BotPlayer__unknown_policy__raises():
+    with pytest.raises(KeyError):
+        BotPlayer("Robot", 'clairvoyant')
+
+
+def test_bot_to_move():
+    (bot, alice) = (BotPlayer("Bot"), human("Alice"))
+    game = Game([alice, bot])
+    assert bot_to_move(game) is None
+    game.start_game()
+    assert bot_to_move(game) is None
+    alice.place_bid(0)
+    assert bot_to_move(game) is bot
+
+
+@pytest.mark.parametrize("policy", sorted(POLICIES))
+def test_BotDriver__bots_move_until_human_turn(driver, policy):
+    (alice, bob) = (human("Alice"), human("Bob"))
+    bots = [BotPlayer(f"Bot {i}", policy) for i in range(2)]
+    game = Game([alice, *bots, bob])
+    driver.watch(game)
+    game.start_game()
+    alice.place_bid(1)
+    wait_until(game, lambda: game.round.current_player is bob)
+    assert all(bot.has_bid for bot in bots)
+    bob.place_bid(0)
+    while game.state == Game.State.PLAYING:
+        wait_until(game, lambda: (
+            game.state != Game.State.PLAYING
+            or game.round.current_player in (alice, bob)))
+        if game.state == Game.State.PLAYING:
+            current_player = game.round.current_player
+            current_player.play_card(current_player.playable_cards[0])
+    assert game.state == Game.State.PAUSED_BETWEEN_ROUNDS
+    assert game.round.state == Round.State.DONE
+    assert sum(p.tricks for p in game.players) == game.current_card_count
+
+
+def test_BotDriver__slow_bot__makes_random_move(driver):
+    class SlowBot(GreedyBot):
+        def bid(self, player, round_):
+            time.sleep(0.5)
+            return super().bid(player, round_)
+
+    driver.time_budget = 0.01
+    (alice, bot) = (human("Alice"), BotPlayer("Bot"))
+    bot.policy = SlowBot()
+    game = Game([bot, alice])
+    driver.watch(game)
+    start = time.monotonic()
+    game.start_game()
+    wait_until(game, lambda: bot.has_bid)
+    assert time.monotonic() - start < 0.4
@@ -0,0 +1,70 @@
+import gc
+
+from app.cache import SnapshotHistory, VersionCache
+
+from .helpers import *
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(value)
+        return value
+    return (calls, compute)
+
+
+def test_VersionCache__memoizes_per_version_and_key(new_game_waiting_room):
+    game = new_game_waiting_room
+    cache = VersionCache()
+    (calls, compute) = counting('a')
+    assert cache.get(game, game.version, 'k', compute) == 'a'
+    assert cache.get(game, game.version, 'k', compute) == 'a'
+    assert calls == ['a']
+    (other_calls, other_compute) = counting('b')
+    assert cache.get(game, game.version, 'other', other_compute) == 'b'
+    assert other_calls == ['b']
+
+
+def test_VersionCache__evicts_when_version_moves(new_game_waiting_room):
+    game = new_game_waiting_room
+    cache = VersionCache()
+    cache.get(game, game.version, 'k', lambda: 'old')
+    game.players[0].confirm('')
+    (calls, compute) = counting('new')
+    assert cache.get(game, game.version, 'k', compute) == 'new'
+    assert cache.get(game, game.version, 'k', compute) == 'new'
+    assert calls == ['new']
+
+
+def test_VersionCache__does_not_memoize_outdated_versions(
+        new_game_waiting_room):
+    game = new_game_waiting_room
+    cache = VersionCache()
+    old_version = game.version
+    game.players[0].confirm('')
+    (calls, compute) = counting('x')
+    cache.get(game, old_version, 'k', compute)
+    cache.get(game, old_version, 'k', compute)
+    assert calls == ['x', 'x']
+
+
+def test_VersionCache__does_not_keep_games_alive():
+    cache = VersionCache()
+    game = Game([Player(f'P{i}', f'S{i}') for i in range(3)])
+    cache.get(game, game.version, 'k', lambda: 'value')
+    assert len(cache) == 1
+    del game
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_SnapshotHistory__keeps_last_versions(new_game_waiting_room):
+    game = new_game_waiting_room
+    history = SnapshotHistory(depth=2)
+    for version in range(3):
+        history.record(game, 'k', version, f'v{version}')
+    assert history.get(game, 'k', 0) is None
+    assert history.get(game, 'k', 1) == 'v1'
+    assert history.get(game, 'k', 2) == 'v2'
+    assert history.get(game, 'other', 2) is None
@@ -1,6 +1,8 @@
 import pytest  # type: ignore
 
-from app.models import (Card, beats, card_allowed, same_suit)
+from app.models import (Card, MAX_CARDS, SUIT_MASKS, beats, card_allowed,
+                        card_count, card_mask, mask_cards, playable_mask,
+                        same_suit, trick_winner)
 
 
 def test_same_suit__examples():
@@ -115,6 +117,23 @@ def test_beats__trump__examples():
                  first_card_in_trick=Card.Club6, trump=Card.DiamondJack)
 
 
+def test_trick_winner__examples():
+    assert trick_winner([Card.Club6, Card.Heart6, Card.Club2]) == 0
+    assert trick_winner([Card.Club6, Card.Heart6, Card.ClubAce]) == 2
+    assert trick_winner([Card.Club6, Card.Heart6, Card.ClubAce],
+                        trump=Card.Heart2) == 1
+    assert trick_winner([Card.Diamond3], trump=Card.Spade4) == 0
+
+
+def test_trick_winner__agrees_with_beats():
+    for first_card in [Card.Heart4, Card.Club10]:
+        for trump in [None, Card.Heart2, Card.SpadeAce]:
+            trick = [first_card, Card.HeartJack, Card.Club2, Card.Spade5]
+            winner = trick[trick_winner(trick, trump)]
+            assert all(beats(winner, card, first_card, trump)
+                       for card in trick if card != winner)
+
+
 def test_card_allowed__examples():
     # Anything is allowed as first card on the table
     assert card_allowed(Card.Heart2,
@@ -134,3 +153,29 @@ def test_card_allowed__examples():
     for card in hand:
         assert card_allowed(
             card, hand=hand, table=[Card.HeartQueen])
+
+
+def test_card_mask__round_trip():
+    cards = [Card.HeartAce, Card.Spade2, Card.Diamond10]
+    mask = card_mask(cards)
+    assert card_count(mask) == len(cards)
+    assert mask_cards(mask) == sorted(cards)
+    assert mask_cards(card_mask(range(MAX_CARDS))) == list(Card)
+    # invalid cards are never part of a set
+    assert card_mask([-1, MAX_CARDS, 101]) == 0
+
+
+def test_SUIT_MASKS__partition_the_deck():
+    assert sum(SUIT_MASKS) == card_mask(range(MAX_CARDS))
+    for card in Card:
+        (suit_mask,) = [m for m in SUIT_MASKS if m & card_mask([card])]
+        assert mask_cards(suit_mask) == [
+            c for c in Card if same_suit(c, card)]
+
+
+def test_playable_mask__agrees_with_card_allowed():
+    hand = [Card.Heart2, Card.Heart9, Card.Diamond7, Card.SpadeAce]
+    for first_card in [None, Card.HeartQueen, Card.Diamond8, Card.Club3]:
+        table = [] if first_card is None else [first_card]
+        assert mask_cards(playable_mask(card_mask(hand), first_card)) == [
+            c for c in sorted(hand) if card_allowed(c, hand=hand, table=table)]
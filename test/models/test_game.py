@@ -1,3 +1,4 @@
+import threading
 import unittest.mock as mock
 
 import pytest                   # type: ignore
@@ -106,7 +107,7 @@ def test_Game__start_next_round__reduces_card_count(new_game_with_confirmed_play
     initial_card_count = new_game_with_confirmed_players.current_card_count
     # reset all players hands, so that they can join a new round
     for p in confirmed_players:
-        p._cards = []
+        p._hand = 0
     new_game_with_confirmed_players.round_finished()
     new_game_with_confirmed_players.start_next_round()
     assert all(p.card_count == (initial_card_count - 1)
@@ -120,7 +121,7 @@ def test_Game__start_next_round__rotates_confirmed_players(new_game_with_confirm
     first_round = game.start_game()
     # reset all players hands, so that they can join a new round
     for p in game.confirmed_players:
-        p._cards = []
+        p._hand = 0
     game.round_finished()
     old_confirmed_players = [p for p in game.confirmed_players]
     game.start_next_round()
@@ -148,6 +149,47 @@ def test_Game__player_by_secret_id__returns_player(new_game_with_confirmed_playe
             'this public ID does not exist')
 
 
+def test_Game__player_by_secret_id__follows_confirm(new_game_waiting_room):
+    game = new_game_waiting_room
+    player = game.players[1]
+    unconfirmed_secret_id = player.secret_id
+    player.confirm('')
+    assert player.secret_id != unconfirmed_secret_id
+    assert game.player_by_secret_id(player.secret_id) is player
+    with pytest.raises(StopIteration):
+        game.player_by_secret_id(unconfirmed_secret_id)
+
+
+def test_Game__player_lookups__follow_update_secret(new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    player = game.players[0]
+    old_secret_id, old_cookie = player.secret_id, player.cookie
+    player.update_secret()
+    assert game.player_by_secret_id(player.secret_id) is player
+    assert game.player_by_cookie(player.cookie) is player
+    assert game.player_by_id(player.id) is player
+    with pytest.raises(StopIteration):
+        game.player_by_secret_id(old_secret_id)
+    with pytest.raises(StopIteration):
+        game.player_by_cookie(old_cookie)
+
+
+def test_Game__player_lookups__survive_restart_with_same_players(new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    game.start_game()
+    for p in game.confirmed_players:
+        p._hand = 0
+    game._current_card_count = game.max_cards_per_player()
+    game._increasing = True
+    game.round_finished()
+    game.start_next_round()
+    game.restart_with_same_players()
+    for p in game.players:
+        assert game.player_by_id(p.id) is p
+        assert game.player_by_secret_id(p.secret_id) is p
+        assert game.player_by_cookie(p.cookie) is p
+
+
 def test_Game__full_scenario():
     PLAYER_DOES_NOT_SHOW_UP = 3
     players = [Player(f"P{i}", f"Secret {i}") for i in range(5)]
@@ -201,7 +243,7 @@ def test_Game__full_scenario():
                 else:
                     # while we're at it, check that round_ will not let others play
                     with pytest.raises(OutOfTurnError):
-                        p.play_card(p._cards[0])
+                        p.play_card(p.cards[0])
                     assert p.card_count == game.current_card_count - cards_played
                     idx += 1
             for p in full_range[idx:(idx + len(confirmed_players))]:
@@ -226,28 +268,112 @@ def test_Game__full_scenario():
     assert game.state == Game.State.DONE
 
 
-def test_Game__status_summary(new_game_waiting_room):
+def test_Game__version(new_game_waiting_room):
     game = new_game_waiting_room
-    summaries = [game.status_summary()]
-    assert summaries[0] == game.status_summary()
+    versions = [game.version]
+    assert versions[0] == game.version
     game.players[1].confirm('a')
-    summaries.append(game.status_summary())
-    assert len(set(summaries)) == len(summaries)
+    versions.append(game.version)
+    assert versions == sorted(set(versions))
     game.players[0].confirm('abcdefgh')
-    summaries.append(game.status_summary())
-    assert len(set(summaries)) == len(summaries)
+    versions.append(game.version)
+    assert versions == sorted(set(versions))
     for p in game.players:
         if not p.is_confirmed:
             p.confirm('')
-            summaries.append(game.status_summary())
-            assert len(set(summaries)) == len(summaries)
+            versions.append(game.version)
+            assert versions == sorted(set(versions))
     round_ = game.start_game()
-    summaries.append(game.status_summary())
-    assert len(set(summaries)) == len(summaries)
+    versions.append(game.version)
+    assert versions == sorted(set(versions))
     for p in game.confirmed_players:
         p.place_bid(0)
-        summaries.append(game.status_summary())
-        assert len(set(summaries)) == len(summaries)
+        versions.append(game.version)
+        assert versions == sorted(set(versions))
+
+
+def test_Game__wait_for_change__returns_at_once_if_already_changed(
+        new_game_waiting_room):
+    game = new_game_waiting_room
+    old_version = game.version
+    game.players[0].confirm('')
+    assert game.wait_for_change(old_version, 10) == game.version
+
+
+def test_Game__wait_for_change__times_out(new_game_waiting_room):
+    game = new_game_waiting_room
+    assert game.wait_for_change(game.version, 0.01) == game.version
+
+
+def test_Game__wait_for_change__wakes_up_on_change(new_game_waiting_room):
+    game = new_game_waiting_room
+    old_version = game.version
+    timer = threading.Timer(0.05, game.players[0].confirm, args=('',))
+    timer.start()
+    try:
+        assert game.wait_for_change(old_version, 10) > old_version
+    finally:
+        timer.join()
+
+
+def test_Game__concurrent_start_next_round__starts_one_round(
+        new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    game.start_game()
+    for p in game.round.players:
+        p.place_bid(0)
+    while game.state == Game.State.PLAYING:
+        game.round.current_player.play_card(
+            game.round.current_player.playable_cards[0])
+    card_count = game.current_card_count
+    threads = [threading.Thread(target=game.start_next_round)
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert game.state == Game.State.PLAYING
+    assert game.current_card_count == card_count - 1
+
+
+def test_Game__view__published_after_mutation(
+        new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    game.start_game()
+    before = game.view
+    bidder = game.round.current_player
+    with game.mutation():
+        bidder.place_bid(1)
+        assert game.view is before
+    after = game.view
+    assert after.version == game.version > before.version
+    assert before.player(bidder.id).bid is None
+    assert after.player(bidder.id).bid == 1
+    assert after.round.current_player.id == game.round.current_player.id
+    assert after.round.current_player is after.player(
+        game.round.current_player.id)
+    with pytest.raises(KeyError):
+        after.player('unknown')
+
+
+def test_Game__view__matches_round(new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    game.start_game()
+    for p in game.round.players:
+        p.place_bid(0)
+    player = game.round.current_player
+    player.play_card(player.playable_cards[0])
+    view = game.view
+    assert view.state == Game.State.PLAYING
+    assert view.current_card_count == game.current_card_count
+    assert view.round.state == game.round.state
+    assert view.round.trump == game.round.trump
+    assert [(p.id, c) for (p, c) in view.round.current_trick] == [
+        (p.id, c) for (p, c) in game.round.current_trick]
+    for (p, v) in zip(game.confirmed_players, view.confirmed_players):
+        assert (v.id, v.cards, v.tricks) == (p.id, p.cards, p.tricks)
+    current = game.round.current_player
+    assert view.player(current.id).playable_cards == current.playable_cards
 
 
 # This is not a nice unit test because all (?)
@@ -275,7 +401,7 @@ def test_Game_restart_with_same_players__scenario(new_game_waiting_room):
         game.restart_with_same_players()
     # reset all players hands, so that they can join a new round
     for p in game.confirmed_players:
-        p._cards = []
+        p._hand = 0
     # simulate last round by claiming we are back with max amount of
     # cards in increasing mode:
     game._current_card_count = FIRST_ROUND_CARD_COUNT
@@ -309,7 +435,7 @@ def test_Game_restart_with_same_players__scenario(new_game_waiting_room):
     # check then reset all players hands, so that they can join a new round
     for p in game.confirmed_players:
         assert p.card_count == game.max_cards_per_player()
-        p._cards = []
+        p._hand = 0
     game.round_finished()
     assert game.state == Game.State.PAUSED_BETWEEN_ROUNDS, "Precondition in middle of test not met"
     # Check 2nd round of second game is playable with 1 card less
@@ -317,3 +443,48 @@ def test_Game_restart_with_same_players__scenario(new_game_waiting_room):
     assert game.state == Game.State.PLAYING
     for p in game.confirmed_players:
         assert p.card_count == game.max_cards_per_player() - 1
+
+
+def test_Game__done_listener__called_once_without_lock(
+        new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    calls = []
+
+    def listener(g):
+        # the lock is reentrant: try from another thread
+        free = []
+        def try_lock():
+            if g._lock.acquire(timeout=1):
+                g._lock.release()
+                free.append(True)
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        calls.append((g, free))
+    game.add_done_listener(listener)
+    with game.mutation():
+        game.start_game()
+        game.round.current_player.place_bid(0)
+        assert calls == []
+    assert calls == [(game, [True])]
+
+
+def test_Game__remove_done_listener(new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    calls = []
+    game.add_done_listener(calls.append)
+    game.remove_done_listener(calls.append)
+    game.start_game()
+    assert calls == []
+
+
+def test_Game__turn__counts_moves_only(new_game_with_confirmed_players):
+    game = new_game_with_confirmed_players
+    assert game.turn == game.view.turn == 0
+    game.start_game()
+    assert game.turn == 1
+    game.players[0].update_secret()
+    assert game.turn == game.view.turn == 1
+    game.round.current_player.place_bid(0)
+    assert game.turn == game.view.turn == 2
+    assert game.version > game.turn
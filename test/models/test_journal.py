@@ -0,0 +1,255 @@
+import json
+import threading
+import time
+
+import pytest  # type: ignore
+
+from app.bots import BotPlayer, GreedyBot
+from app.journal import Journal, JournalError, replay
+from app.models import Game, Player, Round
+
+
+def new_game(journal, organizer_secret="organizer secret"):
+    players = [Player(f"P{i}", f"secret {i}") for i in range(3)]
+    players.append(BotPlayer("Bot", 'random'))
+    game = Game(players)
+    journal.record_game(game, organizer_secret)
+    return game
+
+
+def play(game, rounds):
+    """Play `rounds' Rounds (and a bit of the next one) with GreedyBot."""
+    bot = GreedyBot()
+    for p in game.players:
+        if not p.is_confirmed:
+            p.confirm('')
+    game.start_game()
+    for _ in range(rounds):
+        round_ = game.round
+        while round_.state == Round.State.BIDDING:
+            player = round_.current_player
+            player.place_bid(bot.bid(player, round_))
+        while round_.state != Round.State.DONE:
+            player = round_.current_player
+            player.play_card(bot.card(player, round_))
+        game.start_next_round()
+    if game.state == Game.State.PLAYING:
+        player = game.round.current_player
+        player.place_bid(bot.bid(player, game.round))
+
+
+def describe(game):
+    result = [game.id, game.csrf_token, game.state,
+              [(p.id, p.name, p.secret_id, p.cookie, type(p))
+               for p in game.players]]
+    if game.state != Game.State.CONFIRMING:
+        round_ = game.round
+        result += [round_.state, round_.trump, round_.dealt_hands,
+                   round_.current_player.id,
+                   [(p.id, c) for (p, c) in round_.current_trick],
+                   [(p.id, p.hand, p.bid, p.tricks)
+                    for p in game.confirmed_players]]
+    return result
+
+
+def test_replay__restores_games(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path)
+    game = new_game(journal)
+    other = new_game(journal, "other secret")
+    play(game, 3)
+    game.players[1].update_secret()
+    other.players[0].confirm("Zoe")
+    journal.close()
+    games = replay(path)
+    assert [(g.id, s) for (g, s) in games] \
+        == [(game.id, "organizer secret"), (other.id, "other secret")]
+    assert describe(games[0].game) == describe(game)
+    assert describe(games[1].game) == describe(other)
+    restored = games[0].game
+    assert restored.player_by_secret_id(game.players[1].secret_id) \
+        is restored.players[1]
+
+
+def test_replay__game_restarted(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path)
+    game = new_game(journal)
+    play(game, 2 * (52 // 4) - 1)
+    assert game.state == Game.State.DONE
+    game.restart_with_same_players()
+    journal.close()
+    [(restored, _)] = replay(path)
+    assert describe(restored) == describe(game)
+
+
+def test_replay__missing_journal(tmp_path):
+    assert replay(str(tmp_path / 'missing')) == []
+
+
+def test_replay__ignores_incomplete_last_line(tmp_path):
+    path = tmp_path / 'journal'
+    journal = Journal(str(path))
+    game = new_game(journal)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('{"game": "' + game.id + '", "event": "bi')
+    [(restored, _)] = replay(str(path))
+    assert restored.id == game.id
+
+
+def test_replay__bad_record__raises(tmp_path):
+    path = tmp_path / 'journal'
+    journal = Journal(str(path))
+    game = new_game(journal)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write(json.dumps({"game": game.id, "event": "bid",
+                            "player": game.players[0].id, "bid": 1}) + '\n')
+    with pytest.raises(JournalError, match=':2:'):
+        replay(str(path))
+
+
+def test_Journal__group_commit(tmp_path, monkeypatch):
+    fsyncs = []
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.01)
+    monkeypatch.setattr('os.fsync', slow_fsync)
+    path = str(tmp_path / 'journal')
+    journal = Journal(path)
+    threads = [threading.Thread(target=journal.append, args=({'n': n},))
+               for n in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    journal.close()
+    with open(path) as f:
+        assert sorted(json.loads(line)['n'] for line in f) == list(range(50))
+    assert 1 <= len(fsyncs) < 50
+
+
+def test_Journal__append_after_close__raises(tmp_path):
+    journal = Journal(str(tmp_path / 'journal'))
+    journal.close()
+    with pytest.raises(JournalError):
+        journal.append({})
+
+
+def test_restore_games(tmp_path, app):
+    path = str(tmp_path / 'journal')
+    app.restore_games(path)
+    game = app.create_game([Player("A", "a"), Player("B", "b")])
+    organizer_secret = app.games.organizer_secret(game.id)
+    game.players[0].confirm('Alice')
+    app.journal.close()
+    [(restored, secret)] = replay(path)
+    assert secret == organizer_secret
+    assert restored.players[0].name == 'Alice'
+
+
+def test_Journal__snapshot_truncates_journal(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path, snapshot_every=20)
+    game = new_game(journal)
+    play(game, 3)
+    journal.close()
+    assert journal.checkpoint_error is None
+    assert sorted(p.name for p in tmp_path.iterdir()) \
+        == ['journal', 'journal.snapshot']
+    with open(path) as f:
+        assert len(f.readlines()) < 20 * 2
+    [(restored, _)] = replay(path)
+    assert describe(restored) == describe(game)
+    # and again, with the previous snapshot
+    journal = Journal(path, snapshot_every=20)
+    journal.watch(restored)
+    while restored.round.current_player.bid is None:
+        restored.round.current_player.place_bid(0)
+    for _ in range(3 * len(restored.confirmed_players)):
+        player = restored.round.current_player
+        player.play_card(player.playable_cards[0])
+    journal.close()
+    [(restored_again, _)] = replay(path)
+    assert describe(restored_again) == describe(restored)
+
+
+def test_load__skips_segments_covered_by_snapshot(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path, snapshot_every=5)
+    game = new_game(journal)
+    play(game, 1)
+    journal.close()
+    # as if the process crashed before deleting the last segment
+    with open(path) as f:
+        lines = f.readlines()
+    (tmp_path / 'journal.1').write_text(''.join(lines))
+    [(restored, _)] = replay(path)
+    assert describe(restored) == describe(game)
+
+
+def test_Journal__drops_incomplete_line(tmp_path):
+    path = tmp_path / 'journal'
+    journal = Journal(str(path))
+    game = new_game(journal)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('{"game": "' + game.id + '", "event": "bi')
+    [(game, _)] = replay(str(path))
+    journal = Journal(str(path))
+    journal.watch(game)
+    game.players[0].confirm('Alice')
+    journal.close()
+    [(restored, _)] = replay(str(path))
+    assert restored.players[0].name == 'Alice'
+
+
+def test_replay__organizer_replaced_game(tmp_path):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path)
+    old_game = new_game(journal)
+    game = new_game(journal)
+    # e.g. a bot still playing in the replaced Game
+    old_game.players[0].confirm('Alice')
+    journal.close()
+    [(restored, _)] = replay(path)
+    assert restored.id == game.id
+
+
+def test_replay__replaced_game_before_snapshot(tmp_path):
+    path = str(tmp_path / 'journal')
+    # the snapshot only holds the organizer's new Game
+    journal = Journal(path, snapshot_every=2)
+    old_game = new_game(journal)
+    game = new_game(journal)
+    old_game.players[0].confirm('Alice')
+    journal.close()
+    assert journal.checkpoint_error is None
+    [(restored, _)] = replay(path)
+    assert restored.id == game.id
+
+
+def test_Journal__waits_for_disk_without_game_lock(tmp_path, monkeypatch):
+    path = str(tmp_path / 'journal')
+    journal = Journal(path)
+    game = new_game(journal)
+    fsync_started = threading.Event()
+    lock_taken = threading.Event()
+
+    def slow_fsync(fd):
+        fsync_started.set()
+        assert lock_taken.wait(5)
+    monkeypatch.setattr('os.fsync', slow_fsync)
+
+    def take_lock():
+        assert fsync_started.wait(5)
+        with game.mutation():
+            lock_taken.set()
+    thread = threading.Thread(target=take_lock)
+    thread.start()
+    game.players[0].confirm('Alice')
+    thread.join()
+    assert lock_taken.is_set()
+    journal.close()
@@ -4,7 +4,7 @@ import pytest                   # type: ignore
 
 from app.models import (CARDS_PER_SUIT, Card, CardNotAllowedError,
                         IllegalStateError, MAX_CARDS, OutOfTurnError,
-                        Player, Round)
+                        Player, Round, card_mask)
 
 from .helpers import *
 
@@ -160,7 +160,7 @@ def test_Player__confirmed_with_cards_and_bid__will_play_one_of_his_cards(
     assert player_with_cards.card_count == before
     assert player_with_cards.play_card(Card(2)) == Card(2)
     assert player_with_cards.card_count + 1 == before
-    assert Card(2) not in player_with_cards._cards
+    assert Card(2) not in player_with_cards.cards
     round_.play_card.assert_called_with(player_with_cards, Card(2))
 
 
@@ -178,16 +178,16 @@ def test_Player__confirmed_with_cards_and_bid__will_play_according_to_rules(
         mock_round_with_players):
     (round_, [player, *_]) = mock_round_with_players
     player.place_bid(1)
-    player._cards = [Card.Heart10, Card.Spade7, Card.ClubQueen]
+    player._hand = card_mask([Card.Heart10, Card.Spade7, Card.ClubQueen])
     round_.configure_mock(**{'card_allowed.return_value': False})
     with pytest.raises(CardNotAllowedError) as excinfo:
         player.play_card(Card.Spade7)
-    round_.card_allowed.assert_called_with(Card.Spade7, player.cards)
+    round_.card_allowed.assert_called_with(Card.Spade7, player._hand)
     round_.play_card.assert_not_called()
     with pytest.raises(CardNotAllowedError) as excinfo:
         player.play_card(Card.ClubQueen)
     round_.play_card.assert_not_called()
-    round_.card_allowed.assert_called_with(Card.ClubQueen, player.cards)
+    round_.card_allowed.assert_called_with(Card.ClubQueen, player._hand)
 
 
 def test_Player__confirmed_with_cards_and_bid__will_not_remove_his_card_if_round_refuses(
@@ -199,7 +199,7 @@ def test_Player__confirmed_with_cards_and_bid__will_not_remove_his_card_if_round
     round_.configure_mock(play_card=play_card_mock)
     card_count_before = player.card_count
     with pytest.raises(OutOfTurnError) as excinfo:
-        player.play_card(player._cards[0])
+        player.play_card(player.cards[0])
     assert card_count_before == player.card_count
 
 
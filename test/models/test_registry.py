@@ -0,0 +1,66 @@
+import pytest  # type: ignore
+
+from app.models import Game, Player
+from app.registry import GameRegistry
+
+
+def new_players(prefix):
+    return [Player(f"{prefix}{i}", f"{prefix} secret {i}") for i in range(3)]
+
+
+def test_GameRegistry__create_game__registers_game():
+    registry = GameRegistry()
+    game = registry.create_game(new_players("A"))
+    assert isinstance(game, Game)
+    assert registry.game(game.id) is game
+    assert len(registry) == 1
+    assert list(registry) == [game]
+
+
+def test_GameRegistry__create_game__new_organizer_secret_per_game():
+    registry = GameRegistry(shard_count=1)
+    game_a = registry.create_game(new_players("A"))
+    game_b = registry.create_game(new_players("B"))
+    assert game_a.id != game_b.id
+    secret_a = registry.organizer_secret(game_a.id)
+    secret_b = registry.organizer_secret(game_b.id)
+    assert secret_a != secret_b
+    assert registry.game_by_organizer_secret(secret_a) is game_a
+    assert registry.game_by_organizer_secret(secret_b) is game_b
+    assert registry.is_organizer(secret_a)
+    assert not registry.is_organizer("unknown secret")
+
+
+def test_GameRegistry__create_game__same_organizer_replaces_game():
+    registry = GameRegistry()
+    other_game = registry.create_game(new_players("O"))
+    old_game = registry.create_game(new_players("A"), "organizer secret")
+    new_game = registry.create_game(new_players("B"), "organizer secret")
+    assert registry.game_by_organizer_secret("organizer secret") is new_game
+    with pytest.raises(KeyError):
+        registry.game(old_game.id)
+    assert registry.game(other_game.id) is other_game
+    assert len(registry) == 2
+
+
+def test_GameRegistry__remove_game__forgets_game_and_organizer():
+    registry = GameRegistry()
+    game = registry.create_game(new_players("A"), "organizer secret")
+    registry.remove_game(game.id)
+    with pytest.raises(KeyError):
+        registry.game(game.id)
+    with pytest.raises(KeyError):
+        registry.game_by_organizer_secret("organizer secret")
+    assert len(registry) == 0
+    # removing twice is harmless
+    registry.remove_game(game.id)
+
+
+def test_GameRegistry__unknown_ids__raise_KeyError():
+    registry = GameRegistry()
+    with pytest.raises(KeyError):
+        registry.game("no such game")
+    with pytest.raises(KeyError):
+        registry.game_by_organizer_secret("no such secret")
+    with pytest.raises(ValueError):
+        GameRegistry(shard_count=0)
@@ -297,17 +297,17 @@ def test_Round__full_scenario(mock_confirmed_players):
     game.round_finished.assert_called_with()
 
 
-def test_Round__status_summary():
+def test_Round__version():
     players = [Player(f'P{idx}', f'S{idx}') for idx in range(5)]
     for p in players:
         p.confirm('')
     (game, round_) = make_round_with_players_list(players, how_many_cards=2)
-    summaries = [round_.status_summary()]
-    assert summaries[0] == round_.status_summary()
+    versions = [round_.version]
+    assert versions[0] == round_.version
     for p in players:
         p.place_bid(1)
-        summaries.append(round_.status_summary())
-        assert len(set(summaries)) == len(summaries)
+        versions.append(round_.version)
+        assert versions == sorted(set(versions))
     # Simulate tricks
     while any(p.card_count > 0 for p in players):
         # make sure to respect the order of players imposed by round_
@@ -321,5 +321,5 @@ def test_Round__status_summary():
                     break
                 except Exception:
                     idx += 1
-            summaries.append(round_.status_summary())
-            assert len(set(summaries)) == len(summaries)
+            versions.append(round_.version)
+            assert versions == sorted(set(versions))
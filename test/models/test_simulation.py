@@ -0,0 +1,129 @@
+import random
+
+import pytest  # type: ignore
+
+from app.models import Game, MAX_CARDS, Player, Round
+
+np = pytest.importorskip("numpy")
+simulation = pytest.importorskip("app.simulation")
+
+
+def seeded_decks(seed, rounds):
+    """Return the decks Round.deal_cards shuffles after random.seed(seed)."""
+    random.seed(seed)
+    decks = []
+    for _ in range(rounds):
+        cards = list(range(MAX_CARDS))
+        random.shuffle(cards)
+        decks.append(cards)
+    return np.array([decks])
+
+
+def play_game_with_models(seed, player_count):
+    """Play a Game bidding 0 and playing the lowest allowed card.
+
+    Return (trumps, bids, tricks), the last two indexed by round and
+    seat."""
+    players = [Player(f"P{i}", f"secret {i}") for i in range(player_count)]
+    for p in players:
+        p.confirm("")
+    game = Game(players)
+    random.seed(seed)
+    game.start_game()
+    (trumps, bids, tricks) = ([], [], [])
+    while game.state != Game.State.DONE:
+        round_ = game.round
+        trumps.append(simulation.NO_CARD
+                      if round_.trump is None
+                      else round_.trump)
+        while round_.state == Round.State.BIDDING:
+            round_.current_player.place_bid(0)
+        while round_.state != Round.State.DONE:
+            current_player = round_.current_player
+            current_player.play_card(min(current_player.playable_cards))
+        bids.append([p.bid for p in players])
+        tricks.append([p.tricks for p in players])
+        game.start_next_round()
+    return (trumps, bids, tricks)
+
+
+@pytest.mark.parametrize("player_count", [2, 3, 7])
+def test_round_card_counts__like_Game(player_count):
+    counts = simulation.round_card_counts(player_count)
+    (trumps, _, _) = play_game_with_models(1, player_count)
+    assert len(counts) == len(trumps)
+    assert counts[0] == counts[-1] == MAX_CARDS // player_count
+    assert min(counts) == 1
+
+
+def test_deal__like_Round_deal_cards():
+    players = [Player(f"P{i}", f"secret {i}") for i in range(4)]
+    for p in players:
+        p.confirm("")
+    game = Game(players)
+    random.seed(42)
+    game.start_game()
+    decks = seeded_decks(42, 1)[:, 0]
+    (hands, trump) = simulation.deal(decks, 4, 13)
+    for (position, player) in enumerate(game.confirmed_players):
+        assert list(np.flatnonzero(hands[0, position])) == player.cards
+    assert trump[0] == simulation.NO_CARD
+
+
+def test_deal__trump_is_next_card():
+    decks = np.array([list(range(MAX_CARDS))])
+    (hands, trump) = simulation.deal(decks, 3, 2)
+    assert list(np.flatnonzero(hands[0, 1])) == [2, 3]
+    assert trump[0] == 6
+
+
+@pytest.mark.parametrize("seed,player_count", [(1, 2), (7, 3), (3, 4)])
+def test_simulate_games__like_Game(seed, player_count):
+    (trumps, bids, tricks) = play_game_with_models(seed, player_count)
+    decks = seeded_decks(seed, len(trumps))
+    result = simulation.simulate_games(
+        1, player_count, simulation.zero_bid, simulation.lowest_card,
+        decks=decks)
+    assert list(result.trump[0]) == trumps
+    assert result.bids[0].tolist() == bids
+    assert result.tricks[0].tolist() == tricks
+
+
+def test_simulate_games__seeded_runs_repeat():
+    def run():
+        rng = np.random.default_rng(5)
+        return simulation.simulate_games(
+            20, 4, simulation.random_bid(rng), simulation.random_card(rng),
+            rng=rng)
+    (first, second) = (run(), run())
+    assert (first.bids == second.bids).all()
+    assert (first.tricks == second.tricks).all()
+
+
+def test_simulate_games__every_trick_is_won_once():
+    rng = np.random.default_rng(0)
+    result = simulation.simulate_games(
+        50, 5, simulation.high_cards_bid, simulation.random_card(rng),
+        rng=rng)
+    assert result.tricks.shape == (50, len(result.card_counts), 5)
+    assert (result.tricks.sum(axis=2) == result.card_counts).all()
+    assert (result.bids <= np.array(result.card_counts)[:, None]).all()
+
+
+def test_play_round__illegal_card__raises():
+    decks = np.array([list(range(MAX_CARDS))])
+    (hands, trump) = simulation.deal(decks, 2, 3)
+    with pytest.raises(ValueError):
+        # the second player may not play a card she does not hold
+        simulation.play_round(
+            hands, trump, simulation.zero_bid,
+            lambda view: np.zeros(len(view.hand), dtype=int))
+
+
+def test_play_round__bid_out_of_range__raises():
+    decks = np.array([list(range(MAX_CARDS))])
+    (hands, trump) = simulation.deal(decks, 2, 3)
+    with pytest.raises(ValueError):
+        simulation.play_round(
+            hands, trump, lambda view: np.full(len(view.hand), 4),
+            simulation.lowest_card)
@@ -0,0 +1,80 @@
+import io
+
+import pytest  # type: ignore
+
+from app import snapshot
+from app.bots import BotPlayer
+from app.models import Game, Player
+from app.registry import RegisteredGame
+
+from .test_journal import describe, play
+
+
+def new_game():
+    players = [Player(f"P{i}", f"secret {i}") for i in range(3)]
+    players.append(BotPlayer("Bot", 'solver'))
+    return Game(players)
+
+
+def round_trip(games, segment=7):
+    output = io.BytesIO()
+    snapshot.dump({g.id: RegisteredGame(g, f"organizer {g.id}")
+                   for g in games},
+                  segment, output)
+    (restored, restored_segment) = snapshot.load(output.getvalue())
+    assert restored_segment == segment
+    assert [(entry.game.id, entry.organizer_secret)
+            for entry in restored.values()] \
+        == [(g.id, f"organizer {g.id}") for g in games]
+    return [entry.game for entry in restored.values()]
+
+
+@pytest.mark.parametrize('rounds', [0, 1, 4])
+def test_snapshot__round_trip(rounds):
+    (game, waiting) = (new_game(), new_game())
+    waiting.players[2].confirm("Zoe")
+    play(game, rounds)
+    if rounds > 0:
+        # a trick in progress
+        while game.round.current_player.bid is None:
+            game.round.current_player.place_bid(0)
+        game.round.current_player.play_card(
+            game.round.current_player.playable_cards[0])
+    (restored, restored_waiting) = round_trip([game, waiting])
+    assert describe(restored) == describe(game)
+    assert describe(restored_waiting) == describe(waiting)
+    assert restored.version == game.version
+    assert restored.turn >= game.turn
+    assert restored.progress() == game.progress()
+    assert restored.players[3].policy_name == 'solver'
+
+
+def test_snapshot__restored_game_goes_on():
+    game = new_game()
+    play(game, 1)
+    [restored] = round_trip([game])
+    for g in (game, restored):
+        while g.round.current_player.bid is None:
+            g.round.current_player.place_bid(1)
+        g.round.current_player.play_card(g.round.current_player.cards[-1])
+    assert describe(restored) == describe(game)
+
+
+def test_snapshot__compact():
+    game = new_game()
+    play(game, 1)
+    output = io.BytesIO()
+    snapshot.dump({game.id: RegisteredGame(game, "organizer")}, 1, output)
+    assert len(output.getvalue()) < 600
+
+
+def test_snapshot__damaged():
+    output = io.BytesIO()
+    snapshot.dump({}, 3, output)
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.load(b'XXXX' + output.getvalue()[4:])
+    game = new_game()
+    output = io.BytesIO()
+    snapshot.dump({game.id: RegisteredGame(game, "organizer")}, 3, output)
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.load(output.getvalue()[:-1])
@@ -0,0 +1,124 @@
+import random
+
+import pytest  # type: ignore
+
+from app.bots import SolverBot
+from app.models import (Card, Game, Player, Round, card_bit, card_mask,
+                        mask_cards, playable_mask, trick_winner)
+from app.solver import Solver, best_possible, round_position
+
+
+def brute_force(hands, trump, leader, table, player, maximize):
+    """Minimax without any pruning."""
+    seat = (leader + len(table)) % len(hands)
+    if hands[seat] == 0:
+        return 0
+    values = []
+    for card in mask_cards(playable_mask(
+            hands[seat], table[0] if table else None)):
+        next_hands = list(hands)
+        next_hands[seat] &= ~card_bit(card)
+        next_table = table + (card,)
+        if len(next_table) == len(hands):
+            winner = (leader + trick_winner(list(next_table), trump)) \
+                % len(hands)
+            values.append(int(winner == player) + brute_force(
+                next_hands, trump, winner, (), player, maximize))
+        else:
+            values.append(brute_force(
+                next_hands, trump, leader, next_table, player, maximize))
+    return (max if (seat == player) == maximize else min)(values)
+
+
+def random_position(rng):
+    players = rng.randint(2, 4)
+    how_many_cards = rng.randint(1, 3)
+    cards = list(range(52))
+    rng.shuffle(cards)
+    hands = [card_mask(cards[(i * how_many_cards):][:how_many_cards])
+             for i in range(players)]
+    trump = rng.choice([None, Card(cards[players * how_many_cards])])
+    leader = rng.randrange(players)
+    table = ()
+    for turn in range(rng.randrange(players)):
+        seat = (leader + turn) % players
+        card = rng.choice(mask_cards(playable_mask(
+            hands[seat], table[0] if table else None)))
+        hands[seat] &= ~card_bit(card)
+        table += (card,)
+    return (hands, trump, leader, table)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_Solver__like_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        (hands, trump, leader, table) = random_position(rng)
+        player = rng.randrange(len(hands))
+        maximize = rng.random() < 0.5
+        solver = Solver(trump, player, maximize)
+        expected = brute_force(hands, trump, leader, table, player, maximize)
+        assert solver.tricks(hands, leader, table) == expected
+        # again, with a filled transposition table
+        assert solver.tricks(hands, leader, table) == expected
+
+
+def test_Solver__card_values():
+    hands = [card_mask([Card.Spade2, Card.SpadeAce]),
+             card_mask([Card.SpadeKing, Card.Club3])]
+    # leading the Ace wins it, then Spade2 wins over Club3.  Leading
+    # Spade2 loses it to the King, then Club3 wins the next trick.
+    expected = {Card.Spade2: 0, Card.SpadeAce: 2}
+    assert Solver(None, 0).card_values(hands) == expected
+    assert Solver(None, 0, maximize=False).card_values(hands) == expected
+
+
+def test_best_possible():
+    hands = [card_mask([Card.Heart2]),
+             card_mask([Card.SpadeAce]),
+             card_mask([Card.Spade3])]
+    assert best_possible(hands, Card.Heart9) == [1, 0, 0]
+    assert best_possible(hands, None) == [1, 0, 0]
+    assert best_possible(hands[1:], None) == [1, 0]
+
+
+def started_round(player_count, seed=3):
+    players = [Player(f"P{i}", f"secret {i}") for i in range(player_count)]
+    for p in players:
+        p.confirm('')
+    game = Game(players)
+    random.seed(seed)
+    game.start_game()
+    return game
+
+
+def test_round_position__follows_Round():
+    game = started_round(4)
+    round_ = game.round
+    assert round_.dealt_hands == tuple(p.hand for p in round_.players)
+    for p in round_.players:
+        p.place_bid(1)
+    assert round_position(round_) == (round_.dealt_hands, 0, ())
+    for turn in range(6):
+        player = round_.current_player
+        player.play_card(player.playable_cards[-1])
+        (hands, leader, table) = round_position(round_)
+        assert hands == tuple(p.hand for p in round_.players)
+        assert round_.players[(leader + len(table)) % 4] \
+            is round_.current_player
+        assert list(table) == [c for (_, c) in round_.current_trick] \
+            if round_.state == Round.State.PLAYING else table == ()
+
+
+def test_SolverBot__plays_endgame():
+    game = started_round(3)
+    round_ = game.round
+    bot = SolverBot()
+    for p in round_.players:
+        p.place_bid(bot.bid(p, round_))
+    while round_.state != Round.State.DONE:
+        player = round_.current_player
+        card = bot.card(player, round_)
+        assert card in player.playable_cards
+        player.play_card(card)
+    assert sum(p.tricks for p in round_.players) == game.current_card_count
@@ -0,0 +1,118 @@
+import random
+import time
+
+import pytest  # type: ignore
+
+from app import state
+from app.models import (Card, CardNotAllowedError, Game, IllegalStateError,
+                        Player, Round, card_mask, mask_cards)
+
+
+def new_game(player_count, seed):
+    players = [Player(f"P{i}", f"secret {i}") for i in range(player_count)]
+    for p in players:
+        p.confirm('')
+    game = Game(players)
+    random.seed(seed)
+    game.start_game()
+    return game
+
+
+@pytest.mark.parametrize("player_count,seed", [(2, 1), (3, 2), (5, 3)])
+def test_transitions__like_Round(player_count, seed):
+    game = new_game(player_count, seed)
+    round_ = game.round
+    snapshot = state.from_round(round_)
+    assert snapshot == state.deal(round_.dealt_hands, round_.trump)
+    rng = random.Random(seed)
+    while round_.state != Round.State.DONE:
+        player = round_.current_player
+        if round_.state == Round.State.BIDDING:
+            bid = rng.randint(0, player.card_count)
+            player.place_bid(bid)
+            snapshot = state.place_bid(snapshot, bid)
+        else:
+            card = rng.choice(player.playable_cards)
+            assert mask_cards(snapshot.playable) == player.playable_cards
+            player.play_card(card)
+            snapshot = state.play_card(snapshot, card)
+        assert snapshot == state.from_round(round_)
+
+
+def test_transitions__leave_argument_untouched():
+    hands = (card_mask([Card.Spade2, Card.Heart3]),
+             card_mask([Card.Spade5, Card.Club9]))
+    initial = state.deal(hands, Card.Heart9)
+    after_bids = state.place_bid(state.place_bid(initial, 1), 0)
+    first = state.play_card(after_bids, Card.Spade2)
+    second = state.play_card(after_bids, Card.Heart3)
+    assert initial.bids == (None, None)
+    assert after_bids.state == Round.State.PLAYING
+    assert after_bids.hands == hands
+    assert first.table == (Card.Spade2,)
+    assert second.table == (Card.Heart3,)
+    # Spade5 beats Spade2, but not the trump
+    assert state.play_card(first, Card.Spade5).tricks == (0, 1)
+    assert state.play_card(second, Card.Spade5).tricks == (1, 0)
+
+
+def test_transitions__enforce_rules():
+    hands = (card_mask([Card.Spade2, Card.Heart3]),
+             card_mask([Card.Spade5, Card.Club9]))
+    initial = state.deal(hands)
+    with pytest.raises(IllegalStateError):
+        state.play_card(initial, Card.Spade2)
+    with pytest.raises(ValueError):
+        state.place_bid(initial, 3)
+    playing = state.place_bid(state.place_bid(initial, 1), 1)
+    with pytest.raises(IllegalStateError):
+        state.place_bid(playing, 0)
+    with pytest.raises(CardNotAllowedError):
+        state.play_card(playing, Card.Spade5)
+    with pytest.raises(CardNotAllowedError):
+        state.play_card(state.play_card(playing, Card.Spade2), Card.Club9)
+
+
+@pytest.mark.parametrize("moves", [0, 3, 5, 9, 12])
+def test_restore_round__round_trip(moves):
+    game = new_game(3, moves)
+    round_ = game.round
+    rng = random.Random(moves)
+    for _ in range(moves):
+        player = round_.current_player
+        if round_.state == Round.State.BIDDING:
+            player.place_bid(rng.randint(0, player.card_count))
+        else:
+            player.play_card(rng.choice(player.playable_cards))
+    snapshot = state.from_round(round_)
+    restored = state.restore_round(game, snapshot)
+    assert state.from_round(restored) == snapshot
+    assert restored.current_player is round_.current_player
+    assert restored.current_trick == round_.current_trick
+    # the restored Round goes on like the original one
+    while restored.state != Round.State.DONE:
+        player = restored.current_player
+        if restored.state == Round.State.BIDDING:
+            player.place_bid(0)
+            snapshot = state.place_bid(snapshot, 0)
+        else:
+            card = player.playable_cards[0]
+            player.play_card(card)
+            snapshot = state.play_card(snapshot, card)
+        assert state.from_round(restored) == snapshot
+
+
+def test_transitions__are_cheap():
+    game = new_game(4, 0)
+    snapshot = state.from_round(game.round)
+    for _ in range(4):
+        snapshot = state.place_bid(snapshot, 1)
+    start = time.perf_counter()
+    continuations = 0
+    while continuations < 2000:
+        current = snapshot
+        while current.state != Round.State.DONE:
+            current = state.play_card(
+                current, mask_cards(current.playable)[0])
+            continuations += 1
+    assert time.perf_counter() - start < 1
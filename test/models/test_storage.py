@@ -0,0 +1,124 @@
+import sqlite3
+import threading
+
+import pytest  # type: ignore
+
+from app.bots import BotPlayer
+from app.models import Game, Player, Round
+from app.storage import (MemoryStorage, PlayerRecord, PlayerResult,
+                         SQLiteStorage, open_storage)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def storage(request, tmp_path):
+    storage = (MemoryStorage()
+               if request.param == 'memory'
+               else SQLiteStorage(str(tmp_path / 'rikiki.db')))
+    yield storage
+    storage.close()
+
+
+def new_game(storage):
+    game = Game([Player("A", "a secret"), Player("B", "b secret"),
+                 BotPlayer("Bot")])
+    storage.watch(game)
+    return game
+
+
+def play_round(game):
+    round_ = game.round
+    while round_.state == Round.State.BIDDING:
+        round_.current_player.place_bid(1)
+    while round_.state != Round.State.DONE:
+        player = round_.current_player
+        player.play_card(player.playable_cards[0])
+    return [PlayerResult(p.id, p.bid, p.tricks) for p in round_.players]
+
+
+def test_Storage__records_players(storage):
+    game = new_game(storage)
+    game.players[1].confirm("Bea")
+    storage.flush()
+    assert storage.players(game.id) == [
+        PlayerRecord(game.players[0].id, "A", False),
+        PlayerRecord(game.players[1].id, "Bea", False),
+        PlayerRecord(game.players[2].id, "Bot", True)]
+    assert storage.players("unknown") == []
+
+
+def test_Storage__records_round_results(storage):
+    game = new_game(storage)
+    other = new_game(storage)
+    for p in game.players:
+        p.confirm('')
+    game.start_game()
+    expected = [(game.current_card_count, game.round.trump, play_round(game))]
+    game.start_next_round()
+    expected.append(
+        (game.current_card_count, game.round.trump, play_round(game)))
+    storage.flush()
+    results = storage.round_results(game.id)
+    assert [r.round for r in results] == [0, 1]
+    assert [(r.cards, r.trump, list(r.results)) for r in results] == expected
+    assert storage.round_results(other.id) == []
+
+
+def test_SQLiteStorage__survives_reopening(tmp_path):
+    path = str(tmp_path / 'rikiki.db')
+    storage = SQLiteStorage(path)
+    game = new_game(storage)
+    for p in game.players:
+        p.confirm('')
+    game.start_game()
+    results = play_round(game)
+    storage.close()
+    storage = SQLiteStorage(path)
+    try:
+        [round_result] = storage.round_results(game.id)
+        assert list(round_result.results) == results
+        with sqlite3.connect(path) as connection:
+            assert connection.execute('PRAGMA journal_mode').fetchone() \
+                == ('wal',)
+    finally:
+        storage.close()
+
+
+def test_SQLiteStorage__batches_writes(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'rikiki.db'))
+    release = threading.Event()
+    batches = []
+    # hold the writer thread while writes queue up
+    storage._tasks.put(lambda connection: release.wait())
+    game = new_game(storage)
+    for (i, player) in enumerate(game.players):
+        player.confirm(f"Name {i}")
+    storage._tasks.put(lambda connection: batches.append(
+        connection.in_transaction))
+    release.set()
+    storage.flush()
+    assert [p.name for p in storage.players(game.id)] \
+        == ["Name 0", "Name 1", "Name 2"]
+    assert batches == [True]
+    storage.close()
+
+
+def test_SQLiteStorage__failing_write_keeps_its_batch(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'rikiki.db'))
+    release = threading.Event()
+    storage._tasks.put(lambda connection: release.wait())
+    game = new_game(storage)
+    storage._tasks.put(lambda connection: connection.execute(
+        'INSERT INTO nowhere VALUES (1)'))
+    game.players[0].confirm("Alice")
+    release.set()
+    storage.flush()
+    assert isinstance(storage.error, sqlite3.OperationalError)
+    assert [p.name for p in storage.players(game.id)][0] == "Alice"
+    storage.close()
+
+
+def test_open_storage(tmp_path):
+    assert isinstance(open_storage(None), MemoryStorage)
+    storage = open_storage(str(tmp_path / 'rikiki.db'))
+    assert isinstance(storage, SQLiteStorage)
+    storage.close()
@@ -75,10 +75,13 @@ def game(rikiki_app):
         3: "Günther",
         5: "Φιλιππε",
     }
+    # Let the console organizer secret manage the Game so that tests
+    # need not look up the Game's organizer secret:
     return rikiki_app.create_game(
         [app.models.Player(
             SPECIAL_NAME_PLAYERS.get(i, f"P{i}"),
-            f"Secret{i}") for i in range(7)])
+            f"Secret{i}") for i in range(7)],
+        organizer_secret=rikiki_app.organizer_secret)
 
 
 @pytest.fixture
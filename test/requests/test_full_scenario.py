@@ -30,10 +30,12 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
         follow_redirects=True)
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
-    game = rikiki_app.game
+    (game,) = rikiki_app.games
+    # The console organizer secret set up a Game with its own secret:
+    organizer_secret = rikiki_app.games.organizer_secret(game.id)
     for p in game.players:
         response = client.post(
-            '/player/confirm/',
+            f'/player/{game.id}/confirm/',
             data={'secret_id': p.secret_id, 'player_name': ''},
             follow_redirects=True)
         assert response.status_code == 200
@@ -58,7 +60,7 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
             assert FLASH_ERROR not in response.data
             assert rendered_template(response, 'player.player')
             response = client.post(
-                '/player/place/bid/',
+                f'/player/{game.id}/place/bid/',
                 data={'secret_id': p.secret_id,
                       'bidInput': str(idx % min(4, cards_to_play + 1))})
             assert response.status_code == 200
@@ -70,11 +72,11 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
             for cards_on_table in range(len(game.confirmed_players)):
                 player = game.round.current_player
                 response = client.get(
-                    f'/player/{player.secret_id}/api/status/')
+                    f'/player/{game.id}/{player.secret_id}/api/status/')
                 assert response.status_code == 200
                 assert response.is_json
                 response = client.post(
-                    '/player/play/card/',
+                    f'/player/{game.id}/play/card/',
                     data={'secret_id': player.secret_id,
                           'card': str(player.playable_cards[0])})
                 assert response.status_code == 200
@@ -91,7 +93,7 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
                 assert game.round.state == models.Round.State.DONE
                 for player in game.confirmed_players:
                     response = client.get(
-                        f'/player/{player.secret_id}/api/status/')
+                        f'/player/{game.id}/{player.secret_id}/api/status/')
                     assert response.status_code == 200
                     assert response.is_json
                 # NB: when last Round of Game finishes, an explicit
@@ -101,7 +103,7 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
                 # test with only 2:
                 for finisher in game.confirmed_players[:2]:
                     response = client.post(
-                        f'/player/finish/round/',
+                        f'/player/{game.id}/finish/round/',
                         data={'secret_id': finisher.secret_id})
                     assert response.status_code == 200
                     assert response.is_json
@@ -109,7 +111,7 @@ def test_full_scenario(rikiki_app, organizer_secret, client):
                     assert status['ok']
                     for player in game.confirmed_players:
                         response = client.get(
-                            f'/player/{player.secret_id}/api/status/')
+                            f'/player/{game.id}/{player.secret_id}/api/status/')
                         assert response.status_code == 200
                         assert response.is_json
     # game never stops
@@ -0,0 +1,110 @@
+import os
+import signal
+
+import pytest  # type: ignore
+
+import app
+from app import handoff
+
+
+def new_app():
+    rikiki_app = app.create_app('testing')
+    rikiki_app.config['SECRET_KEY'] = os.urandom(16)
+    return rikiki_app
+
+
+@pytest.fixture
+def old_app():
+    rikiki_app = new_app()
+    game = rikiki_app.create_game(
+        [app.models.Player(f"P{i}", f"Secret{i}") for i in range(3)])
+    for player in game.players:
+        player.confirm('')
+    game.start_game()
+    game.round.current_player.place_bid(1)
+    return rikiki_app
+
+
+def session_cookie(rikiki_app, player):
+    return rikiki_app.session_interface.get_signing_serializer(
+        rikiki_app).dumps({app.USER_COOKIE: player.cookie})
+
+
+def test_handoff__games_and_sessions_go_on(old_app, tmp_path):
+    path = str(tmp_path / 'handoff')
+    [old_game] = old_app.games
+    handoff.hand_over(old_app, path)
+    rikiki_app = new_app()
+    for entry in handoff.take_over(rikiki_app, path):
+        rikiki_app.register_game(*entry)
+    assert not os.path.exists(path)
+    assert rikiki_app.config['SECRET_KEY'] == old_app.config['SECRET_KEY']
+    assert rikiki_app.organizer_secret == old_app.organizer_secret
+    [game] = rikiki_app.games
+    assert game.id == old_game.id
+    assert rikiki_app.games.organizer_secret(game.id) \
+        == old_app.games.organizer_secret(old_game.id)
+    player = game.round.current_player
+    assert player.id == old_game.round.current_player.id
+    client = rikiki_app.test_client()
+    # the Player's link ...
+    response = client.post(f'/player/{game.id}/place/bid/',
+                           data={'secret_id': player.secret_id,
+                                 'bidInput': '0'})
+    assert response.status_code == 200
+    assert player.bid == 0
+    # ... and her session cookie still work
+    client.set_cookie('localhost', 'session',
+                      session_cookie(old_app, old_game.players[0]))
+    response = client.get(f'/player/{game.id}/restore/link/')
+    assert response.status_code == 200
+
+
+def test_take_over__without_file(tmp_path):
+    rikiki_app = new_app()
+    secret_key = rikiki_app.config['SECRET_KEY']
+    assert handoff.take_over(rikiki_app, str(tmp_path / 'missing')) is None
+    assert rikiki_app.config['SECRET_KEY'] == secret_key
+
+
+def test_take_over__damaged_file(tmp_path):
+    path = tmp_path / 'handoff'
+    path.write_bytes(b'nonsense')
+    with pytest.raises(handoff.HandoffError):
+        handoff.take_over(new_app(), str(path))
+
+
+def test_hand_over_on_sigterm(old_app, tmp_path):
+    path = str(tmp_path / 'handoff')
+    received = []
+    original = signal.signal(signal.SIGTERM,
+                             lambda signum, frame: received.append(signum))
+    try:
+        handoff.hand_over_on_sigterm(old_app, path)
+        os.kill(os.getpid(), signal.SIGTERM)
+        assert received == [signal.SIGTERM]
+        assert os.path.exists(path)
+    finally:
+        signal.signal(signal.SIGTERM, original)
+    [(game, _)] = handoff.take_over(new_app(), path)
+    assert game.id == next(iter(old_app.games)).id
+
+
+def test_hand_over__private_file_replaces_stale_temporary(old_app, tmp_path):
+    path = tmp_path / 'handoff'
+    (tmp_path / 'handoff.tmp').write_bytes(b'left over by a crash')
+    os.chmod(tmp_path / 'handoff.tmp', 0o644)
+    handoff.hand_over(old_app, str(path))
+    assert not (tmp_path / 'handoff.tmp').exists()
+    assert path.stat().st_mode & 0o777 == 0o600
+    [(game, _)] = handoff.take_over(new_app(), str(path))
+    assert game.id == next(iter(old_app.games)).id
+
+
+def test_hand_over_on_sigterm__ignored_signal(old_app, tmp_path):
+    original = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        handoff.hand_over_on_sigterm(old_app, str(tmp_path / 'handoff'))
+        assert signal.getsignal(signal.SIGTERM) == signal.SIG_IGN
+    finally:
+        signal.signal(signal.SIGTERM, original)
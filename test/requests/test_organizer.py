@@ -86,10 +86,16 @@ def test_organizer_post_with_players(organizer_secret, client, rikiki_app):
         follow_redirects=True)
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
-    assert [p.name for p in rikiki_app.game.players] == PLAYER_NAMES
+    (game,) = rikiki_app.games
+    assert [p.name for p in game.players] == PLAYER_NAMES
+    # The Game has its own organizer secret, different from the one
+    # allowing to set up Games:
+    game_organizer_secret = rikiki_app.games.organizer_secret(game.id)
+    assert game_organizer_secret != organizer_secret
+    assert game_organizer_secret.encode('ascii') in response.data
 
 
-def test_organizer_post_with_players_twice_overwrites_first_game(organizer_secret, client, rikiki_app):
+def test_organizer_post_with_players_twice_creates_two_games(organizer_secret, client, rikiki_app):
     PLAYER_NAMES_1 = ['riri', 'fifi', 'lulu']
     response = client.post(
         '/organizer/setup/game/',
@@ -97,7 +103,7 @@ def test_organizer_post_with_players_twice_overwrites_first_game(organizer_secre
               'playerlist': '\n'.join(PLAYER_NAMES_1)},
         follow_redirects=True)
     try:
-        game_1 = rikiki_app.game
+        (game_1,) = rikiki_app.games
         assert [p.name for p in game_1.players] == PLAYER_NAMES_1
     except Exception as e:
         assert e is None, "Test precondition not met"
@@ -107,10 +113,43 @@ def test_organizer_post_with_players_twice_overwrites_first_game(organizer_secre
         data={'organizer_secret': organizer_secret,
               'playerlist': ', '.join(PLAYER_NAMES_2)},
         follow_redirects=True)
-    assert rikiki_app.game is not game_1
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
-    assert [p.name for p in rikiki_app.game.players] == PLAYER_NAMES_2
+    assert len(rikiki_app.games) == 2
+    game_2 = next(g for g in rikiki_app.games if g is not game_1)
+    assert rikiki_app.games.game(game_1.id) is game_1
+    assert [p.name for p in game_2.players] == PLAYER_NAMES_2
+    assert rikiki_app.games.organizer_secret(game_1.id) != \
+        rikiki_app.games.organizer_secret(game_2.id)
+
+
+def test_organizer_post_with_players_twice_overwrites_first_game(organizer_secret, client, rikiki_app):
+    PLAYER_NAMES_1 = ['riri', 'fifi', 'lulu']
+    response = client.post(
+        '/organizer/setup/game/',
+        data={'organizer_secret': organizer_secret,
+              'playerlist': '\n'.join(PLAYER_NAMES_1)},
+        follow_redirects=True)
+    try:
+        (game_1,) = rikiki_app.games
+        assert [p.name for p in game_1.players] == PLAYER_NAMES_1
+    except Exception as e:
+        assert e is None, "Test precondition not met"
+    game_organizer_secret = rikiki_app.games.organizer_secret(game_1.id)
+    PLAYER_NAMES_2 = ['toto', 'momo', 'lili']
+    response = client.post(
+        '/organizer/setup/game/',
+        data={'organizer_secret': game_organizer_secret,
+              'playerlist': ', '.join(PLAYER_NAMES_2)},
+        follow_redirects=True)
+    assert response.status_code == 200
+    assert FLASH_ERROR not in response.data
+    (game_2,) = rikiki_app.games
+    assert game_2 is not game_1
+    assert [p.name for p in game_2.players] == PLAYER_NAMES_2
+    assert rikiki_app.games.organizer_secret(game_2.id) == game_organizer_secret
+    with pytest.raises(KeyError):
+        rikiki_app.games.game(game_1.id)
 
 
 def test_parse_playerlist_simple_examples():
@@ -232,6 +271,18 @@ def test_api_game_status__game_started__get_returns_json(organizer_secret, clien
     assert status['round']['state'] == started_game.round.state
 
 
+
+def test_api_game_status__unchanged_game__304(organizer_secret, client, started_game):
+    url = f'/organizer/{organizer_secret}/api/game_status/'
+    etag = client.get(url).headers['ETag']
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    started_game.confirmed_players[0].place_bid(1)
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
 def test_start_game__get__is_forbidden_method(client):
     response = client.get('/organizer/start_game/')
     assert response.status_code == 405
@@ -286,7 +337,8 @@ def test_dashboard__game_not_created__redirect_to_setup_game(organizer_secret, c
 
 def test_dashboard__game_not_started__redirect_to_wait_for_users(rikiki_app, client):
     rikiki_app.create_game(
-        [app.models.Player(f'P{i}', f'S{i}') for i in range(5)])
+        [app.models.Player(f'P{i}', f'S{i}') for i in range(5)],
+        organizer_secret=rikiki_app.organizer_secret)
     response = client.get(f'/organizer/{rikiki_app.organizer_secret}/dashboard/',
                           follow_redirects=True)
     assert response.status_code == 200
@@ -332,7 +384,8 @@ def test_restart_game__game_not_initialized_yet__redirects_to_setup_game(organiz
 
 def test_restart_game__game_not_started__redirect_to_wait_for_users(rikiki_app, client):
     rikiki_app.create_game(
-        [app.models.Player(f'P{i}', f'S{i}') for i in range(5)])
+        [app.models.Player(f'P{i}', f'S{i}') for i in range(5)],
+        organizer_secret=rikiki_app.organizer_secret)
     response = client.post(f'/organizer/restart/with/same/players/',
                            data={'organizer_secret': rikiki_app.organizer_secret},
                            follow_redirects=True)
@@ -354,7 +407,7 @@ def test_restart_game__game_done__happy_path(rikiki_app, client, game_with_start
     game = game_with_started_round
     game_players = [p for p in game.players]
     for p in game.confirmed_players:
-        p._cards = []
+        p._hand = 0
     game._increasing = True
     game._current_card_count = game.max_cards_per_player()
     game.round_finished()
@@ -369,3 +422,84 @@ def test_restart_game__game_done__happy_path(rikiki_app, client, game_with_start
     assert rendered_template(response, 'wait_for_users')
     for p in game.players:
         assert minimal_HTML_escaping(p.name).encode('utf-8') in response.data
+
+
+def test_organizer_post_with_bots(organizer_secret, client, rikiki_app):
+    response = client.post(
+        '/organizer/setup/game/',
+        data={'organizer_secret': organizer_secret,
+              'playerlist': 'riri',
+              'bots': '2',
+              'bot_policy': 'random'},
+        follow_redirects=True)
+    assert response.status_code == 200
+    assert FLASH_ERROR not in response.data
+    (game,) = rikiki_app.games
+    assert [p.name for p in game.players] == ['riri', 'Bot 1', 'Bot 2']
+    assert [isinstance(p, app.bots.BotPlayer) for p in game.players] == \
+        [False, True, True]
+    assert all(p.is_confirmed for p in game.players[1:])
+
+
+def test_organizer__bots_have_no_link(organizer_secret, client, rikiki_app):
+    response = client.post(
+        '/organizer/setup/game/',
+        data={'organizer_secret': organizer_secret,
+              'playerlist': 'riri',
+              'bots': '2',
+              'bot_policy': 'random'},
+        follow_redirects=True)
+    (game,) = rikiki_app.games
+    (human, *bots) = game.players
+    assert bytes(human.secret_id, 'utf-8') in response.data
+    for bot in bots:
+        assert bytes(bot.secret_id, 'utf-8') not in response.data
+    human.confirm('')
+    secret = rikiki_app.games.organizer_secret(game.id)
+    status = client.get(f'/organizer/{secret}/api/game_status/').get_json()
+    assert 'url' in status['players'][human.id]
+    for bot in bots:
+        assert status['players'][bot.id] == {'name': bot.name}
+    game.start_game()
+    response = client.get(f'/organizer/{secret}/dashboard/')
+    status = client.get(f'/organizer/{secret}/api/game_status/').get_json()
+    for bot in bots:
+        assert bytes(bot.secret_id, 'utf-8') not in response.data
+        assert 'url' not in status['players'][bot.id]
+    assert 'url' in status['players'][human.id]
+
+
+def test_organizer_post_with_invalid_bots(organizer_secret, client, rikiki_app):
+    for data in [{'bots': '-1'}, {'bots': 'x'}, {'bot_policy': 'oracle'}]:
+        response = client.post(
+            '/organizer/setup/game/',
+            data={'organizer_secret': organizer_secret,
+                  'playerlist': 'riri, fifi, loulou',
+                  **data})
+        assert response.status_code == 200
+        assert rendered_template(response, 'setup_game')
+        assert b"Invalid bots" in response.data
+    assert len(rikiki_app.games) == 0
+
+
+def test_api_history(organizer_secret, client, rikiki_app, game_with_started_round):
+    game = game_with_started_round
+    round_ = game.round
+    while round_.state != app.models.Round.State.DONE:
+        player = round_.current_player
+        player.play_card(player.playable_cards[0])
+    response = client.get(f'/organizer/{organizer_secret}/api/history/')
+    assert response.status_code == 200
+    history = response.get_json()
+    assert history['players'][game.players[0].id] \
+        == {'name': game.players[0].name, 'bot': False}
+    [round_result] = history['rounds']
+    assert round_result['cards'] == game.current_card_count
+    assert round_result['results'] == [
+        {'player': p.id, 'bid': p.bid, 'tricks': p.tricks}
+        for p in round_.players]
+
+
+def test_api_history__no_game__404(organizer_secret, client):
+    response = client.get(f'/organizer/{organizer_secret}/api/history/')
+    assert response.status_code == 404
@@ -1,4 +1,7 @@
 import random
+import threading
+import time
+import unittest.mock as mock
 
 import flask
 from jinja2 import escape
@@ -29,40 +32,40 @@ from .helper import (
 
 def test_player_confirm__no_game_created_so_no_players__get_with_wrong_secret(
         rikiki_app, client):
-    response = client.get('/player/confirm/wrong_secret',
+    response = client.get('/player/no_game/confirm/wrong_secret',
                           follow_redirects=True)
     assert response.status_code == 403
 
 
 def test_player_confirm__no_game_created_so_no_players__post_without_secret(
         rikiki_app, client):
-    response = client.post('/player/confirm/', follow_redirects=True)
+    response = client.post('/player/no_game/confirm/', follow_redirects=True)
     assert response.status_code == 403
 
 
 def test_player_confirm__game_exists__get_without_valid_secret(client, game):
-    response = client.get('/player/confirm/')
+    response = client.get(f'/player/{game.id}/confirm/')
     assert response.status_code == 403
-    response = client.get('/player/confirm', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/confirm', follow_redirects=True)
     assert response.status_code == 403
-    response = client.get('/player/confirm/wrong_secret/')
+    response = client.get(f'/player/{game.id}/confirm/wrong_secret/')
     assert response.status_code == 403
 
 
-def test_player_confirm_game_exists__get_with_secret(first_player, client):
+def test_player_confirm_game_exists__get_with_secret(first_player, client, game):
     response = client.get(
-        f'/player/confirm/{first_player.secret_id}', follow_redirects=True)
+        f'/player/{game.id}/confirm/{first_player.secret_id}', follow_redirects=True)
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
     assert rendered_template(response, 'player.confirm')
     response = client.get(
-        f'/player/confirm/{first_player.secret_id}/')
+        f'/player/{game.id}/confirm/{first_player.secret_id}/')
     assert response.status_code == 200
 
 
-def test_player_confirm_game_exists__respects_language_header(first_player, client):
+def test_player_confirm_game_exists__respects_language_header(first_player, client, game):
     response = client.get(
-        f'/player/confirm/{first_player.secret_id}/',
+        f'/player/{game.id}/confirm/{first_player.secret_id}/',
         headers=[('Accept-Language', 'fr')])
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
@@ -70,7 +73,7 @@ def test_player_confirm_game_exists__respects_language_header(first_player, clie
     assert b'votre nom' in response.data
     assert b'votre participation' in response.data
     response = client.get(
-        f'/player/confirm/{first_player.secret_id}/',
+        f'/player/{game.id}/confirm/{first_player.secret_id}/',
         headers=[('Accept-Language', 'nl, en-gb;q=0.8')])
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
@@ -79,7 +82,7 @@ def test_player_confirm_game_exists__respects_language_header(first_player, clie
     assert b'your participation' in response.data
 
 
-def test_player_confirm__game_exists__post_confirmation_without_valid_secret(first_player, client):
+def test_player_confirm__game_exists__post_confirmation_without_valid_secret(first_player, client, game):
     for invalid_secret_data in [
             {},
             {'secret_id': 'wrong_secret'},
@@ -88,14 +91,14 @@ def test_player_confirm__game_exists__post_confirmation_without_valid_secret(fir
              'player_name': 'confirmed_name'}
     ]:
         response = client.post(
-            '/player/confirm/', data=invalid_secret_data)
+            f'/player/{game.id}/confirm/', data=invalid_secret_data)
         assert response.status_code == 403
 
 
-def test_player_confirm__game_exists__post_valid_confirmation(first_player, client):
+def test_player_confirm__game_exists__post_valid_confirmation(first_player, client, game):
     NEW_NAME = "new name"
     response = client.post(
-        '/player/confirm/',
+        f'/player/{game.id}/confirm/',
         data={'secret_id': first_player.secret_id, 'player_name': NEW_NAME},
         follow_redirects=True)
     assert response.status_code == 200
@@ -108,10 +111,10 @@ def test_player_confirm__game_exists__post_valid_confirmation(first_player, clie
     assert b'id="players"' in response.data
     assert b'id="stats"' in response.data
     assert b'id="cards"' in response.data
-    assert b'setTimeout(' in response.data
-    assert b'updatePlayerDashboard' in response.data
+    assert b'followPlayerDashboard(' in response.data
+    assert b'/api/events/' not in response.data
     assert bytes(
-        f'/player/{first_player.secret_id}/api/status/',
+        f'/player/{game.id}/{first_player.secret_id}/api/status/',
         'utf-8') in response.data
 
 
@@ -120,15 +123,15 @@ def test_player_confirm__game_started__renders_player_too_late(first_player, cli
         if p is not first_player:
             p.confirm('')
     game.start_game()
-    response = client.get(f'player/confirm/{first_player.secret_id}/')
+    response = client.get(f'/player/{game.id}/confirm/{first_player.secret_id}/')
     assert response.status_code == 200
     assert rendered_template(response, 'player.too-late')
     assert first_player.name.encode('utf-8') in response.data
 
 
-def test_player_confirm__already_confirmed__redirects_to_player_dashboard(confirmed_first_player, client):
+def test_player_confirm__already_confirmed__redirects_to_player_dashboard(confirmed_first_player, client, game):
     response = client.post(
-        f'/player/confirm/',
+        f'/player/{game.id}/confirm/',
         data={'secret_id': confirmed_first_player.secret_id,
               'confirmed_name': 'yet another name'},
         follow_redirects=True)
@@ -137,50 +140,50 @@ def test_player_confirm__already_confirmed__redirects_to_player_dashboard(confir
     assert confirmed_first_player.name == CONFIRMED_1ST_NAME
     assert rendered_template(response, 'player.player')
     response = client.get(
-        f'/player/confirm/{confirmed_first_player.secret_id}', follow_redirects=True)
+        f'/player/{game.id}/confirm/{confirmed_first_player.secret_id}', follow_redirects=True)
     assert response.status_code == 200
     assert rendered_template(response, 'player.player')
     assert FLASH_ERROR in response.data
 
 
-def test_player__player__validates_secret_id(confirmed_first_player, client):
-    response = client.get('/player/wrong_secret/', follow_redirects=True)
+def test_player__player__validates_secret_id(confirmed_first_player, client, game):
+    response = client.get(f'/player/{game.id}/wrong_secret/', follow_redirects=True)
     assert response.status_code == 403
-    response = client.get('/player/', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/', follow_redirects=True)
     assert response.status_code == 405
 
 
-def test_player__unconfirmed__redirects_to_confirmation(first_player, client):
+def test_player__unconfirmed__redirects_to_confirmation(first_player, client, game):
     response = client.get(
-        f'/player/{first_player.secret_id}/', follow_redirects=True)
+        f'/player/{game.id}/{first_player.secret_id}/', follow_redirects=True)
     assert response.status_code == 200
     assert rendered_template(response, 'player.confirm')
     assert FLASH_ERROR in response.data
 
 
-def test_player__confirmation__invalidates_confirmation_link(first_player, client):
+def test_player__confirmation__invalidates_confirmation_link(first_player, client, game):
     unconfirmed_secret_id = first_player.secret_id
-    confirmation_link = f'/player/confirm/{unconfirmed_secret_id}/'
+    confirmation_link = f'/player/{game.id}/confirm/{unconfirmed_secret_id}/'
     response = client.get(confirmation_link, follow_redirects=True)
     assert response.status_code == 200
-    response = client.post(f'/player/confirm/',
+    response = client.post(f'/player/{game.id}/confirm/',
                            data={'secret_id': first_player.secret_id,
                                  'confirmed_name': 'confirmation name'},
                            follow_redirects=True)
     assert response.status_code == 200
     response = client.get(confirmation_link, follow_redirects=True)
     assert response.status_code == 403
-    response = client.post(f'/player/confirm/',
+    response = client.post(f'/player/{game.id}/confirm/',
                            data={'secret_id': unconfirmed_secret_id,
                                  'confirmed_name': 'confirmation name'},
                            follow_redirects=True)
     assert response.status_code == 403
 
 
-def test_player__confirmation__sets_USER_COOKIE(first_player, client, rikiki_app):
+def test_player__confirmation__sets_USER_COOKIE(first_player, client, rikiki_app, game):
     unconfirmed_secret_id = first_player.secret_id
-    confirmation_link = f'/player/confirm/{unconfirmed_secret_id}/'
-    response = client.post(f'/player/confirm/',
+    confirmation_link = f'/player/{game.id}/confirm/{unconfirmed_secret_id}/'
+    response = client.post(f'/player/{game.id}/confirm/',
                            data={'secret_id': first_player.secret_id,
                                  'confirmed_name': 'confirmation name'},
                            follow_redirects=True)
@@ -190,29 +193,29 @@ def test_player__confirmation__sets_USER_COOKIE(first_player, client, rikiki_app
     assert flask.session[USER_COOKIE] != first_player.id
     assert flask.session[USER_COOKIE] != unconfirmed_secret_id
     # cookie allows to find back user
-    assert rikiki_app.game.player_by_cookie(
+    assert game.player_by_cookie(
         flask.session[USER_COOKIE]) is first_player
 
 
-def test_place_bid__post_only(first_player, client):
-    response = client.get('/player/place/bid/', follow_redirects=True)
+def test_place_bid__post_only(first_player, client, game):
+    response = client.get(f'/player/{game.id}/place/bid/', follow_redirects=True)
     assert response.status_code == 405
     first_player.confirm('')
-    response = client.get('/player/place/bid/', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/place/bid/', follow_redirects=True)
     assert response.status_code == 405
 
 
 def test_place_bid__player_must_be_confirmed(started_game, client):
     unconfirmed_player = next(
         p for p in started_game.players if not p.is_confirmed)
-    response = client.post('/player/place/bid/',
+    response = client.post(f'/player/{started_game.id}/place/bid/',
                            data={'secret_id': unconfirmed_player.secret_id},
                            follow_redirects=True)
     assert response.status_code == 404
 
 
 def test_place_bid__game_or_round_bad_state__404(confirmed_first_player, game, client):
-    response = client.post('/player/place/bid/',
+    response = client.post(f'/player/{game.id}/place/bid/',
                            data={'secret_id': confirmed_first_player.secret_id},
                            follow_redirects=True)
     assert response.status_code == 404
@@ -223,7 +226,7 @@ def test_place_bid__game_or_round_bad_state__404(confirmed_first_player, game, c
     for p in game.confirmed_players:
         p.place_bid(0)
     for p in game.confirmed_players:
-        response = client.post('/player/place/bid/',
+        response = client.post(f'/player/{game.id}/place/bid/',
                                data={'secret_id': p.secret_id},
                                follow_redirects=True)
         assert response.status_code == 404
@@ -231,12 +234,12 @@ def test_place_bid__game_or_round_bad_state__404(confirmed_first_player, game, c
 
 def test_place_bid__bad_secret__403(confirmed_first_player, game, client):
     response = client.post(
-        '/player/place/bid/',
+        f'/player/{game.id}/place/bid/',
         data={'secret_id': 'bad_secret'},
         follow_redirects=True)
     assert response.status_code == 403
     response = client.post(
-        '/player/place/bid/',
+        f'/player/{game.id}/place/bid/',
         data={},
         follow_redirects=True)
     assert response.status_code == 403
@@ -248,7 +251,7 @@ def test_place_bid__happy_path(started_game, client):
     while round_.state == models.Round.State.BIDDING:
         p = round_.current_player
         response = client.post(
-            '/player/place/bid/',
+            f'/player/{started_game.id}/place/bid/',
             data={'secret_id': p.secret_id, 'bidInput': 1})
         assert response.status_code == 200
         assert response.is_json
@@ -267,7 +270,7 @@ def test_place_bid__out_of_order(started_game, client):
             continue
         tested += 1
         response = client.post(
-            '/player/place/bid/',
+            f'/player/{started_game.id}/place/bid/',
             data={'secret_id': p.secret_id, 'bidInput': 1})
         assert response.status_code == 200
         assert response.is_json
@@ -278,18 +281,41 @@ def test_place_bid__out_of_order(started_game, client):
     assert tested > 0
 
 
-def test_play_card__post_only(first_player, client):
-    response = client.get('/player/play/card/', follow_redirects=True)
+def test_place_bid__turn__current_or_stale(started_game, client):
+    round_ = started_game.round
+    p = round_.current_player
+    turn = started_game.turn
+    # changes that are not moves keep the turn
+    started_game.players[0].update_secret()
+    response = client.post(
+        f'/player/{started_game.id}/place/bid/',
+        data={'secret_id': p.secret_id, 'bidInput': 1, 'turn': turn})
+    assert response.status_code == 200
+    assert response.get_json() == {'ok': True}
+    assert p.bid == 1
+    # but a bid starts a new turn
+    q = round_.current_player
+    response = client.post(
+        f'/player/{started_game.id}/place/bid/',
+        data={'secret_id': q.secret_id, 'bidInput': 1, 'turn': turn})
+    assert response.status_code == 409
+    assert response.get_json() == {
+        'ok': False, 'stale': True, 'turn': started_game.turn}
+    assert q.bid is None
+
+
+def test_play_card__post_only(first_player, client, game):
+    response = client.get(f'/player/{game.id}/play/card/', follow_redirects=True)
     assert response.status_code == 405
     first_player.confirm('')
-    response = client.get('/player/play/card/', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/play/card/', follow_redirects=True)
     assert response.status_code == 405
 
 
 def test_play_card__player_must_be_confirmed(started_game, client):
     unconfirmed_player = next(
         p for p in started_game.players if not p.is_confirmed)
-    response = client.post('/player/play/card/',
+    response = client.post(f'/player/{started_game.id}/play/card/',
                            data={'secret_id': unconfirmed_player.secret_id},
                            follow_redirects=True)
     assert response.status_code == 404
@@ -299,7 +325,7 @@ def test_play_card__game_or_round_bad_state__404(confirmed_first_player, game, c
     for p in game.players:
         if not p.is_confirmed:
             p.confirm('')
-        response = client.post('/player/play/card/',
+        response = client.post(f'/player/{game.id}/play/card/',
                                data={'secret_id': p.secret_id,
                                      'card': '0'},
                                follow_redirects=True)
@@ -310,7 +336,7 @@ def test_play_card__game_or_round_bad_state__404(confirmed_first_player, game, c
     for idx, p in enumerate(players):
         p.place_bid(0)
         if idx < len(players) - 1:
-            response = client.post('/player/play/card/',
+            response = client.post(f'/player/{game.id}/play/card/',
                                    data={'secret_id': p.secret_id,
                                          'card': int(p.cards[0])},
                                    follow_redirects=True)
@@ -319,13 +345,13 @@ def test_play_card__game_or_round_bad_state__404(confirmed_first_player, game, c
 
 def test_play_card__bad_secret__403(confirmed_first_player, game_with_started_round, client):
     response = client.post(
-        '/player/play/card/',
+        f'/player/{game_with_started_round.id}/play/card/',
         data={'secret_id': 'bad_secret',
               'card': int(confirmed_first_player.cards[0])},
         follow_redirects=True)
     assert response.status_code == 403
     response = client.post(
-        '/player/play/card/',
+        f'/player/{game_with_started_round.id}/play/card/',
         data={'card': int(confirmed_first_player.cards[0])},
         follow_redirects=True)
     assert response.status_code == 403
@@ -337,7 +363,7 @@ def test_play_card__happy_path(game_with_started_round, client):
     for p in game_with_started_round.confirmed_players:
         card = p.playable_cards[0]
         response = client.post(
-            '/player/play/card/',
+            f'/player/{game_with_started_round.id}/play/card/',
             data={'secret_id': p.secret_id, 'card': int(card)})
         assert response.status_code == 200
         assert response.is_json
@@ -349,7 +375,7 @@ def test_play_card__happy_path(game_with_started_round, client):
     p = round_.current_player
     card = p.playable_cards[0]
     response = client.post(
-        '/player/play/card/',
+        f'/player/{game_with_started_round.id}/play/card/',
         data={'secret_id': p.secret_id, 'card': int(card)})
     assert response.status_code == 200
     assert response.is_json
@@ -368,7 +394,7 @@ def test_play_card__out_of_order(game_with_started_round, client):
             continue
         tested += 1
         response = client.post(
-            '/player/play/card/',
+            f'/player/{game_with_started_round.id}/play/card/',
             data={'secret_id': p.secret_id, 'card': int(p.cards[0])})
         assert response.status_code == 200
         assert response.is_json
@@ -379,18 +405,18 @@ def test_play_card__out_of_order(game_with_started_round, client):
     assert tested > 0
 
 
-def test_finish_round__post_only(first_player, client):
-    response = client.get('/player/finish/round/', follow_redirects=True)
+def test_finish_round__post_only(first_player, client, game):
+    response = client.get(f'/player/{game.id}/finish/round/', follow_redirects=True)
     assert response.status_code == 405
     first_player.confirm('')
-    response = client.get('/player/finish/round/', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/finish/round/', follow_redirects=True)
     assert response.status_code == 405
 
 
 def test_finish_round__player_must_be_confirmed(started_game, client):
     unconfirmed_player = next(
         p for p in started_game.players if not p.is_confirmed)
-    response = client.post('/player/finish/round/',
+    response = client.post(f'/player/{started_game.id}/finish/round/',
                            data={'secret_id': unconfirmed_player.secret_id},
                            follow_redirects=True)
     assert response.status_code == 200
@@ -404,7 +430,7 @@ def test_finish_round__game_or_round_bad_state__404(confirmed_first_player, game
     for p in game.players:
         if not p.is_confirmed:
             p.confirm('')
-        response = client.post('/player/finish/round/',
+        response = client.post(f'/player/{game.id}/finish/round/',
                                data={'secret_id': p.secret_id},
                                follow_redirects=True)
         assert response.status_code == 200
@@ -416,7 +442,7 @@ def test_finish_round__game_or_round_bad_state__404(confirmed_first_player, game
     players = game.confirmed_players
     round_ = game.round
     round_._state = models.Round.State.DONE
-    response = client.post('/player/finish/round/',
+    response = client.post(f'/player/{game.id}/finish/round/',
                            data={'secret_id': p.secret_id},
                            follow_redirects=True)
     assert response.status_code == 200
@@ -428,12 +454,12 @@ def test_finish_round__game_or_round_bad_state__404(confirmed_first_player, game
 
 def test_finish_round__bad_secret__403(confirmed_first_player, game_with_started_round, client):
     response = client.post(
-        '/player/finish/round/',
+        f'/player/{game_with_started_round.id}/finish/round/',
         data={'secret_id': 'bad_secret'},
         follow_redirects=True)
     assert response.status_code == 403
     response = client.post(
-        '/player/finish/round/', data={}, follow_redirects=True)
+        f'/player/{game_with_started_round.id}/finish/round/', data={}, follow_redirects=True)
     assert response.status_code == 403
 
 
@@ -445,7 +471,7 @@ def test_finish_round__1_card_per_player__starts_counting_up_again(game_with_sta
     game._current_card_count = 1
     for p in game.confirmed_players:
         # Speed up test by removing all player's cards but 1
-        p._cards = [p.cards[0]]
+        p._hand = models.card_mask([p.cards[0]])
     for p in game.confirmed_players:
         p.play_card(p.cards[0])
     assert round_.state == models.Round.State.DONE, "Precondition for test not met"
@@ -455,7 +481,7 @@ def test_finish_round__1_card_per_player__starts_counting_up_again(game_with_sta
     # already.
     for p in game_with_started_round.confirmed_players:
         response = client.post(
-            '/player/finish/round/', data={'secret_id': p.secret_id})
+            f'/player/{game_with_started_round.id}/finish/round/', data={'secret_id': p.secret_id})
         assert response.status_code == 200
         assert response.is_json
         status = response.get_json()
@@ -471,7 +497,7 @@ def test_finish_round__happy_path(game_with_started_round, client):
     assert round_.state == models.Round.State.PLAYING, "Precondition for test not met"
     for p in game.confirmed_players:
         # Speed up test by removing all player's cards but 1
-        p._cards = [p.cards[0]]
+        p._hand = models.card_mask([p.cards[0]])
     for p in game.confirmed_players:
         p.play_card(p.cards[0])
     assert round_.state == models.Round.State.DONE, "Precondition for test not met"
@@ -480,7 +506,7 @@ def test_finish_round__happy_path(game_with_started_round, client):
     # already.
     for p in game_with_started_round.confirmed_players:
         response = client.post(
-            '/player/finish/round/', data={'secret_id': p.secret_id})
+            f'/player/{game_with_started_round.id}/finish/round/', data={'secret_id': p.secret_id})
         assert response.status_code == 200
         assert response.is_json
         status = response.get_json()
@@ -490,26 +516,43 @@ def test_finish_round__happy_path(game_with_started_round, client):
         assert game.round.state == models.Round.State.BIDDING
 
 
-def test_api_status__wrong_secret__403(confirmed_first_player, client):
+def test_finish_round__turn__second_click_is_stale(
+        game_with_started_round, client):
+    game = game_with_started_round
+    for p in game.confirmed_players:
+        p._hand = models.card_mask([p.cards[0]])
+    for p in game.confirmed_players:
+        p.play_card(p.cards[0])
+    turn = game.turn
+    statuses = [
+        client.post(f'/player/{game.id}/finish/round/',
+                    data={'secret_id': p.secret_id, 'turn': turn}
+                    ).status_code
+        for p in game.confirmed_players]
+    assert statuses == [200] + [409] * (len(statuses) - 1)
+    assert game.round.state == models.Round.State.BIDDING
+
+
+def test_api_status__wrong_secret__403(confirmed_first_player, client, game):
     response = client.get(
-        f'/player/wrong_secret/api/status/', follow_redirects=True)
+        f'/player/{game.id}/wrong_secret/api/status/', follow_redirects=True)
     assert response.status_code == 403
 
 
-def test_api_status__unconfirmed__404(first_player, client):
+def test_api_status__unconfirmed__404(first_player, client, game):
     response = client.get(
-        f'/player/{first_player.secret_id}/api/status/', follow_redirects=True)
+        f'/player/{game.id}/{first_player.secret_id}/api/status/', follow_redirects=True)
     assert response.status_code == 404
 
 
 def test_api_status__confirmed_no_other_players_yet__returns_correct_json(confirmed_first_player, game, client):
     response = client.get(
-        f'/player/{confirmed_first_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_first_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['players'] == [
@@ -520,12 +563,12 @@ def test_api_status__confirmed_no_other_players_yet__returns_correct_json(confir
 def test_api_status__confirmed_one_other_player__returns_correct_json(confirmed_first_player, game, client):
     game.players[2].confirm('<confirmed&tested>')
     response = client.get(
-        f'/player/{confirmed_first_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_first_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['id'] == confirmed_first_player.id
@@ -536,12 +579,12 @@ def test_api_status__confirmed_one_other_player__returns_correct_json(confirmed_
          'h': f'<li id="{game.players[2].id}" class="other_player">{escape(game.players[2].name)}</li>'}]
     game.players[1].confirm('api status test')
     response = client.get(
-        f'/player/{confirmed_first_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_first_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['id'] == confirmed_first_player.id
@@ -557,12 +600,12 @@ def test_api_status__confirmed_one_other_player__returns_correct_json(confirmed_
 def test_api_status__several_confirmed_players__lists_players_in_order(confirmed_last_player, game, client):
     game.players[2].confirm('')
     response = client.get(
-        f'/player/{confirmed_last_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_last_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['id'] == confirmed_last_player.id
@@ -573,12 +616,12 @@ def test_api_status__several_confirmed_players__lists_players_in_order(confirmed
          'h': f'<li id="{confirmed_last_player.id}" class="self_player">{escape(confirmed_last_player.name)}</li>'}]
     game.players[0].confirm('')
     response = client.get(
-        f'/player/{confirmed_last_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_last_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['id'] == confirmed_last_player.id
@@ -591,12 +634,12 @@ def test_api_status__several_confirmed_players__lists_players_in_order(confirmed
          'h': f'<li id="{confirmed_last_player.id}" class="self_player">{escape(confirmed_last_player.name)}</li>'}]
     game.players[-2].confirm('')
     response = client.get(
-        f'/player/{confirmed_last_player.secret_id}/api/status/')
+        f'/player/{game.id}/{confirmed_last_player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 4
-    assert status['summary'] == game.status_summary()
+    assert len(status) == 5
+    assert status['version'] == game.version
     assert 'Waiting' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert status['id'] == confirmed_last_player.id
@@ -611,14 +654,18 @@ def test_api_status__several_confirmed_players__lists_players_in_order(confirmed
          'h': f'<li id="{confirmed_last_player.id}" class="self_player">{escape(confirmed_last_player.name)}</li>'}]
 
 
-def test_api_status__game_started__lists_players_in_order(started_game, client):
+def test_api_status__game_started__lists_players_in_order(
+        rikiki_app, started_game, client):
+    rikiki_app.config['BID_HINTS'] = True
     player = started_game.confirmed_players[0]
-    response = client.get(f'/player/{player.secret_id}/api/status/')
+    response = client.get(f'/player/{started_game.id}/{player.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
-    assert len(status) == 7
-    assert status['summary'] == started_game.status_summary()
+    assert len(status) == 9
+    assert status['version'] == started_game.version
+    assert status['turn'] == started_game.turn
+    assert 'bid_hint_url' in status
     assert 'Bidding' in status['game_state']
     assert game_state_is_safe_for_HTML_insertion(status)
     assert f'with {started_game.current_card_count} cards' in status['game_state']
@@ -661,33 +708,222 @@ def test_api_status__game_started__lists_players_in_order(started_game, client):
 
 def test_api_status__save_bandwidth(started_game, client):
     player = started_game.confirmed_players[0]
-    full_response = client.get(f'/player/{player.secret_id}/api/status/')
+    url = f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    full_response = client.get(url)
     assert full_response.status_code == 200
     assert full_response.is_json
-    full_status = full_response.get_json()
-    small_response = client.get(
-        f'/player/{player.secret_id}/api/status/{full_status["summary"]}/')
-    assert small_response.status_code == 200
-    assert small_response.is_json
-    small_status = small_response.get_json()
-    assert len(small_status) == 1
-    assert small_status['summary'] == full_status['summary']
+    assert 'Accept-Language' in full_response.vary
+    (etag, is_weak) = full_response.get_etag()
+    assert etag is not None
+    assert not is_weak
+    small_response = client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    assert small_response.status_code == 304
+    assert small_response.data == b''
+    assert small_response.get_etag() == (etag, False)
     player.place_bid(2)
-    next_response = client.get(
-        f'/player/{player.secret_id}/api/status/{full_status["summary"]}/')
+    next_response = client.get(url, headers={'If-None-Match': f'"{etag}"'})
     assert next_response.status_code == 200
     assert next_response.is_json
     next_status = next_response.get_json()
     assert len(next_status) > 1
-    assert next_status['summary'] != small_status['summary']
-    assert next_status['summary'] == started_game.status_summary()
+    assert next_status['version'] == started_game.version
+    assert next_response.get_etag()[0] != etag
+
+
+def test_api_status__etag_depends_on_language(started_game, client):
+    player = started_game.confirmed_players[0]
+    url = f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    (etag_en, _) = client.get(
+        url, headers={'Accept-Language': 'en'}).get_etag()
+    (etag_fr, _) = client.get(
+        url, headers={'Accept-Language': 'fr'}).get_etag()
+    assert etag_en != etag_fr
+
+
+def status_etag(client, game, player):
+    response = client.get(
+        f'/player/{game.id}/{player.secret_id}/api/status/')
+    return response.headers['ETag']
+
+
+def test_api_status__long_poll__returns_on_change(started_game, client):
+    player = started_game.confirmed_players[0]
+    version = started_game.version
+    etag = status_etag(client, started_game, player)
+    timer = threading.Timer(0.05, player.place_bid, args=(2,))
+    timer.start()
+    try:
+        response = client.get(
+            f'/player/{started_game.id}/{player.secret_id}'
+            f'/api/status/?wait=10',
+            headers={'If-None-Match': etag})
+    finally:
+        timer.join()
+    assert response.status_code == 200
+    status = response.get_json()
+    assert status['version'] > version
+    assert 'players' in status
+
+
+def test_api_status__long_poll__times_out(started_game, client):
+    player = started_game.confirmed_players[0]
+    etag = status_etag(client, started_game, player)
+    response = client.get(
+        f'/player/{started_game.id}/{player.secret_id}'
+        f'/api/status/?wait=0.01',
+        headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+
+
+def test_api_status__long_poll__busy_answers_at_once(
+        rikiki_app, started_game, client):
+    player = started_game.confirmed_players[0]
+    etag = status_etag(client, started_game, player)
+    rikiki_app.long_polls = threading.BoundedSemaphore(1)
+    rikiki_app.long_polls.acquire()
+    response = client.get(
+        f'/player/{started_game.id}/{player.secret_id}'
+        f'/api/status/?wait=30',
+        headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.headers['Retry-After'] == str(
+        rikiki_app.config['LONG_POLL_RETRY'])
+
+
+def test_api_status__repeated_requests_are_cached(started_game, client):
+    player = started_game.confirmed_players[0]
+    url = f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    first = client.get(url)
+    with mock.patch('app.player.status_payload') as render:
+        second = client.get(url)
+        render.assert_not_called()
+        assert second.data == first.data
+        player.place_bid(1)
+        render.return_value = {'version': started_game.version}
+        third = client.get(url)
+        render.assert_called_once()
+    assert third.get_json() == {'version': started_game.version}
+
+
+def test_api_status__since__sends_changed_players_only(started_game, client):
+    # 3rd Player: the bidder and the next Player get a new HTML class
+    (bidder, _, viewer) = started_game.confirmed_players[:3]
+    url = f'/player/{started_game.id}/{viewer.secret_id}/api/status/'
+    full = client.get(url).get_json()
+    bidder.place_bid(1)
+    delta = client.get(f'{url}?since={full["version"]}').get_json()
+    assert delta['since'] == full['version']
+    assert delta['version'] == started_game.version
+    assert 'cards' not in delta
+    assert delta['cards_removed'] == []
+    changed_ids = [p['id'] for p in delta['players']]
+    assert bidder.id in changed_ids
+    assert viewer.id not in changed_ids
+    assert delta['game_state'] != full['game_state']
+
+
+def test_api_status__since__cards_move_to_table(game_with_started_round, client):
+    game = game_with_started_round
+    player = game.round.current_player
+    url = f'/player/{game.id}/{player.secret_id}/api/status/'
+    full = client.get(url).get_json()
+    card = player.playable_cards[0]
+    player.play_card(card)
+    delta = client.get(f'{url}?since={full["version"]}').get_json()
+    assert delta['cards_removed'] == [app.player.card_html_id(card)]
+    assert 'table' not in delta
+    (added,) = delta['table_added']
+    assert app.player.card_html_id(card) in added
+
+
+def test_api_status__since__unknown_version_sends_full_status(
+        started_game, client):
+    player = started_game.confirmed_players[0]
+    url = f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    status = client.get(f'{url}?since=-5').get_json()
+    assert 'since' not in status
+    assert 'cards' in status
+    assert len(status['players']) == len(started_game.confirmed_players)
+
+
+def test_api_status__since__unknown_versions_share_full_status(
+        started_game, client):
+    player = started_game.confirmed_players[0]
+    url = f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    full = client.get(url)
+    with mock.patch('app.player.status_data') as render:
+        for since in [-5, 12345, started_game.version]:
+            assert client.get(f'{url}?since={since}').data == full.data
+        render.assert_not_called()
+
+
+def read_event(response):
+    chunk = next(iter(response.response))
+    return chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+
+
+@pytest.fixture
+def events_enabled(rikiki_app):
+    rikiki_app.config['SERVER_SENT_EVENTS'] = True
+
+
+def test_api_events__disabled__404(started_game, client):
+    player = started_game.confirmed_players[0]
+    response = client.get(
+        f'/player/{started_game.id}/{player.secret_id}/api/events/')
+    assert response.status_code == 404
+
+
+def test_api_events__unconfirmed_player__404(events_enabled, game, client):
+    response = client.get(
+        f'/player/{game.id}/{game.players[0].secret_id}/api/events/')
+    assert response.status_code == 404
+
+
+def test_api_events__sends_current_status_first(
+        events_enabled, started_game, client):
+    player = started_game.confirmed_players[0]
+    response = client.get(
+        f'/player/{started_game.id}/{player.secret_id}/api/events/',
+        buffered=False)
+    try:
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        event = read_event(response)
+    finally:
+        response.close()
+    (id_line, data_line, _, _) = event.split('\n')
+    assert id_line == f'id: {started_game.version}'
+    assert data_line.startswith('data: ')
+    status = flask.json.loads(data_line[len('data: '):])
+    assert status['version'] == started_game.version
+    assert status['id'] == player.id
+
+
+def test_api_events__resumes_from_last_event_id(
+        events_enabled, rikiki_app, started_game, client):
+    rikiki_app.config['LONG_POLL_TIMEOUT'] = 0.01
+    player = started_game.confirmed_players[0]
+    response = client.get(
+        f'/player/{started_game.id}/{player.secret_id}/api/events/',
+        headers={'Last-Event-ID': str(started_game.version)},
+        buffered=False)
+    try:
+        assert read_event(response) == ': keep-alive\n\n'
+        player.place_bid(1)
+        event = read_event(response)
+    finally:
+        response.close()
+    assert event.startswith(f'id: {started_game.version}\n')
 
 
 def test_api_status__bidding_process(started_game, client):
     players = started_game.confirmed_players
     for (idx, p) in enumerate(players):
         p.place_bid(2)
-        response = client.get(f'/player/{p.secret_id}/api/status/')
+        response = client.get(f'/player/{started_game.id}/{p.secret_id}/api/status/')
         assert response.status_code == 200
         assert response.is_json
         status = response.get_json()
@@ -695,14 +931,14 @@ def test_api_status__bidding_process(started_game, client):
             # still at least one more player has to bid -> we are
             # still in Round.State.BIDDING
             assert 'Bidding' in status['game_state']
-            assert len(status) == 7
+            assert len(status) == 8
             assert f' {2 * (idx + 1)} tricks bid so far' in status['game_state']
         else:
             # now in Round.State.PLAYING state.  More detailed
             # validations should be in another test.
             assert 'Playing' in status['game_state']
         assert game_state_is_safe_for_HTML_insertion(status)
-        assert status['summary'] == started_game.status_summary()
+        assert status['version'] == started_game.version
         assert f'with {started_game.current_card_count} cards' in status['game_state']
         assert 'cards/card' not in status['trump']
         if idx < len(players) - 1:
@@ -745,11 +981,11 @@ def test_api_status__playing(game_with_started_round, client):
         observed_table = []  # overwritten later
         all_cards_in_hands = []
         for p in players:
-            response = client.get(f'/player/{p.secret_id}/api/status/')
+            response = client.get(f'/player/{game_with_started_round.id}/{p.secret_id}/api/status/')
             assert response.status_code == 200
             assert response.is_json
             status = response.get_json()
-            assert 'summary' in status
+            assert 'version' in status
             assert 'playing' in status['game_state'].lower()
             assert game_state_is_safe_for_HTML_insertion(status)
             assert status['id'] == p.id
@@ -778,7 +1014,7 @@ def test_api_status__playing(game_with_started_round, client):
                 assert status['table'] == observed_table
             all_cards_in_hands += status['cards']
             # no we know all keys we need are there, check there is nothing extra:
-            assert len(status) == 9
+            assert len(status) == 10
         # check that no card was lost:
         all_cards_html = observed_table + ''.join(all_cards_in_hands)
         # check that table contains information about which player played which card
@@ -815,7 +1051,7 @@ def test_api_status__between_tricks(game_with_started_round, client):
             # record last player status to observe differences between
             # Round.State.PLAYING & Round.State.BETWEEN_TRICKS
             response = client.get(
-                f'/player/{card_placer.secret_id}/api/status/')
+                f'/player/{game_with_started_round.id}/{card_placer.secret_id}/api/status/')
             last_status = response.get_json()
         # play any card
         card_idx = 0
@@ -827,7 +1063,7 @@ def test_api_status__between_tricks(game_with_started_round, client):
                 card_idx += 1
             else:
                 break
-    response = client.get(f'/player/{players[-1].secret_id}/api/status/')
+    response = client.get(f'/player/{game_with_started_round.id}/{players[-1].secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
@@ -859,7 +1095,7 @@ def test_api_status__between_tricks(game_with_started_round, client):
                    for old, new in zip(last_status['players'], status['players'])
                    ) == len(status['players']) - 2  # trick winner + last player with changed number of cards
         assert status['playable_cards'] == []
-    assert status['summary'] != last_status['summary']
+    assert status['version'] != last_status['version']
     # the table contains as many cards as players ...
     #   poor man's extraction of images:
     table_split = status['table'].split('<img ')
@@ -871,7 +1107,7 @@ def test_api_status__between_tricks(game_with_started_round, client):
     if trick_winner_id is not players[-1]:
         # first player may play anything, already tested if
         # trick_winner is current_player
-        response = client.get(f'/player/{trick_winner.secret_id}/api/status/')
+        response = client.get(f'/player/{game_with_started_round.id}/{trick_winner.secret_id}/api/status/')
         assert response.status_code == 200
         assert response.is_json
         status = response.get_json()
@@ -889,21 +1125,21 @@ def test_api_status__between_rounds(started_game, client):
     game._current_card_count = 1
     for p in players:
         assert p.is_confirmed, "Precondition for test not met"
-        p._cards = [p.cards[0]]
+        p._hand = models.card_mask([p.cards[0]])
         p.place_bid(0)
     assert round_.state == models.Round.State.PLAYING, "Precondition for test not met"
     assert game.state == models.Game.State.PLAYING, "Precondition for test not met"
     for idx, p in enumerate(players):
         if idx == len(players) - 1:
             # Record last status to compare before & after
-            response = client.get(f'/player/{p.secret_id}/api/status/')
+            response = client.get(f'/player/{started_game.id}/{p.secret_id}/api/status/')
             assert response.status_code == 200, "Precondition for test not met"
             assert response.is_json, "Precondition for test not met"
             last_status = response.get_json()
         p.play_card(p.playable_cards[0])
     assert round_.state == models.Round.State.DONE, "Precondition for test not met"
     assert game.state == models.Game.State.PAUSED_BETWEEN_ROUNDS, "Precondition for test not met"
-    response = client.get(f'/player/{p.secret_id}/api/status/')
+    response = client.get(f'/player/{started_game.id}/{p.secret_id}/api/status/')
     assert response.status_code == 200
     assert response.is_json
     status = response.get_json()
@@ -917,7 +1153,7 @@ def test_api_status__between_rounds(started_game, client):
     assert status['id'] == last_status['id']
     assert len(status['players']) == len(last_status['players'])
     assert status['round']['state'] == int(models.Round.State.DONE)
-    assert status['summary'] != last_status['summary']
+    assert status['version'] != last_status['version']
     assert len(status['table'].split('<img ')
                ) == len(last_status['table'].split('<img ')) + 1
     assert status['trump'] == last_status['trump']
@@ -933,16 +1169,18 @@ def test_api_status__between_rounds(started_game, client):
                 else 'the right amount of tricks') in p_status['h']
 
 
-def test_organizer_url_for_unconfirmed_player(rikiki_app, first_player):
+def test_organizer_url_for_unconfirmed_player(rikiki_app, first_player, game):
     with rikiki_app.test_request_context():
+        flask.g.game_id = game.id
         assert organizer_url_for_player(first_player
-                                        ) == f'/player/confirm/{first_player.secret_id}/'
+                                        ) == f'/player/{game.id}/confirm/{first_player.secret_id}/'
 
 
-def test_organizer_url_for_confirmed_player(rikiki_app, confirmed_first_player):
+def test_organizer_url_for_confirmed_player(rikiki_app, confirmed_first_player, game):
     with rikiki_app.test_request_context():
+        flask.g.game_id = game.id
         assert organizer_url_for_player(confirmed_first_player
-                                        ) == f'/player/{confirmed_first_player.secret_id}/'
+                                        ) == f'/player/{game.id}/{confirmed_first_player.secret_id}/'
 
 
 def game_state_is_safe_for_HTML_insertion(status):
@@ -961,63 +1199,144 @@ def game_state_is_safe_for_HTML_insertion(status):
 
 
 def test_restore__no_cookie__no_game(rikiki_app, client):
-    response = client.get('/player/restore/link/', follow_redirects=True)
+    response = client.get('/player/no_game/restore/link/', follow_redirects=True)
     assert response.status_code == 403
 
 
-def test_restore__no_cookie_or_bad_cookie__403(rikiki_app, client, confirmed_first_player):
+def test_restore__no_cookie_or_bad_cookie__403(rikiki_app, client, confirmed_first_player, game):
     setup_player_session(client, None)
-    response = client.post('/player/restore/link/', follow_redirects=True)
+    response = client.post(f'/player/{game.id}/restore/link/', follow_redirects=True)
     assert response.status_code == 403
     setup_player_session(client, 'wrong_secret')
-    response = client.post('/player/restore/link/', follow_redirects=True)
+    response = client.post(f'/player/{game.id}/restore/link/', follow_redirects=True)
     assert response.status_code == 403
     setup_player_session(client, None)
-    response = client.get('/player/restore/link/', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/restore/link/', follow_redirects=True)
     assert response.status_code == 403
     setup_player_session(client, 'wrong_secret')
-    response = client.get('/player/restore/link', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/restore/link', follow_redirects=True)
     assert response.status_code == 403
 
 
-def test_restore__player_is_not_confirmed__404(rikiki_app, client, first_player):
+def test_restore__player_is_not_confirmed__404(rikiki_app, client, first_player, game):
     player = first_player
     # overkill: how would a player have a valid session cookie without
     # confirming?
     setup_player_session(client, player)
-    response = client.get('/player/restore/link', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/restore/link', follow_redirects=True)
     assert response.status_code == 403
 
 
-def test_restore__player_post_bad_csrf_token__403(rikiki_app, client, confirmed_first_player):
+def test_restore__player_post_bad_csrf_token__403(rikiki_app, client, confirmed_first_player, game):
     player = confirmed_first_player
     setup_player_session(client, player)
-    response = client.post('/player/restore/link/',
+    response = client.post(f'/player/{game.id}/restore/link/',
                            data={'csrf_token': 'bad_token'},
                            follow_redirects=True)
     assert response.status_code == 404
     setup_player_session(client, player)
-    response = client.post('/player/restore/link/',
+    response = client.post(f'/player/{game.id}/restore/link/',
                            data={},
                            follow_redirects=True)
     assert response.status_code == 404
 
 
-def test_restore__happy_path(rikiki_app, client, confirmed_first_player):
+def test_restore__happy_path(rikiki_app, client, confirmed_first_player, game):
     player = confirmed_first_player
     old_secret = player.cookie
     setup_player_session(client, player)
-    response = client.get('/player/restore/link', follow_redirects=True)
+    response = client.get(f'/player/{game.id}/restore/link', follow_redirects=True)
     assert response.status_code == 200
     assert rendered_template(response, 'player.restore_link')
     assert FLASH_ERROR not in response.data
     assert flask.session[USER_COOKIE] == old_secret
-    assert rikiki_app.game.csrf_token.encode('ascii') in response.data
-    response = client.post('/player/restore/link/',
-                           data={'csrf_token': rikiki_app.game.csrf_token},
+    assert game.csrf_token.encode('ascii') in response.data
+    response = client.post(f'/player/{game.id}/restore/link/',
+                           data={'csrf_token': game.csrf_token},
                            follow_redirects=True)
     assert response.status_code == 200
     assert FLASH_ERROR not in response.data
     assert rendered_template(response, 'player.player')
     assert flask.session[USER_COOKIE] != old_secret
     assert flask.session[USER_COOKIE] == player.cookie
+
+
+def test_api_status__other_game__403(rikiki_app, confirmed_first_player, game, client):
+    other_game = rikiki_app.create_game(
+        [app.models.Player(f'O{i}', f'Other secret {i}') for i in range(3)])
+    response = client.get(
+        f'/player/{other_game.id}/{confirmed_first_player.secret_id}/api/status/')
+    assert response.status_code == 403
+    response = client.get(
+        f'/player/{game.id}/{confirmed_first_player.secret_id}/api/status/')
+    assert response.status_code == 200
+
+
+def test_api_status__bidding__bid_hint_url(rikiki_app, started_game, client):
+    rikiki_app.config['BID_HINTS'] = True
+    (first, second) = started_game.confirmed_players[:2]
+
+    def status(player):
+        return client.get(
+            f'/player/{started_game.id}/{player.secret_id}/api/status/'
+        ).get_json()
+
+    assert status(first)['bid_hint_url'] \
+        == f'/player/{started_game.id}/{first.secret_id}/api/bid_hint/'
+    first.place_bid(0)
+    assert 'bid_hint_url' not in status(first)
+    assert 'bid_hint_url' in status(second)
+
+
+def test_api_bid_hint__bidding(rikiki_app, started_game, client):
+    rikiki_app.config['BID_HINTS'] = True
+    (first, second) = started_game.confirmed_players[:2]
+
+    def hint(player):
+        response = client.get(
+            f'/player/{started_game.id}/{player.secret_id}/api/bid_hint/',
+            headers={'Accept-Language': 'en'})
+        assert response.status_code == 200
+        return response.get_json()
+
+    data = hint(first)
+    assert data['bid_hint'].startswith('Expected tricks: ')
+    assert data['refining'] is False
+    first.place_bid(0)
+    assert hint(first) == {'bid_hint': '', 'refining': False}
+    assert hint(second)['bid_hint'].startswith('Expected tricks: ')
+
+
+def test_api_bid_hint__refined_without_new_version(
+        rikiki_app, started_game, client):
+    rikiki_app.config['BID_HINTS'] = True
+    rikiki_app.bid_advisor = app.advisor.BidAdvisor(
+        max_workers=1, time_budget=0, samples=50)
+    player = started_game.confirmed_players[0]
+    url = f'/player/{started_game.id}/{player.secret_id}/api/bid_hint/'
+    version = started_game.version
+    try:
+        assert client.get(url).get_json() == {
+            'bid_hint': '', 'refining': True}
+        deadline = time.monotonic() + 30
+        data = client.get(url, headers={'Accept-Language': 'en'}).get_json()
+        while data['refining'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+            data = client.get(
+                url, headers={'Accept-Language': 'en'}).get_json()
+        assert data['bid_hint'].startswith('Expected tricks: ')
+        assert not data['refining']
+        assert started_game.version == version
+    finally:
+        rikiki_app.bid_advisor.shutdown()
+
+
+def test_api_status__bid_hints_disabled(rikiki_app, started_game, client):
+    player = started_game.confirmed_players[0]
+    status = client.get(
+        f'/player/{started_game.id}/{player.secret_id}/api/status/'
+    ).get_json()
+    assert 'bid_hint_url' not in status
+    assert client.get(
+        f'/player/{started_game.id}/{player.secret_id}/api/bid_hint/'
+    ).status_code == 404
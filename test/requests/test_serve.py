@@ -0,0 +1,63 @@
+import types
+
+from click.testing import CliRunner
+
+from app import serve
+
+
+def test_server_options_default_to_configuration():
+    config = {'SERVE_THREADS': 8, 'SERVE_CONNECTION_LIMIT': 20,
+              'SERVE_BACKLOG': 30, 'SERVE_KEEP_ALIVE': 40}
+    options = serve.server_options(config, 'localhost', 8080,
+                                   threads=2, keep_alive=0)
+    assert options['host'] == 'localhost'
+    assert options['port'] == 8080
+    assert options['threads'] == 2
+    assert options['connection_limit'] == 20
+    assert options['backlog'] == 30
+    assert options['channel_timeout'] == 0
+
+
+def test_serve_runs_production_server(monkeypatch):
+    calls = []
+    monkeypatch.setattr(serve, 'waitress', types.SimpleNamespace(
+        serve=lambda app, **options: calls.append((app, options))))
+    result = CliRunner().invoke(
+        serve.serve, ['--config', 'testing', '--port', '9000',
+                      '--threads', '3', '--backlog', '5'])
+    assert result.exit_code == 0, result.output
+    ((app, options),) = calls
+    assert app.config['TESTING']
+    assert options['port'] == 9000
+    assert options['threads'] == 3
+    assert options['backlog'] == 5
+    assert options['connection_limit'] == app.config['SERVE_CONNECTION_LIMIT']
+
+
+def test_long_poll_waiters__keeps_threads_free():
+    config = {'SERVE_THREADS': 80, 'LONG_POLL_WAITERS': 60}
+    assert serve.long_poll_waiters(config, 80) == 60
+    assert serve.long_poll_waiters(config, 160) == 120
+    assert serve.long_poll_waiters(config, 1) == 1
+
+
+def test_serve__threads__scales_long_polls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(serve, 'waitress', types.SimpleNamespace(
+        serve=lambda app, **options: calls.append(app)))
+    result = CliRunner().invoke(
+        serve.serve, ['--config', 'testing', '--threads', '8'])
+    assert result.exit_code == 0, result.output
+    (app,) = calls
+    waiters = serve.long_poll_waiters(app.config, 8)
+    assert 0 < waiters < 8
+    assert all(app.long_polls.acquire(blocking=False)
+               for _ in range(waiters))
+    assert not app.long_polls.acquire(blocking=False)
+
+
+def test_serve_needs_waitress(monkeypatch):
+    monkeypatch.setattr(serve, 'waitress', None)
+    result = CliRunner().invoke(serve.serve, ['--config', 'testing'])
+    assert result.exit_code != 0
+    assert 'waitress' in result.output
@@ -0,0 +1,86 @@
+import concurrent.futures
+import json
+
+import pytest  # type: ignore
+
+from app.cli import play_game, round_count
+
+
+def simulate(app, *args):
+    result = app.test_cli_runner().invoke(
+        args=['rikiki', 'simulate', *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_play_game__same_seed__same_game():
+    assert play_game(3, 5, ['random'], 2) == play_game(3, 5, ['random'], 2)
+    assert play_game(3, 5, ['random'], 2) != play_game(3, 5, ['random'], 3)
+
+
+def test_play_game__one_record_per_round():
+    records = play_game(4, 0, ['greedy', 'random'], 7)
+    assert len(records) == round_count(4)
+    assert [r['round'] for r in records] == list(range(len(records)))
+    assert [r['first_seat'] for r in records[:5]] == [0, 1, 2, 3, 0]
+    for record in records:
+        assert record['game'] == 7
+        assert sum(record['tricks']) == record['cards']
+        assert all(0 <= bid <= record['cards'] for bid in record['bids'])
+    assert records[0]['cards'] == records[-1]['cards'] == 13
+    assert records[0]['trump'] is None
+
+
+def test_simulate__jsonl_to_stdout(app):
+    result = simulate(app, '--players', '5', '--games', '3',
+                      '--workers', '1', '--seed', '9')
+    records = [json.loads(line)
+               for line in result.output.splitlines()
+               if line.startswith('{')]
+    assert len(records) == 3 * round_count(5)
+    assert records == [record
+                       for game in range(3)
+                       for record in play_game(5, 9, ['greedy'], game)]
+    assert 'games/s' in result.output
+
+
+def test_simulate__result_independent_of_workers(app, tmp_path):
+    outputs = []
+    for workers in ['1', '2']:
+        output = tmp_path / f'{workers}.jsonl'
+        simulate(app, '-p', '3', '-n', '4', '-w', workers,
+                 '--policy', 'random', '--policy', 'greedy',
+                 '-o', str(output))
+        outputs.append(output.read_text())
+    assert outputs[0] == outputs[1]
+
+
+def test_simulate__few_games__no_workers_by_default(app, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no worker processes for 3 games")
+    monkeypatch.setattr('os.cpu_count', lambda: 4)
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', no_pool)
+    simulate(app, '-p', '3', '-n', '3')
+
+
+def test_simulate__explicit_workers__always_used(app, monkeypatch):
+    pools = []
+
+    def thread_pool(workers):
+        pools.append(workers)
+        return concurrent.futures.ThreadPoolExecutor(workers)
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', thread_pool)
+    simulate(app, '-p', '3', '-n', '2', '-w', '2')
+    assert pools == [2]
+
+
+def test_simulate__npy_output(app, tmp_path):
+    np = pytest.importorskip("numpy")
+    output = tmp_path / 'rounds.npy'
+    simulate(app, '-p', '4', '-n', '2', '-w', '1', '-o', str(output))
+    rounds = np.load(output)
+    expected = play_game(4, 0, ['greedy'], 1)
+    assert len(rounds) == 2 * round_count(4)
+    assert list(rounds[-1]['bids']) == expected[-1]['bids']
+    assert list(rounds[-1]['tricks']) == expected[-1]['tricks']
+    assert rounds[round_count(4)]['trump'] == -1
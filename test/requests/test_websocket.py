@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest  # type: ignore
+
+from app.asgi import CLOSE_FORBIDDEN, create_asgi_app, perform_action
+from app import models
+
+from .helper import (
+    game,
+    rikiki_app,
+    started_game,
+)
+
+
+def websocket_session(rikiki_app, path, client_messages, server_message_count):
+    """Run a WebSocket connection through the ASGI application.
+
+    Send client_messages (after the connection) and return the first
+    server_message_count messages sent by the server.
+    """
+    rikiki_app.config['LONG_POLL_TIMEOUT'] = 0.05
+    asgi_app = create_asgi_app(rikiki_app)
+
+    async def session():
+        incoming = asyncio.Queue()
+        outgoing = asyncio.Queue()
+        await incoming.put({'type': 'websocket.connect'})
+        scope = {'type': 'websocket', 'path': path, 'headers': []}
+        connection = asyncio.ensure_future(
+            asgi_app(scope, incoming.get, outgoing.put))
+        received = [await outgoing.get()]
+        if received[0]['type'] == 'websocket.accept':
+            received.pop()
+            for message in client_messages:
+                # let the server push the initial status first
+                received.append(await outgoing.get())
+                await incoming.put({'type': 'websocket.receive',
+                                    'text': json.dumps(message)})
+            while len(received) < server_message_count:
+                received.append(await outgoing.get())
+            await incoming.put({'type': 'websocket.disconnect'})
+        await asyncio.wait_for(connection, 1)
+        return received
+
+    return asyncio.run(session())
+
+
+def test_websocket__unknown_player__closes(rikiki_app, started_game):
+    (message,) = websocket_session(
+        rikiki_app, f'/player/{started_game.id}/no_such_player/ws/', [], 1)
+    assert message == {'type': 'websocket.close', 'code': CLOSE_FORBIDDEN}
+
+
+def test_websocket__unknown_game__closes(rikiki_app, started_game):
+    player = started_game.confirmed_players[0]
+    (message,) = websocket_session(
+        rikiki_app, f'/player/no_game/{player.secret_id}/ws/', [], 1)
+    assert message['type'] == 'websocket.close'
+
+
+def test_websocket__bid_result_and_status_updates(rikiki_app, started_game):
+    player = started_game.confirmed_players[0]
+    version = started_game.version
+    messages = websocket_session(
+        rikiki_app,
+        f'/player/{started_game.id}/{player.secret_id}/ws/',
+        [{'id': 7, 'action': 'bid', 'bid': 1}],
+        3)
+    assert all(m['type'] == 'websocket.send' for m in messages)
+    data = [json.loads(m['text']) for m in messages]
+    assert data[0]['type'] == 'status'
+    assert data[0]['version'] == version
+    assert data[0]['id'] == player.id
+    assert {'type': 'result', 'id': 7, 'ok': True} in data[1:]
+    (update,) = [d for d in data[1:] if d['type'] == 'status']
+    assert update['version'] > version
+    assert player.bid == 1
+    # the socket no longer listens to the Game once disconnected
+    assert started_game._done_listeners == []
+
+
+def test_perform_action__stale_turn(started_game):
+    player = started_game.round.current_player
+    turn = started_game.turn
+    result = perform_action(
+        started_game, player,
+        f'{{"id": 1, "action": "bid", "bid": 1, "turn": {turn - 1}}}')
+    assert result['stale'] and not result['ok']
+    assert result['turn'] == turn
+    assert player.bid is None
+    result = perform_action(
+        started_game, player,
+        f'{{"id": 2, "action": "bid", "bid": 1, "turn": {turn}}}')
+    assert result['ok']
+    assert player.bid == 1
+
+
+def test_perform_action__validates_requests(started_game):
+    player = started_game.confirmed_players[0]
+    assert not perform_action(started_game, player, 'not json')['ok']
+    assert not perform_action(started_game, player, '{"id": 1}')['ok']
+    result = perform_action(
+        started_game, player, '{"id": 2, "action": "play", "card": 3}')
+    assert result['id'] == 2
+    assert not result['ok']
+    assert 'not playing' in result['error']
+    result = perform_action(
+        started_game, player, '{"id": 3, "action": "bid", "bid": 99}')
+    assert not result['ok']
+    assert player.bid is None